@@ -14,13 +14,42 @@ GOOGLE_CLOUD_API_KEY = os.getenv("GOOGLE_CLOUD_API_KEY", "")
 
 # MLB API Settings
 MLB_API_BASE_URL = "https://statsapi.mlb.com/api/v1"
+MLB_API_MAX_CONCURRENCY = int(os.getenv("MLB_API_MAX_CONCURRENCY", "8"))  # Concurrent requests of the async fetcher
+MLB_API_MAX_CONNECTIONS = int(os.getenv("MLB_API_MAX_CONNECTIONS", "10"))  # Pooled keep-alive connections
+# "boxscore" fetches every Final boxscore, "hydrated" derives game details from one hydrated schedule
+MLB_FETCH_MODE = os.getenv("MLB_FETCH_MODE", "boxscore")
+MLB_SCHEDULE_HYDRATE = "linescore,decisions,probablePitcher"
+# Recorded statsapi responses replayed by the offline benchmark
+MLB_FIXTURES_DIR = os.path.join("tests", "fixtures", "statsapi")
 
 # Perplexity API Settings
 PERPLEXITY_API_BASE_URL = "https://api.perplexity.ai"
 NEWS_ARTICLES_COUNT = 5
+# "team" makes one request per team, "division" asks for the news of a whole
+# division in one structured request, "matchup" for both teams of a game
+NEWS_BATCH_MODE = os.getenv("NEWS_BATCH_MODE", "team")
+PERPLEXITY_MAX_CONCURRENCY = int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", "4"))  # Concurrent news requests
+# Stream completions, dropping the <think> section as it arrives instead of buffering it
+PERPLEXITY_STREAMING = os.getenv("PERPLEXITY_STREAMING", "false").lower() == "true"
+# Near-duplicate news detection across teams (MinHash over word shingles)
+NEWS_DEDUP_THRESHOLD = 0.6  # Estimated Jaccard similarity of the same story
+NEWS_MINHASH_PERMUTATIONS = 64
+NEWS_MINHASH_BANDS = 16
+# Seconds fetched news is reused; empty or failed results expire much sooner
+NEWS_CACHE_TTL = int(os.getenv("NEWS_CACHE_TTL", str(6 * 3600)))
+NEWS_NEGATIVE_CACHE_TTL = int(os.getenv("NEWS_NEGATIVE_CACHE_TTL", "900"))
 
 # Anthropic API Settings
 ANTHROPIC_MODEL = os.getenv("ANTHROPIC_MODEL", "")
+# Generate the scheduled run's scripts with one Message Batch instead of per-team requests.
+# Off by default: no audio is produced until the whole batch has ended.
+ANTHROPIC_BATCH_MODE = os.getenv("ANTHROPIC_BATCH_MODE", "false").lower() == "true"
+ANTHROPIC_BATCH_POLL_MIN = 10  # Seconds between batch polls while results keep arriving
+ANTHROPIC_BATCH_POLL_MAX = 300  # Polls back off up to this while the batch makes no progress
+ANTHROPIC_BATCH_TIMEOUT = 6 * 3600  # Give up waiting and generate the rest directly
+# Stream scripts paragraph by paragraph into text-to-speech as they are written.
+# Off by default: streamed scripts are voiced as they arrive, so they are never trimmed to the length budget.
+SCRIPT_STREAMING = os.getenv("SCRIPT_STREAMING", "false").lower() == "true"
 
 # Google Wavenet Settings
 GOOGLE_WAVENET_VOICE = os.getenv("GOOGLE_WAVENET_VOICE", "en-US-Chirp3-HD-Orus")
@@ -29,16 +58,66 @@ GOOGLE_CLOUD_PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT_ID", "")
 GOOGLE_CLOUD_LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "")
 GOOGLE_CLOUD_BUCKET = os.getenv("GOOGLE_CLOUD_BUCKET", "")
 GOOGLE_CLOUD_SERVICE_ACCOUNT_FILE = os.getenv("GOOGLE_CLOUD_SERVICE_ACCOUNT_FILE", "")
+TTS_STREAM_WORKERS = 4  # Paragraphs synthesized at once while a script streams
+TTS_SPEAKING_RATE = 1.0  # 1.0 is the voice's normal speed
 
 # Podcast Settings
 PODCAST_LENGTH_MINUTES = 5
 UPDATE_TIME = "06:00"  # 6 AM
+# Bump to invalidate cached scripts after prompt or script handling changes
+PROMPT_TEMPLATE_VERSION = 1
+# Script length budget, derived from PODCAST_LENGTH_MINUTES
+SPEAKING_RATE_WPM = 150  # Words per minute the voice reads at TTS_SPEAKING_RATE 1.0
+SCRIPT_LENGTH_TOLERANCE = 0.15  # Scripts longer than the target by more than this are trimmed
+SCRIPT_TOKENS_PER_WORD = 1.4
+SCRIPT_MAX_CONTINUATIONS = 1  # Extra requests to finish a script cut off by max_tokens
+# Render off days with little news from templates instead of calling the LLM
+TEMPLATE_SCRIPTS_ENABLED = os.getenv("TEMPLATE_SCRIPTS_ENABLED", "true").lower() == "true"
+TEMPLATE_MAX_NEWS_ITEMS = 2  # News items an off day may have and still use a template
+
+# Live Game Watcher Settings (seconds between schedule polls)
+WATCHER_IDLE_INTERVAL = 900  # No game in progress
+WATCHER_LIVE_INTERVAL = 300  # Games in progress, none expected to end soon
+WATCHER_FAST_INTERVAL = 60  # A game is near its expected end
+WATCHER_GAME_DURATION_MINUTES = 180  # Expected length of a game from first pitch
+WATCHER_END_WINDOW_MINUTES = 45  # Poll fast this long before the expected end
 
 # Storage Settings
 DATA_DIR = "data"
 SCRIPTS_DIR = "scripts"
 AUDIO_DIR = "audio"
 
+# Team registry built from the statsapi /teams endpoint
+TEAM_REGISTRY_FILE = os.path.join(DATA_DIR, "teams.json")
+TEAM_REGISTRY_MAX_AGE_DAYS = 30
+
+# Deduplicated news items of all teams, one index per date
+NEWS_INDEX_DIR = os.path.join(DATA_DIR, "news_index")
+
+# Generated scripts addressed by a hash of their request
+SCRIPT_CACHE_DIR = os.path.join(DATA_DIR, "script_cache")
+
+# Searchable archive of parsed news items
+NEWS_ARCHIVE_DB = os.path.join(DATA_DIR, "news_archive.db")
+NEWS_CONTEXT_DAYS = 7  # Days of archived news offered to the script as background
+NEWS_CONTEXT_ITEMS = 5
+
+# Standings maintained locally from Final games, replaced by a full pull periodically
+STANDINGS_FILE = os.path.join(DATA_DIR, "standings.json")
+STANDINGS_RECONCILE_HOURS = 24
+
+# HTTP Cache Settings
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, "http_cache")
+MLB_HTTP_CACHE_ENABLED = os.getenv("MLB_HTTP_CACHE_ENABLED", "true").lower() == "true"
+# Seconds a cached statsapi response is served before it is revalidated.
+# Boxscores of Final games never change and are cached without expiry.
+MLB_CACHE_TTLS = {
+    "schedule": 300,
+    "standings": 3600,
+    "teams": 86400,
+    "boxscore": 60,
+}
+
 # Teams Configuration
 MLB_TEAMS = {
     "ARI": "Arizona Diamondbacks",
@@ -71,4 +150,48 @@ MLB_TEAMS = {
     "TEX": "Texas Rangers",
     "TOR": "Toronto Blue Jays",
     "WSH": "Washington Nationals"
-}
\ No newline at end of file
+}
+
+# statsapi team ids for each team code, used when the /teams endpoint is unavailable
+MLB_TEAM_IDS = {
+    "ARI": 109,
+    "ATL": 144,
+    "BAL": 110,
+    "BOS": 111,
+    "CHC": 112,
+    "CWS": 145,
+    "CIN": 113,
+    "CLE": 114,
+    "COL": 115,
+    "DET": 116,
+    "HOU": 117,
+    "KC": 118,
+    "LAA": 108,
+    "LAD": 119,
+    "MIA": 146,
+    "MIL": 158,
+    "MIN": 142,
+    "NYM": 121,
+    "NYY": 147,
+    "OAK": 133,
+    "PHI": 143,
+    "PIT": 134,
+    "SD": 135,
+    "SF": 137,
+    "SEA": 136,
+    "STL": 138,
+    "TB": 139,
+    "TEX": 140,
+    "TOR": 141,
+    "WSH": 120
+}
+
+# Team codes of each division, used to batch news requests
+MLB_DIVISIONS = {
+    "AL East": ["BAL", "BOS", "NYY", "TB", "TOR"],
+    "AL Central": ["CLE", "CWS", "DET", "KC", "MIN"],
+    "AL West": ["HOU", "LAA", "OAK", "SEA", "TEX"],
+    "NL East": ["ATL", "MIA", "NYM", "PHI", "WSH"],
+    "NL Central": ["CHC", "CIN", "MIL", "PIT", "STL"],
+    "NL West": ["ARI", "COL", "LAD", "SD", "SF"],
+}
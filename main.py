@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
+import sqlite3
 import argparse
 import datetime
 
@@ -8,6 +9,8 @@ from config.config import MLB_TEAMS
 from utils.logger import get_logger
 from utils.processor import PodcastProcessor
 from utils.scheduler import PodcastScheduler
+from utils.watcher import GameWatcher
+from utils.news_archive import NewsArchive
 
 logger = get_logger(__name__)
 
@@ -44,7 +47,14 @@ def main():
     parser.add_argument("--date", type=str, help="Date to process (YYYY-MM-DD)")
     parser.add_argument("--all", action="store_true", help="Process all teams")
     parser.add_argument("--schedule", action="store_true", help="Run as a scheduled service")
+    parser.add_argument("--watch", action="store_true", help="Watch live games and process teams as soon as their games end")
     parser.add_argument("--no-distribute", action="store_true", help="Skip Podbean distribution")
+    parser.add_argument("--backfill", nargs=2, metavar=("START", "END"), help="Process all teams for a date range (YYYY-MM-DD YYYY-MM-DD)")
+    parser.add_argument("--distribute", action="store_true", help="With --backfill, publish the backfilled episodes to Podbean")
+    parser.add_argument("--batch", action="store_true", help="With --all, generate the scripts with one Anthropic Message Batch")
+    parser.add_argument("--force-regenerate", action="store_true", help="Regenerate scripts even if a cached script matches their inputs")
+    parser.add_argument("--data-only", action="store_true", help="With --backfill, only rebuild the MLB data files")
+    parser.add_argument("--search-news", type=str, metavar="QUERY", help="Search archived news (optionally with --team and --date as the latest date)")
     
     args = parser.parse_args()
     
@@ -53,23 +63,63 @@ def main():
     os.makedirs("scripts", exist_ok=True)
     os.makedirs("audio", exist_ok=True)
     
-    processor = PodcastProcessor()
+    processor = PodcastProcessor(force_regenerate=args.force_regenerate)
     
     # Determine whether to distribute
     distribute = not args.no_distribute
     
-    if args.schedule:
+    if args.search_news:
+        # Search the news archive
+        team_code = validate_team(args.team.upper()) if args.team else None
+        until = validate_date(args.date) if args.date else None
+        try:
+            items = NewsArchive().search(args.search_news, team_code=team_code, until=until)
+        except sqlite3.OperationalError as e:
+            print(f"Error: Invalid search query '{args.search_news}': {e}")
+            sys.exit(1)
+        
+        print(f"\nFound {len(items)} archived news items:")
+        for item in items:
+            print(f"  {item['date']} {item['team_code']}: {item['headline']}")
+    elif args.schedule:
         # Run as a scheduled service
         logger.info("Starting scheduled service...")
-        scheduler = PodcastScheduler()
+        scheduler = PodcastScheduler(watch=args.watch)
         scheduler.start()
+    elif args.watch:
+        # Publish post-game episodes as games go Final
+        logger.info("Starting live game watcher...")
+        watcher = GameWatcher(processor, distribute=distribute)
+        try:
+            watcher.run()
+        except KeyboardInterrupt:
+            watcher.stop()
+    elif args.backfill:
+        # Process all teams for every date in a range
+        start_date = validate_date(args.backfill[0])
+        end_date = validate_date(args.backfill[1])
+        if end_date < start_date:
+            print("Error: Backfill end date must not be before the start date.")
+            sys.exit(1)
+        
+        logger.info(f"Backfilling all teams from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}...")
+        # Old episodes are only republished when asked for explicitly
+        results = processor.process_date_range(start_date, end_date, distribute=args.distribute, data_only=args.data_only)
+        
+        success_count = sum(1 for result in results if result.success)
+        print(f"\nBackfilled {len(results)} team-days:")
+        print(f"  {success_count} successfully processed")
+        if args.data_only:
+            print("  Only MLB data files were rebuilt (--data-only flag set)")
+        elif not args.distribute:
+            print("  Distribution to Podbean skipped (add --distribute to publish)")
     elif args.all:
         # Process all teams
         date = validate_date(args.date)
         logger.info(f"Processing all teams for {date.strftime('%Y-%m-%d')}...")
         
         # Add distribute parameter
-        results = processor.process_all_teams(date=date, distribute=distribute)
+        results = processor.process_all_teams(date=date, distribute=distribute, batch=args.batch)
         
         # Print summary
         success_count = sum(1 for result in results if result.success)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the MLB data pipeline.
+Record real statsapi responses for a date once, then replay them with optional
+latency and error injection to measure process_team_daily_data and the whole
+batch without the network. The fetchers run in a temporary directory, so the
+caches, standings and team data they write never touch the working tree's data/.
+
+    python tests/benchmark_mlb_replay.py record --date 2024-07-01
+    python tests/benchmark_mlb_replay.py run --date 2024-07-01 --latency 0.05 --error-rate 0.01
+    python tests/benchmark_mlb_replay.py run --date 2024-07-01 --async
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+import datetime
+import tempfile
+import concurrent.futures
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import MLB_TEAMS, MLB_FIXTURES_DIR
+from utils.mlb_api import MLBDataFetcher
+from utils.replay import FixtureStore, ReplayConditions, record_fetcher, replay_fetcher
+
+def run_batch(fetcher, date, team_codes, max_workers):
+    """Fetch the slate once and process every team, like PodcastProcessor.process_all_teams."""
+    snapshot = fetcher.get_league_snapshot(date)
+    if not snapshot.hydrated:
+        snapshot.stat_table = fetcher.build_stat_table(snapshot, max_workers=max_workers)
+    
+    failures = 0
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(fetcher.process_team_daily_data, team_code, date, snapshot) for team_code in team_codes]
+        for future in concurrent.futures.as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                print(f"  Team failed: {str(e)}")
+    fetcher.clear_boxscore_cache()
+    return failures
+
+def record(args):
+    """Run the batch once against statsapi, recording every response."""
+    store = FixtureStore(args.fixtures)
+    fetcher = MLBDataFetcher()
+    record_fetcher(fetcher, store)
+    
+    print(f"Recording statsapi responses for {args.date} into {args.fixtures}...")
+    run_batch(fetcher, args.date, list(MLB_TEAMS.keys()), args.workers)
+    print(f"✅ Recorded {len(os.listdir(args.fixtures))} fixtures")
+
+def run(args):
+    """Replay the recorded responses and report timings."""
+    store = FixtureStore(args.fixtures)
+    conditions = ReplayConditions(args.latency, args.jitter, args.error_rate, seed=args.seed)
+    team_codes = list(MLB_TEAMS.keys())
+    
+    print(f"Replaying {args.date}: latency {args.latency}s ±{args.jitter}s, error rate {args.error_rate:.1%}")
+    
+    # Single team without a shared snapshot
+    fetcher = MLBDataFetcher()
+    replay_fetcher(fetcher, store, conditions)
+    start = time.perf_counter()
+    for _ in range(args.iterations):
+        fetcher.process_team_daily_data(args.team, args.date)
+        fetcher.clear_boxscore_cache()
+    single = (time.perf_counter() - start) / args.iterations
+    print(f"  process_team_daily_data({args.team}): {single * 1000:.1f} ms")
+    
+    # Whole batch
+    start = time.perf_counter()
+    failures = 0
+    for _ in range(args.iterations):
+        if args.use_async:
+            failures += run_async_batch(store, conditions, args.date, team_codes)
+        else:
+            failures += run_batch(fetcher, args.date, team_codes, args.workers)
+    batch = (time.perf_counter() - start) / args.iterations
+    mode = "async" if args.use_async else f"{args.workers} threads"
+    print(f"  Batch of {len(team_codes)} teams ({mode}): {batch:.2f} s, {len(team_codes) / batch:.1f} teams/s, {failures} failures")
+
+def run_async_batch(store, conditions, date, team_codes):
+    from utils.async_mlb_api import AsyncMLBDataFetcher
+    from utils.replay import AsyncReplayTransport
+    
+    async def batch():
+        async with AsyncMLBDataFetcher(transport=AsyncReplayTransport(store, conditions)) as fetcher:
+            fetcher.cache = None
+            team_days = await fetcher.process_all_teams_daily_data(date, team_codes)
+            return len(team_codes) - len(team_days)
+    
+    return asyncio.run(batch())
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline statsapi record-and-replay benchmark")
+    parser.add_argument("command", choices=["record", "run"])
+    parser.add_argument("--date", type=lambda value: datetime.datetime.strptime(value, "%Y-%m-%d").date(),
+                        default=datetime.date.today() - datetime.timedelta(days=1))
+    parser.add_argument("--fixtures", default=MLB_FIXTURES_DIR, help="Fixture directory")
+    parser.add_argument("--team", default="NYY", help="Team for the single-team benchmark")
+    parser.add_argument("--workers", type=int, default=5, help="Worker threads for the batch")
+    parser.add_argument("--iterations", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random latency variation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of responses replaced by a 503")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Benchmark the async fetcher")
+    args = parser.parse_args()
+    
+    # Every data path is relative, so run the fetchers from a scratch directory
+    # and keep only the fixtures where they were asked for
+    args.fixtures = os.path.abspath(args.fixtures)
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="mlb_replay_") as scratch:
+        os.chdir(scratch)
+        try:
+            if args.command == "record":
+                record(args)
+            else:
+                run(args)
+        finally:
+            os.chdir(cwd)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests for the asynchronous statsapi fetcher and its shared response cache.
+
+    python -m pytest tests/test_async_mlb_api.py
+"""
+
+import os
+import sys
+import asyncio
+import threading
+
+import httpx
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_cache import ResponseCache
+from utils.async_mlb_api import AsyncMLBDataFetcher
+
+PARAMS = {"sportId": 1, "date": "2024-07-01"}
+
+class ThreadRecordingCache(ResponseCache):
+    """Response cache remembering which thread each disk operation ran on."""
+
+    def __init__(self, cache_dir):
+        super().__init__(cache_dir)
+        self.threads = []
+
+    def get(self, url, params=None):
+        self.threads.append(threading.current_thread())
+        return super().get(url, params)
+
+    def _write(self, key, entry):
+        self.threads.append(threading.current_thread())
+        super()._write(key, entry)
+
+def statsapi(responses, requests):
+    def handler(request):
+        requests.append(dict(request.headers))
+        return responses.pop(0)
+
+    return httpx.MockTransport(handler)
+
+def fetch_twice(tmp_path, responses):
+    requests = []
+
+    async def fetch():
+        async with AsyncMLBDataFetcher(transport=statsapi(responses, requests)) as fetcher:
+            fetcher.cache = ThreadRecordingCache(str(tmp_path))
+            first = await fetcher._make_request("schedule", PARAMS, max_age=0)
+            second = await fetcher._make_request("schedule", PARAMS, max_age=0)
+            return first, second, fetcher.cache.threads, threading.current_thread()
+
+    return (*asyncio.run(fetch()), requests)
+
+def test_stale_entries_are_revalidated(tmp_path):
+    first, second, _, _, requests = fetch_twice(tmp_path, [
+        httpx.Response(200, json={"dates": ["first"]}, headers={"ETag": '"v1"'}),
+        httpx.Response(304),
+    ])
+
+    assert first == second == {"dates": ["first"]}
+    assert "if-none-match" not in requests[0]
+    assert requests[1]["if-none-match"] == '"v1"'
+
+def test_cache_disk_io_runs_off_the_event_loop(tmp_path):
+    _, _, threads, loop_thread, _ = fetch_twice(tmp_path, [
+        httpx.Response(200, json={"dates": ["first"]}, headers={"ETag": '"v1"'}),
+        httpx.Response(200, json={"dates": ["second"]}, headers={"ETag": '"v2"'}),
+    ])
+
+    # Two reads and two writes, none of them on the event loop's thread
+    assert len(threads) == 4
+    assert loop_thread not in threads
+
+def test_boxscores_are_parsed_selectively_as_they_stream(tmp_path):
+    pytest.importorskip("ijson")
+    boxscore = {
+        "copyright": "Copyright 2024 MLB Advanced Media, L.P.",
+        "teams": {"home": {
+            "team": {"id": 147, "name": "New York Yankees", "link": "/api/v1/teams/147"},
+            "teamStats": {"batting": {"hits": 9, "runs": 5}},
+            "players": {"ID592450": {
+                "person": {"id": 592450, "fullName": "Aaron Judge"},
+                "stats": {"batting": {"homeRuns": 2, "rbi": 3, "summary": "2-4"}},
+            }},
+        }},
+    }
+    requests = []
+
+    async def fetch():
+        transport = statsapi([httpx.Response(200, json=boxscore)], requests)
+        async with AsyncMLBDataFetcher(transport=transport) as fetcher:
+            fetcher.cache = ResponseCache(str(tmp_path))
+            first = await fetcher.get_game_boxscore("745001", final=True, summary_only=True)
+            # Served from the cached summary without another request
+            second = await fetcher.get_game_boxscore("745001", final=True, summary_only=True)
+            return first, second
+
+    first, second = asyncio.run(fetch())
+
+    assert first == second
+    assert len(requests) == 1
+    home = first["teams"]["home"]
+    assert home["team"] == {"id": 147, "name": "New York Yankees"}
+    assert home["teamStats"] == {"batting": {"hits": 9}}
+    assert home["players"]["ID592450"]["stats"]["batting"] == {"homeRuns": 2, "rbi": 3}
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the asynchronous Perplexity news client used to prefetch news.
+
+    python -m pytest tests/test_async_perplexity_api.py
+"""
+
+import os
+import sys
+import asyncio
+import datetime
+from types import SimpleNamespace
+
+import httpx
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.async_perplexity_api import AsyncPerplexityNewsFetcher
+from utils.perplexity_api import wait_retry_after
+
+DATE = datetime.date(2024, 7, 1)
+NEWS = {"choices": [{"message": {"content": "Big win."}}]}
+
+def test_concurrent_requests_are_capped(tmp_path, monkeypatch):
+    # The news cache writes under data/
+    monkeypatch.chdir(tmp_path)
+    in_flight = SimpleNamespace(now=0, peak=0, total=0)
+
+    async def handler(request):
+        in_flight.now += 1
+        in_flight.total += 1
+        in_flight.peak = max(in_flight.peak, in_flight.now)
+        await asyncio.sleep(0.05)
+        in_flight.now -= 1
+        return httpx.Response(200, json=NEWS)
+
+    async def prefetch():
+        transport = httpx.MockTransport(handler)
+        async with AsyncPerplexityNewsFetcher(max_concurrency=2, transport=transport) as fetcher:
+            fetcher.streaming = False
+            return await fetcher.fetch_and_save_news([["NYY"], ["BOS"], ["TOR"], ["TB"], ["BAL"], ["LAD"]], DATE)
+
+    news = asyncio.run(prefetch())
+
+    assert len(news) == 6
+    assert in_flight.total == 6
+    assert in_flight.peak == 2
+
+def test_rate_limited_requests_are_retried():
+    responses = [httpx.Response(429, headers={"Retry-After": "0"}), httpx.Response(200, json=NEWS)]
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return responses.pop(0)
+
+    async def fetch():
+        async with AsyncPerplexityNewsFetcher(transport=httpx.MockTransport(handler)) as fetcher:
+            fetcher.streaming = False
+            return await fetcher.get_team_news("New York Yankees")
+
+    assert asyncio.run(fetch()) == "Big win."
+    assert len(requests) == 2
+
+def test_client_errors_are_not_retried():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(400, json={"error": "bad request"})
+
+    async def fetch():
+        async with AsyncPerplexityNewsFetcher(transport=httpx.MockTransport(handler)) as fetcher:
+            fetcher.streaming = False
+            return await fetcher.get_team_news("New York Yankees")
+
+    assert asyncio.run(fetch()) is None
+    assert len(requests) == 1
+
+def retry_state(status_code, headers=None):
+    response = httpx.Response(status_code, headers=headers, request=httpx.Request("POST", "https://api.perplexity.ai"))
+    error = httpx.HTTPStatusError("error", request=response.request, response=response)
+    return SimpleNamespace(outcome=SimpleNamespace(exception=lambda: error))
+
+def test_wait_honors_retry_after_up_to_the_limit():
+    wait = wait_retry_after(lambda retry_state: 4.0, max_wait=60)
+
+    assert wait(retry_state(429, {"Retry-After": "12"})) == 12.0
+    assert wait(retry_state(429, {"Retry-After": "600"})) == 60
+    assert wait(retry_state(429, {"Retry-After": "Wed, 21 Oct 2015 07:28:00 GMT"})) == 0.0
+    # Without a usable Retry-After the fallback strategy decides
+    assert wait(retry_state(503)) == 4.0
+    assert wait(retry_state(429, {"Retry-After": "soon"})) == 4.0
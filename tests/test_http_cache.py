@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the on-disk statsapi response cache and its revalidation.
+
+    python -m pytest tests/test_http_cache.py
+"""
+
+import os
+import sys
+import time
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.http_cache import ResponseCache
+from utils.mlb_api import MLBDataFetcher
+
+URL = "https://statsapi.mlb.com/api/v1/schedule"
+PARAMS = {"sportId": 1, "date": "2024-07-01"}
+
+def test_store_and_get_round_trip(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.store(URL, PARAMS, {"dates": []}, {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jul 2024 12:00:00 GMT"})
+
+    entry = cache.get(URL, {"date": "2024-07-01", "sportId": 1})
+    assert entry["body"] == {"dates": []}
+    assert entry["etag"] == '"v1"'
+    assert cache.get(URL, {**PARAMS, "date": "2024-07-02"}) is None
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+
+def test_freshness_follows_the_ttl():
+    entry = {"fetched_at": time.time() - 120}
+    assert ResponseCache.is_fresh(entry, 300)
+    assert not ResponseCache.is_fresh(entry, 60)
+    # Immutable responses never expire
+    assert ResponseCache.is_fresh({"fetched_at": 0}, None)
+
+def test_conditional_headers_carry_the_validators():
+    entry = {"etag": '"v1"', "last_modified": "Mon, 01 Jul 2024 12:00:00 GMT"}
+    assert ResponseCache.conditional_headers(entry) == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Mon, 01 Jul 2024 12:00:00 GMT",
+    }
+    assert ResponseCache.conditional_headers({"etag": None, "last_modified": None}) == {}
+    assert ResponseCache.conditional_headers(None) == {}
+
+def test_touch_refreshes_a_revalidated_entry(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    entry = cache.store(URL, PARAMS, {"dates": []})
+    entry["fetched_at"] = 0
+    cache.touch(entry)
+
+    assert cache.is_fresh(cache.get(URL, PARAMS), 60)
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.body
+
+class FakeSession:
+    """Session answering with a fixed list of responses and recording request headers."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.headers = []
+
+    def get(self, url, params=None, headers=None, stream=False):
+        self.headers.append(headers)
+        return self.responses.pop(0)
+
+def fetcher_with(tmp_path, responses):
+    fetcher = MLBDataFetcher()
+    fetcher.cache = ResponseCache(str(tmp_path))
+    fetcher.session = FakeSession(responses)
+    return fetcher
+
+def test_fetcher_revalidates_stale_entries(tmp_path):
+    fetcher = fetcher_with(tmp_path, [
+        FakeResponse(200, {"dates": ["first"]}, {"ETag": '"v1"'}),
+        FakeResponse(304),
+    ])
+
+    assert fetcher._make_request("schedule", PARAMS, max_age=0) == {"dates": ["first"]}
+    # A stale entry is revalidated, and a 304 serves the cached body
+    assert fetcher._make_request("schedule", PARAMS, max_age=0) == {"dates": ["first"]}
+    assert fetcher.session.headers == [{}, {"If-None-Match": '"v1"'}]
+    assert fetcher.cache.is_fresh(fetcher.cache.get(f"{fetcher.base_url}/schedule", PARAMS), 60)
+
+def test_fetcher_serves_fresh_entries_without_a_request(tmp_path):
+    fetcher = fetcher_with(tmp_path, [FakeResponse(200, {"dates": ["first"]}, {"ETag": '"v1"'})])
+
+    fetcher._make_request("schedule", PARAMS, max_age=300)
+    assert fetcher._make_request("schedule", PARAMS, max_age=300) == {"dates": ["first"]}
+    assert len(fetcher.session.headers) == 1
+
+def test_fetcher_replaces_a_modified_entry(tmp_path):
+    fetcher = fetcher_with(tmp_path, [
+        FakeResponse(200, {"dates": ["first"]}, {"ETag": '"v1"'}),
+        FakeResponse(200, {"dates": ["second"]}, {"ETag": '"v2"'}),
+    ])
+
+    fetcher._make_request("schedule", PARAMS, max_age=0)
+    assert fetcher._make_request("schedule", PARAMS, max_age=0) == {"dates": ["second"]}
+    assert fetcher.cache.get(f"{fetcher.base_url}/schedule", PARAMS)["etag"] == '"v2"'
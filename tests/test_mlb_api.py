@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Tests for the synchronous statsapi fetcher.
+
+    python -m pytest tests/test_mlb_api.py
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.mlb_api import MLBDataFetcher, parse_boxscore_summary, summarize_boxscore
+
+BOXSCORE = {
+    "copyright": "Copyright 2024 MLB Advanced Media, L.P.",
+    "teams": {
+        side: {
+            "team": {"id": team_id, "name": name, "link": f"/api/v1/teams/{team_id}"},
+            "teamStats": {"batting": {"hits": hits, "runs": 5}, "pitching": {"era": "3.50"}},
+            "players": {
+                f"ID{player_id}": {
+                    "person": {"id": player_id, "fullName": player, "link": f"/api/v1/people/{player_id}"},
+                    "position": {"abbreviation": "RF"},
+                    "stats": {
+                        "batting": {"atBats": 4, "hits": 2, "homeRuns": homers, "rbi": 3, "baseOnBalls": 1, "summary": "2-4"},
+                        "pitching": {},
+                    },
+                    "seasonStats": {"batting": {"avg": ".310"}},
+                },
+            },
+            "battingOrder": [player_id],
+        }
+        for side, team_id, name, hits, player_id, player, homers in (
+            ("home", 147, "New York Yankees", 9, 592450, "Aaron Judge", 2),
+            ("away", 111, "Boston Red Sox", 6, 646240, "Rafael Devers", 0),
+        )
+    },
+    "officials": [{"official": {"fullName": "Umpire"}}],
+}
+
+class SlowBoxscores:
+    """Stand-in for get_game_boxscore that holds every fetch until released."""
+
+    def __init__(self, failures=0):
+        self.calls = []
+        self.failures = failures
+        self.release = threading.Event()
+
+    def __call__(self, game_id, final=False, summary_only=False):
+        self.calls.append(game_id)
+        self.release.wait(timeout=5)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("statsapi unavailable")
+        return {"game": game_id}
+
+def fetcher_with(boxscores):
+    fetcher = MLBDataFetcher()
+    fetcher.cache = None
+    fetcher.get_game_boxscore = boxscores
+    return fetcher
+
+def test_concurrent_requests_share_one_boxscore_fetch():
+    boxscores = SlowBoxscores()
+    fetcher = fetcher_with(boxscores)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(fetcher.get_final_boxscore, 745001) for _ in range(4)]
+        # Hold the first fetch while the other requests arrive
+        time.sleep(0.2)
+        boxscores.release.set()
+        results = [future.result() for future in futures]
+
+    assert boxscores.calls == [745001]
+    assert results == [{"game": 745001}] * 4
+    # Later requests are served from the cache
+    assert fetcher.get_final_boxscore(745001) == {"game": 745001}
+    assert boxscores.calls == [745001]
+
+def test_failed_fetches_are_not_cached():
+    boxscores = SlowBoxscores(failures=1)
+    boxscores.release.set()
+    fetcher = fetcher_with(boxscores)
+
+    with pytest.raises(RuntimeError):
+        fetcher.get_final_boxscore(745001)
+    assert fetcher.get_final_boxscore(745001) == {"game": 745001}
+    assert boxscores.calls == [745001, 745001]
+
+def test_clearing_the_cache_fetches_again():
+    boxscores = SlowBoxscores()
+    boxscores.release.set()
+    fetcher = fetcher_with(boxscores)
+
+    fetcher.get_final_boxscore(745001)
+    fetcher.clear_boxscore_cache()
+    fetcher.get_final_boxscore(745001)
+
+    assert boxscores.calls == [745001, 745001]
+
+def test_selective_parse_keeps_only_summary_fields():
+    pytest.importorskip("ijson")
+    summary = parse_boxscore_summary(io.BytesIO(json.dumps(BOXSCORE).encode("utf-8")))
+
+    assert set(summary) == {"teams"}
+    home = summary["teams"]["home"]
+    assert home["team"] == {"id": 147, "name": "New York Yankees"}
+    assert home["teamStats"] == {"batting": {"hits": 9}}
+    player = home["players"]["ID592450"]
+    assert set(player) == {"person", "stats"}
+    assert player["person"] == {"id": 592450, "fullName": "Aaron Judge"}
+    assert "summary" not in player["stats"]["batting"]
+
+def test_selective_parse_summarizes_like_the_full_boxscore():
+    pytest.importorskip("ijson")
+    summary = parse_boxscore_summary(io.BytesIO(json.dumps(BOXSCORE).encode("utf-8")))
+    assert summarize_boxscore(summary) == summarize_boxscore(BOXSCORE)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Tests for the SQLite full-text news archive.
+
+    python -m pytest tests/test_news_archive.py
+"""
+
+import os
+import sys
+import datetime
+
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.news_archive import NewsArchive, parse_news_items
+
+DATE = datetime.date(2024, 7, 1)
+
+def day(offset):
+    return DATE + datetime.timedelta(days=offset)
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = NewsArchive(str(tmp_path / "news_archive.db"))
+    archive.add_team_news("NYY", day(-3), "**Injury update:**\nAaron Judge left the game with a sore wrist.\n\nThe bullpen threw four scoreless innings.")
+    archive.add_team_news("NYY", day(-1), "Gerrit Cole is close to a rehab assignment after his elbow injury [1].")
+    archive.add_team_news("BOS", day(-1), "Rafael Devers has an injured shoulder.")
+    archive.add_team_news("NYY", day(-10), "Spring training injury news from long ago.")
+    return archive
+
+def test_parse_news_items_finds_headlines():
+    items = parse_news_items("## Trade talk\nThe Yankees want a reliever.\n\nJudge homered twice. Fans loved it [2].")
+    assert items[0] == {"source": "Perplexity", "headline": "Trade talk", "body": "The Yankees want a reliever."}
+    assert items[1]["headline"] == "Judge homered twice."
+    assert "[2]" not in items[1]["body"]
+
+    articles = parse_news_items([{"source": "ESPN", "title": "Trade", "description": "Done."}])
+    assert articles == [{"source": "ESPN", "headline": "Trade", "body": "Done."}]
+
+def test_search_matches_full_text_for_a_team(archive):
+    results = archive.search("injury OR injured", team_code="NYY", since=day(-7))
+
+    assert [result["date"] for result in results] == ["2024-06-30", "2024-06-28"]
+    assert results[1]["headline"] == "Injury update"
+    assert all(result["team_code"] == "NYY" for result in results)
+
+def test_recent_covers_the_days_before_a_date(archive):
+    results = archive.recent("NYY", DATE, days=7)
+    assert [result["date"] for result in results] == ["2024-06-30", "2024-06-28", "2024-06-28"]
+    assert archive.recent("NYY", day(-1), days=7, query="Cole") == []
+
+def test_storing_a_day_again_replaces_it(archive):
+    assert archive.add_team_news("NYY", day(-1), "Cole threw a bullpen session.") == 1
+    assert [result["body"] for result in archive.search(team_code="NYY", since=day(-1))] == ["Cole threw a bullpen session."]
+    # The full-text index follows the replaced rows
+    assert archive.search("rehab") == []
+
+def test_unusable_database_disables_the_archive(tmp_path):
+    path = tmp_path / "news_archive.db"
+    path.write_bytes(b"this is not a sqlite database" * 100)
+
+    archive = NewsArchive(str(path))
+
+    assert not archive.enabled
+    assert archive.add_team_news("NYY", DATE, "Judge homered.") == 0
+    assert archive.search("Judge") == []
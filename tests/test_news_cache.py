@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Tests for the news cache and the prefetched news it is filled with.
+
+    python -m pytest tests/test_news_cache.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+import datetime
+
+import httpx
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.news_cache as news_cache
+from utils.news_cache import NewsCache
+
+DATE = datetime.date(2024, 7, 1)
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(news_cache.time, "time", clock)
+    return clock
+
+@pytest.fixture
+def cache(tmp_path):
+    return NewsCache(str(tmp_path), ttl=3600, negative_ttl=900)
+
+def test_news_is_served_until_the_ttl(cache, clock):
+    cache.store("NYY", DATE, "The Yankees won.")
+    assert cache.get("NYY", DATE) == "The Yankees won."
+
+    clock.now += 3599
+    assert cache.is_fresh("NYY", DATE)
+    clock.now += 2
+    assert cache.get("NYY", DATE) is None
+
+def test_empty_news_expires_after_the_negative_ttl(cache, clock):
+    cache.store("NYY", DATE, [])
+    assert cache.get("NYY", DATE) == []
+
+    clock.now += 901
+    assert not cache.is_fresh("NYY", DATE)
+    assert cache.get("NYY", DATE) is None
+
+def test_whitespace_news_counts_as_empty():
+    assert NewsCache.is_empty("  \n ")
+    assert NewsCache.is_empty([])
+    assert not NewsCache.is_empty([{"title": "Trade"}])
+
+def test_unchanged_news_keeps_its_file(cache, clock):
+    path = cache.store("NYY", DATE, "The Yankees won.")
+    os.utime(path, (0, 0))
+    clock.now += 4000
+    cache.store("NYY", DATE, "The Yankees won.")
+
+    assert os.path.getmtime(path) == 0
+    # The refetch still renews the news
+    assert cache.get("NYY", DATE) == "The Yankees won."
+
+def test_news_without_metadata_is_aged_by_its_file(cache, clock):
+    path = cache.news_path("NYY", DATE)
+    os.makedirs(os.path.dirname(path))
+    with open(path, "w") as f:
+        json.dump("The Yankees won.", f)
+    os.utime(path, (clock.now - 60, clock.now - 60))
+
+    assert cache.get("NYY", DATE) == "The Yankees won."
+    clock.now += 3600
+    assert cache.get("NYY", DATE) is None
+
+def perplexity_transport(failing):
+    """Answer team news requests, failing those that mention a team in failing."""
+
+    def handler(request):
+        prompt = json.loads(request.content)["messages"][-1]["content"]
+        if any(team_name in prompt for team_name in failing):
+            return httpx.Response(400, json={"error": "bad request"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "<think>hmm</think>Big win."}}]})
+
+    return httpx.MockTransport(handler)
+
+def test_prefetch_does_not_cache_failed_requests(tmp_path, monkeypatch):
+    from utils.async_perplexity_api import AsyncPerplexityNewsFetcher
+
+    # The news cache writes under data/
+    monkeypatch.chdir(tmp_path)
+
+    async def prefetch():
+        async with AsyncPerplexityNewsFetcher(transport=perplexity_transport(["Boston Red Sox"])) as fetcher:
+            return await fetcher.fetch_and_save_news([["NYY"], ["BOS"]], DATE)
+
+    news = asyncio.run(prefetch())
+
+    assert news == {"NYY": "Big win."}
+    cache = NewsCache()
+    assert cache.get("NYY", DATE) == "Big win."
+    # The failed team is left for its own pipeline to fetch, not cached as empty
+    assert not cache.is_fresh("BOS", DATE)
+    assert not os.path.exists(cache.news_path("BOS", DATE))
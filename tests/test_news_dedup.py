@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for deduplicating news across teams with the MinHash news index.
+
+    python -m pytest tests/test_news_dedup.py
+"""
+
+import os
+import sys
+import datetime
+from types import SimpleNamespace
+
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.news_dedup import MinHasher, NewsIndex, split_news_items
+
+DATE = datetime.date(2024, 7, 1)
+
+TRADE = "The Yankees acquired reliever Mason Miller from the Athletics in exchange for two prospects on Monday night."
+TRADE_AGAIN = "The Yankees acquired reliever Mason Miller from the Athletics in exchange for two prospects on Monday."
+INJURY = "Red Sox shortstop Trevor Story was placed on the injured list with a sprained left shoulder."
+ROTATION = "The Blue Jays moved Kevin Gausman up a day in the rotation to face the Yankees on Tuesday."
+
+NEWS = {
+    "NYY": f"{TRADE}\n\n{ROTATION}",
+    "BOS": f"{TRADE_AGAIN}\n\n{INJURY}",
+    "TOR": f"{ROTATION}\n\n{TRADE}",
+}
+
+@pytest.fixture(autouse=True)
+def index_dir(tmp_path, monkeypatch):
+    # for_date keeps its indexes on the class and saves them under data/
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(NewsIndex, "_instances", {})
+    return str(tmp_path / "news_index")
+
+def test_split_news_items():
+    assert split_news_items("First.\n\n  \n\nSecond.\n") == ["First.", "Second."]
+    assert split_news_items([{"title": "Trade", "description": "Done."}, "junk"]) == ["Trade: Done."]
+    assert split_news_items(None) == []
+
+def test_minhash_estimates_similarity():
+    hasher = MinHasher()
+    assert hasher.similarity(hasher.signature(TRADE), hasher.signature(TRADE)) == 1.0
+    assert hasher.similarity(hasher.signature(TRADE), hasher.signature(TRADE_AGAIN)) > 0.7
+    assert hasher.similarity(hasher.signature(TRADE), hasher.signature(INJURY)) < 0.2
+
+def test_near_duplicates_are_linked_across_teams(index_dir):
+    index = NewsIndex(DATE, index_dir)
+    nyy = index.add_team_news("NYY", NEWS["NYY"])
+    bos = index.add_team_news("BOS", NEWS["BOS"])
+
+    assert nyy[0] == bos[0]
+    assert sorted(index.items[nyy[0]]["teams"]) == ["BOS", "NYY"]
+    assert len(index.items) == 3
+    assert index.covered_by("BOS", TRADE)
+    assert not index.covered_by("NYY", INJURY)
+
+def test_refetched_news_replaces_the_team_links(index_dir):
+    index = NewsIndex(DATE, index_dir)
+    index.add_team_news("NYY", NEWS["NYY"])
+    index.add_team_news("NYY", INJURY)
+
+    assert [index.items[item_id]["text"] for item_id in index.team_items["NYY"]] == [INJURY]
+    assert all("NYY" not in item["teams"] for item in index.items.values() if item["text"] != INJURY)
+
+def test_save_and_load_round_trip(index_dir):
+    index = NewsIndex(DATE, index_dir)
+    for team_code in ("NYY", "BOS"):
+        index.add_team_news(team_code, NEWS[team_code])
+
+    loaded = NewsIndex.load(DATE, index_dir)
+    assert loaded.team_items == index.team_items
+    assert loaded.items == index.items
+    assert loaded.team_texts == index.team_texts
+    # The LSH buckets are rebuilt, so loaded items are still found
+    assert loaded.covered_by("NYY", TRADE_AGAIN)
+    assert [name for name in os.listdir(index_dir) if name.endswith(".tmp")] == []
+
+def test_digest_does_not_depend_on_indexing_order(index_dir):
+    digests = []
+    for order in (["NYY", "BOS", "TOR"], ["TOR", "BOS", "NYY"], ["BOS", "NYY", "TOR", "NYY"]):
+        index = NewsIndex(DATE, os.path.join(index_dir, "-".join(order)))
+        for team_code in order:
+            index.add_team_news(team_code, NEWS[team_code])
+        digests.append({team_code: index.render_team_news(team_code) for team_code in NEWS})
+
+    assert digests[0] == digests[1] == digests[2]
+    assert "(also reported for the Boston Red Sox, Toronto Blue Jays)" in digests[0]["NYY"]
+
+def test_digest_leaves_out_stories_of_the_previous_episode(index_dir):
+    previous = NewsIndex(DATE - datetime.timedelta(days=1), index_dir)
+    previous.add_team_news("BOS", INJURY)
+    index = NewsIndex(DATE, index_dir)
+    index.add_team_news("BOS", NEWS["BOS"])
+
+    digest = index.render_team_news("BOS", previous)
+    assert INJURY not in digest
+    assert digest.endswith("(1 story already covered in the previous episode left out.)")
+
+def test_processor_indexes_every_team_before_any_prompt():
+    from utils.processor import PodcastProcessor
+
+    news_cache = SimpleNamespace(get=lambda team_code, date: NEWS.get(team_code, []))
+    processor = SimpleNamespace(perplexity_api=SimpleNamespace(news_cache=news_cache))
+    PodcastProcessor.index_news(processor, ["NYY", "BOS", "TOR", "LAD"], DATE)
+
+    index = NewsIndex.for_date(DATE)
+    assert sorted(index.team_items) == ["BOS", "NYY", "TOR"]
+    assert "Boston Red Sox" in index.render_team_news("NYY")
+
+def test_for_date_evicts_old_dates():
+    first = NewsIndex.for_date(DATE)
+    assert NewsIndex.for_date(DATE) is first
+
+    for offset in range(1, 4):
+        NewsIndex.for_date(DATE + datetime.timedelta(days=offset))
+    assert sorted(NewsIndex._instances) == [DATE + datetime.timedelta(days=offset) for offset in (1, 2, 3)]
+    # An earlier date is still loaded on demand
+    assert NewsIndex.for_date(DATE) is not first
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for parsing streamed Perplexity completions.
+
+    python -m pytest tests/test_perplexity_stream.py
+"""
+
+import os
+import sys
+import json
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.perplexity_api import ThinkStripper, stream_deltas
+
+RESPONSE = "<think>\nThe user wants Yankees news.\n</think>\n\nThe Yankees won again.\n\nJudge hit his 30th homer."
+
+def strip(chunks):
+    stripper = ThinkStripper()
+    return "".join(stripper.feed(chunk) for chunk in chunks) + stripper.flush()
+
+def test_think_section_is_removed():
+    assert strip([RESPONSE]) == "The Yankees won again.\n\nJudge hit his 30th homer."
+
+def test_tags_split_across_chunks():
+    expected = strip([RESPONSE])
+    for size in range(1, 12):
+        chunks = [RESPONSE[index:index + size] for index in range(0, len(RESPONSE), size)]
+        assert strip(chunks) == expected
+
+def test_reasoning_is_never_emitted():
+    stripper = ThinkStripper()
+    assert stripper.feed("<thi") == ""
+    assert stripper.feed("nk>secret plans</th") == ""
+    assert stripper.feed("ink>News.") == "News."
+
+def test_text_without_think_section_passes_through():
+    assert strip(["The Red Sox ", "lost ", "<b>late</b>."]) == "The Red Sox lost <b>late</b>."
+
+def test_unclosed_think_section_is_dropped():
+    assert strip(["Intro. <think>never closed"]) == "Intro. "
+
+def test_stream_deltas_reads_content_until_done():
+    lines = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": "The "}}]}),
+        "",
+        ": keep-alive",
+        "data: " + json.dumps({"choices": [{"delta": {}}]}),
+        "data: " + json.dumps({"choices": [{"delta": {"content": "Mets"}}]}),
+        "data: [DONE]",
+        "data: " + json.dumps({"choices": [{"delta": {"content": " ignored"}}]}),
+    ]
+    assert list(stream_deltas(lines)) == ["The ", "Mets"]
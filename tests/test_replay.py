@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tests for replaying recorded statsapi responses to the fetchers.
+
+    python -m pytest tests/test_replay.py
+"""
+
+import os
+import sys
+import json
+import asyncio
+import datetime
+
+import pytest
+import requests
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import MLB_API_BASE_URL
+from utils.mlb_api import MLBDataFetcher, schedule_params, schedule_range_params, standings_params
+from utils.replay import FixtureStore, replay_fetcher
+
+# The fixtures were recorded the day after this date, and are replayed today
+DATE = datetime.date(2024, 7, 1)
+NYY, BOS = 147, 111
+
+GAME = {
+    "gamePk": 745001,
+    "gameDate": "2024-07-01T23:05:00Z",
+    "status": {"abstractGameState": "Final", "detailedState": "Final"},
+    "teams": {
+        "home": {"team": {"id": NYY}, "score": 5, "isWinner": True},
+        "away": {"team": {"id": BOS}, "score": 3, "isWinner": False},
+    },
+}
+STANDINGS = {"records": [{"division": {"id": 201}, "teamRecords": [
+    {"team": {"id": NYY}, "wins": 51, "losses": 30, "streak": {"streakCode": "W3"}, "divisionRank": "1", "gamesBack": "-"},
+    {"team": {"id": BOS}, "wins": 49, "losses": 32, "streak": {"streakCode": "L2"}, "divisionRank": "2", "gamesBack": "2.0"},
+]}]}
+
+class CountingStore(FixtureStore):
+    """Fixture store remembering every lookup and the ones without a fixture."""
+
+    def __init__(self, root):
+        super().__init__(root)
+        self.lookups = []
+        self.misses = []
+
+    def load(self, url):
+        fixture = super().load(url)
+        self.lookups.append(url)
+        if fixture is None:
+            self.misses.append(url)
+        return fixture
+
+def record(store, endpoint, params, body):
+    url = requests.Request("GET", f"{MLB_API_BASE_URL}/{endpoint}", params=params).prepare().url
+    store.save(url, 200, "application/json", json.dumps(body).encode("utf-8"))
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # The standings table and team data are saved under data/
+    monkeypatch.chdir(tmp_path)
+    store = CountingStore(str(tmp_path / "fixtures"))
+    record(store, "schedule", schedule_params(DATE), {"dates": [{"date": "2024-07-01", "games": [GAME]}]})
+    record(store, "standings", standings_params(DATE), STANDINGS)
+    record(store, "schedule", schedule_range_params(DATE - datetime.timedelta(days=1), DATE),
+           {"dates": [{"date": "2024-07-01", "games": [GAME]}]})
+    return store
+
+def test_replay_on_a_later_day_reconciles_standings_from_the_fixtures(store):
+    assert datetime.date.today() != DATE + datetime.timedelta(days=1)
+    fetcher = MLBDataFetcher(fetch_mode="boxscore")
+    replay_fetcher(fetcher, store)
+
+    snapshot = fetcher.get_league_snapshot(DATE)
+
+    assert store.misses == []
+    assert fetcher._standings_table is not None
+    teams = {record["team"]["id"]: record for record in snapshot.standings["records"][0]["teamRecords"]}
+    # The game was already part of the standings pull, so it is not applied again
+    assert teams[NYY]["wins"] == 51
+    assert teams[BOS]["losses"] == 32
+
+def test_async_replay_on_a_later_day_reconciles_standings_from_the_fixtures(store):
+    from utils.async_mlb_api import AsyncMLBDataFetcher
+    from utils.replay import AsyncReplayTransport
+
+    async def snapshot():
+        async with AsyncMLBDataFetcher(fetch_mode="boxscore", transport=AsyncReplayTransport(store)) as fetcher:
+            fetcher.cache = None
+            return await fetcher.get_league_snapshot(DATE), fetcher._standings_table
+
+    snapshot, table = asyncio.run(snapshot())
+
+    assert store.misses == []
+    assert table is not None
+    assert snapshot.standings["records"][0]["teamRecords"]
+
+def test_missing_fixture_is_not_retried(store):
+    fetcher = MLBDataFetcher(fetch_mode="boxscore")
+    replay_fetcher(fetcher, store)
+
+    with pytest.raises(requests.HTTPError):
+        fetcher.get_schedule(DATE + datetime.timedelta(days=1))
+    assert len(store.misses) == 1
+    assert len(store.lookups) == 1
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for batch polling and the local Message Batches stand-in.
+
+    python -m pytest tests/test_script_batch.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.script_batch as script_batch
+from utils.script_batch import LocalBatchClient, BatchScriptGenerator, next_poll_interval
+
+def test_poll_interval_resets_while_results_arrive():
+    assert next_poll_interval(160, True, minimum=10, maximum=300) == 10
+
+def test_poll_interval_backs_off_up_to_the_maximum():
+    intervals = [10]
+    for _ in range(6):
+        intervals.append(next_poll_interval(intervals[-1], False, minimum=10, maximum=300))
+    assert intervals == [10, 20, 40, 80, 160, 300, 300]
+
+def test_local_batch_client_answers_every_request():
+    client = LocalBatchClient(lambda custom_id, params: f"script for {custom_id}")
+    batch = client.create(requests=[
+        {"custom_id": "NYY-20240701", "params": {}},
+        {"custom_id": "BOS-20240701", "params": {}},
+    ])
+    client._executor.shutdown(wait=True)
+
+    assert client.retrieve(batch.id).processing_status == "ended"
+    results = {response.custom_id: response.result for response in client.results(batch.id)}
+    assert results["NYY-20240701"].type == "succeeded"
+    assert results["BOS-20240701"].message.content[0].text == "script for BOS-20240701"
+
+def test_local_batch_client_reports_errors():
+    def responder(custom_id, params):
+        raise RuntimeError("overloaded")
+
+    client = LocalBatchClient(responder)
+    batch = client.create(requests=[{"custom_id": "NYY-20240701", "params": {}}])
+    client._executor.shutdown(wait=True)
+
+    assert client.retrieve(batch.id).request_counts.errored == 1
+    result = next(client.results(batch.id)).result
+    assert result.type == "errored"
+    assert "overloaded" in result.error.message
+
+class ScriptedBatches:
+    """Batches endpoint returning a fixed sequence of request counts."""
+
+    def __init__(self, done_counts, total):
+        self.done_counts = list(done_counts)
+        self.total = total
+
+    def retrieve(self, batch_id):
+        done = self.done_counts.pop(0)
+        return SimpleNamespace(
+            processing_status="ended" if done == self.total else "in_progress",
+            request_counts=SimpleNamespace(processing=self.total - done, succeeded=done, errored=0,
+                                           canceled=0, expired=0)
+        )
+
+def test_wait_polls_with_adaptive_intervals(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(script_batch.time, "sleep", sleeps.append)
+    generator = BatchScriptGenerator(SimpleNamespace(use_mock=False), batches=ScriptedBatches([0, 0, 0, 1, 3], 3),
+                                     poll_min=10, poll_max=300, timeout=3600)
+
+    assert generator.wait("msgbatch_test")
+    # The first poll counts as progress, then intervals double until a result arrives
+    assert sleeps == [10, 20, 40, 10]
+
+def test_wait_gives_up_at_the_timeout(monkeypatch):
+    monkeypatch.setattr(script_batch.time, "sleep", lambda seconds: None)
+    generator = BatchScriptGenerator(SimpleNamespace(use_mock=False), batches=ScriptedBatches([0] * 10, 3),
+                                     poll_min=10, poll_max=300, timeout=25)
+
+    assert not generator.wait("msgbatch_test")
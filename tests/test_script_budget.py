@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Tests for the script length budget and continuing scripts cut off at max_tokens.
+
+    python -m pytest tests/test_script_budget.py
+"""
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.script_budget import ScriptBudget, count_words
+
+OUTRO = "That is all for today. Thanks for listening."
+
+def budget(minutes=1.0):
+    return ScriptBudget(minutes=minutes, words_per_minute=100, speaking_rate=1.0, tolerance=0.1, tokens_per_word=1.4)
+
+def test_budget_follows_the_podcast_length():
+    assert (budget().target_words, budget().min_words, budget().max_words) == (100, 90, 110)
+    # 110 words * 1.4 tokens * 1.25 headroom, rounded up to a multiple of 100
+    assert budget().max_tokens == 200
+    assert budget().estimate_minutes("word " * 50) == 0.5
+
+def test_count_words_ignores_markup():
+    assert count_words("<speak>Five to <break time='1s'/> three.</speak>") == 3
+
+def test_trim_keeps_the_outro_and_whole_sentences():
+    body = " ".join(f"Sentence number {index} is here." for index in range(40))
+    script = f"Welcome to the show.\n\n{body}\n\n{OUTRO}"
+    trimmed = budget().trim(script)
+
+    assert count_words(trimmed) <= budget().max_words
+    assert trimmed.endswith(OUTRO)
+    assert trimmed.startswith("Welcome to the show.")
+    for paragraph in trimmed.split("\n\n")[:-1]:
+        assert paragraph.endswith(".")
+
+def test_trim_leaves_scripts_within_budget_alone():
+    script = f"Welcome to the show.\n\n{OUTRO}"
+    assert budget().trim(script) == script
+    assert budget().fit(script) == script
+
+def test_continuation_params_prefill_the_partial_script():
+    params = {"model": "m", "max_tokens": 200, "messages": [{"role": "user", "content": "Write it."}]}
+    continued = ScriptBudget.continuation_params(params, "The Yankees won \n")
+
+    assert continued["messages"][-1] == {"role": "assistant", "content": "The Yankees won"}
+    assert continued["messages"][0] == params["messages"][0]
+    assert continued["max_tokens"] == 200
+    assert len(params["messages"]) == 1
+
+@pytest.mark.parametrize("partial, continuation, joined", [
+    ("The Yankees won", " five to three.", "The Yankees won five to three."),
+    ("The Yankees won ", "five to three.", "The Yankees won five to three."),
+    ("The Yankees won ", " five to three.", "The Yankees won five to three."),
+    ("Judge hit a hom", "er.", "Judge hit a homer."),
+    ("They won.", "Next up, Boston.", "They won. Next up, Boston."),
+    ("They won.", "\n\nNext up, Boston.", "They won.\n\nNext up, Boston."),
+    ("They won.\n\n", "Next up, Boston.", "They won.\n\nNext up, Boston."),
+    ("They won.", "", "They won."),
+])
+def test_join_continuation(partial, continuation, joined):
+    assert ScriptBudget.join_continuation(partial, continuation) == joined
+
+def response(text, stop_reason):
+    usage = SimpleNamespace(input_tokens=10, cache_read_input_tokens=0, cache_creation_input_tokens=0)
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], stop_reason=stop_reason, usage=usage)
+
+class FakeStream:
+    def __init__(self, chunks, stop_reason):
+        self.text_stream = iter(chunks)
+        self.message = response("".join(chunks), stop_reason)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def get_final_message(self):
+        return self.message
+
+class FakeMessages:
+    """Messages endpoint answering each request with the next scripted response."""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+
+    def create(self, **params):
+        self.requests.append(params)
+        return response(*self.responses.pop(0))
+
+    def stream(self, **params):
+        self.requests.append(params)
+        chunks, stop_reason = self.responses.pop(0)
+        return FakeStream(chunks, stop_reason)
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    # The generator keeps its news archive and script cache under data/
+    monkeypatch.chdir(tmp_path)
+    from utils.anthropic_generator import ScriptGenerator
+
+    generator = ScriptGenerator()
+    generator.use_mock = False
+    generator.use_templates = False
+    return generator
+
+TEAM_DATA = {"team_code": "NYY", "team_name": "New York Yankees", "date": "2024-07-01", "games": [], "standings": {},
+             "news": "The Yankees called up a pitcher."}
+
+def test_finish_script_continues_a_cut_off_script(generator, monkeypatch):
+    monkeypatch.setattr("utils.anthropic_generator.SCRIPT_MAX_CONTINUATIONS", 1)
+    generator.client = SimpleNamespace(messages=FakeMessages([("Judge hit a hom", "max_tokens"), ("er.\n\nBye.", "end_turn")]))
+    params = generator.message_params("prompt")
+
+    script = generator.finish_script("New York Yankees", params, generator.client.messages.create(**params))
+
+    assert script == "Judge hit a homer.\n\nBye."
+    assert generator.client.messages.requests[-1]["messages"][-1]["content"] == "Judge hit a hom"
+    assert generator.cached_script(params) == script
+
+def test_finish_script_gives_up_and_does_not_cache(generator, monkeypatch):
+    monkeypatch.setattr("utils.anthropic_generator.SCRIPT_MAX_CONTINUATIONS", 1)
+    generator.client = SimpleNamespace(messages=FakeMessages([("Part one.", "max_tokens"), ("Part two", "max_tokens")]))
+    params = generator.message_params("prompt")
+
+    script = generator.finish_script("New York Yankees", params, generator.client.messages.create(**params))
+
+    assert script == "Part one. Part two"
+    assert len(generator.client.messages.requests) == 2
+    assert generator.cached_script(params) is None
+
+def test_stream_script_gives_up_after_the_last_continuation(generator, monkeypatch):
+    monkeypatch.setattr("utils.anthropic_generator.SCRIPT_MAX_CONTINUATIONS", 1)
+    messages = FakeMessages([(["Hello fans.\n\n", "The Yankees won."], "max_tokens"),
+                             (["Next up,", " Boston"], "max_tokens")])
+    generator.client = SimpleNamespace(messages=messages)
+
+    paragraphs = list(generator.stream_script(TEAM_DATA))
+
+    assert paragraphs == ["Hello fans.", "The Yankees won. Next up, Boston"]
+    # One request and one continuation, and no request built after the last one
+    assert len(messages.requests) == 2
+    assert generator.cached_script(generator.message_params(generator.build_prompt(TEAM_DATA))) is None
+
+def test_stream_script_caches_a_complete_script(generator):
+    generator.client = SimpleNamespace(messages=FakeMessages([(["Hello fans.\n\n", "Bye."], "end_turn")]))
+
+    assert list(generator.stream_script(TEAM_DATA)) == ["Hello fans.", "Bye."]
+    params = generator.message_params(generator.build_prompt(TEAM_DATA))
+    assert generator.cached_script(params) == "Hello fans.\n\nBye."
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed script cache.
+
+    python -m pytest tests/test_script_cache.py
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils.script_cache as script_cache
+from utils.script_cache import ScriptCache
+
+PARAMS = {
+    "model": "claude-model",
+    "max_tokens": 4000,
+    "temperature": 0.7,
+    "system": [{"type": "text", "text": "Write a podcast script."}],
+    "messages": [{"role": "user", "content": "Yankees 5, Red Sox 2"}],
+}
+
+def test_key_covers_the_request_and_template_version(monkeypatch):
+    key = ScriptCache.key(PARAMS)
+
+    assert key == ScriptCache.key(dict(reversed(list(PARAMS.items()))))
+    assert key != ScriptCache.key({**PARAMS, "temperature": 0.5})
+    assert key != ScriptCache.key({**PARAMS, "messages": [{"role": "user", "content": "Yankees 5, Red Sox 3"}]})
+
+    monkeypatch.setattr(script_cache, "PROMPT_TEMPLATE_VERSION", "next")
+    assert key != ScriptCache.key(PARAMS)
+
+def test_stored_scripts_are_served(tmp_path):
+    cache = ScriptCache(str(tmp_path))
+    key = ScriptCache.key(PARAMS)
+
+    assert cache.get(key) is None
+    path = cache.store(key, "Good morning, Yankees fans.")
+
+    assert path == os.path.join(str(tmp_path), key[:2], f"{key}.txt")
+    assert cache.get(key) == "Good morning, Yankees fans."
+    assert os.listdir(os.path.dirname(path)) == [f"{key}.txt"]
+
+def test_concurrent_stores_of_one_key_do_not_collide(tmp_path):
+    cache = ScriptCache(str(tmp_path))
+    key = ScriptCache.key(PARAMS)
+    scripts = [f"Script number {index}." for index in range(8)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda script: cache.store(key, script), scripts))
+
+    assert cache.get(key) in scripts
+    assert os.listdir(os.path.dirname(cache.path(key))) == [f"{key}.txt"]
+
+def test_failed_write_leaves_no_partial_script(tmp_path, monkeypatch):
+    cache = ScriptCache(str(tmp_path))
+    key = ScriptCache.key(PARAMS)
+
+    def disk_full(source, destination):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(script_cache.os, "replace", disk_full)
+    with pytest.raises(OSError):
+        cache.store(key, "Good morning, Yankees fans.")
+
+    assert cache.get(key) is None
+    assert os.listdir(os.path.dirname(cache.path(key))) == []
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Tests for splitting streamed script text into paragraphs.
+
+    python -m pytest tests/test_script_streaming.py
+"""
+
+import os
+import sys
+import random
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.anthropic_generator import ParagraphSplitter
+
+SCRIPT = "Good morning, Yankees fans.\n\nThe Yankees won five to three.\n \nNext up, Boston.\n\n\nThanks for listening."
+PARAGRAPHS = ["Good morning, Yankees fans.", "The Yankees won five to three.", "Next up, Boston.", "Thanks for listening."]
+
+def split(chunks):
+    splitter = ParagraphSplitter()
+    paragraphs = []
+    for chunk in chunks:
+        paragraphs.extend(splitter.feed(chunk))
+    return paragraphs + splitter.flush()
+
+def test_whole_text_is_split_into_paragraphs():
+    assert split([SCRIPT]) == PARAGRAPHS
+
+def test_paragraph_is_released_once_a_blank_line_follows():
+    splitter = ParagraphSplitter()
+    assert splitter.feed("Good morning, Yankees fans.\n") == []
+    assert splitter.feed("\nThe Yankees") == ["Good morning, Yankees fans."]
+    assert splitter.flush() == ["The Yankees"]
+
+def test_any_chunking_gives_the_same_paragraphs():
+    rng = random.Random(7)
+    for _ in range(200):
+        cuts = sorted(rng.sample(range(1, len(SCRIPT)), rng.randint(1, 20)))
+        chunks = [SCRIPT[start:end] for start, end in zip([0] + cuts, cuts + [len(SCRIPT)])]
+        assert split(chunks) == PARAGRAPHS
+
+def test_empty_stream_has_no_paragraphs():
+    assert split([]) == []
+    assert split(["\n\n", "  \n"]) == []
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Tests for the template scripts used on quiet days.
+
+    python -m pytest tests/test_script_templates.py
+"""
+
+import os
+import sys
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.models import TeamDay
+from utils.script_templates import TemplateRenderer, number_words, games_back_words, team_nickname
+
+def team_day(games=()):
+    return TeamDay.from_dict({
+        "team_code": "BOS",
+        "team_name": "Boston Red Sox",
+        "date": "2024-07-01",
+        "games": [
+            {"game_id": index, "status": status, "home_team": "Boston Red Sox", "away_team": "New York Yankees"}
+            for index, status in enumerate(games)
+        ],
+        "standings": {"wins": 50, "losses": 30, "division_rank": "2", "games_back": "1.5", "streak": "W3"},
+    })
+
+def test_off_day_with_a_little_news_is_rendered():
+    renderer = TemplateRenderer(max_news_items=2)
+    assert renderer.should_render(team_day(), "Trade rumors swirl.\n\nThe bullpen gets a rest.")
+
+def test_any_scheduled_game_goes_to_the_llm():
+    renderer = TemplateRenderer(max_news_items=2)
+    for status in ("Final", "Preview", "Live"):
+        assert not renderer.should_render(team_day([status]), "One story.")
+
+def test_failed_or_empty_news_goes_to_the_llm():
+    renderer = TemplateRenderer(max_news_items=2)
+    assert not renderer.should_render(team_day(), [])
+    assert not renderer.should_render(team_day(), "")
+    assert not renderer.should_render(team_day(), "   \n\n  ")
+
+def test_busy_news_day_goes_to_the_llm():
+    renderer = TemplateRenderer(max_news_items=2)
+    assert not renderer.should_render(team_day(), "First.\n\nSecond.\n\nThird.")
+
+def test_render_is_deterministic_and_spells_out_numbers():
+    renderer = TemplateRenderer()
+    script = renderer.render(team_day(), "Trade rumors swirl.")
+    assert script == renderer.render(team_day(), "Trade rumors swirl.")
+    assert "Red Sox" in script
+    assert "fifty and thirty" in script
+    assert "one and a half games" in script
+    assert not any(character.isdigit() for character in script.split("\n\n", 1)[1])
+
+def test_number_helpers():
+    assert number_words(0) == "zero"
+    assert number_words(42) == "forty-two"
+    assert number_words(105) == "one hundred five"
+    assert games_back_words(0.5) == "half a game"
+    assert games_back_words(1.0) == "one game"
+    assert games_back_words(3.5) == "three and a half games"
+    assert team_nickname("Toronto Blue Jays") == "Blue Jays"
+    assert team_nickname("New York Yankees") == "Yankees"
+
+def final(home_team, away_team, home_score, away_score, home_team_id=None, away_team_id=None):
+    return TeamDay.from_dict({
+        "team_code": "OAK",
+        "team_name": "Oakland Athletics",
+        "date": "2024-07-01",
+        "games": [{
+            "game_id": 1, "status": "Final", "home_team": home_team, "away_team": away_team,
+            "home_score": home_score, "away_score": away_score,
+            "home_team_id": home_team_id, "away_team_id": away_team_id,
+            "notable_performances": [
+                {"name": "Brent Rooker", "team": "Athletics", "hr": 2, "rbi": 4, "hits": 2},
+                {"name": "Rafael Devers", "team": "Boston Red Sox", "hr": 1, "rbi": 1, "hits": 1},
+            ],
+        }],
+    })
+
+def game_paragraph(team_day):
+    return TemplateRenderer().render(team_day).split("\n\n")[1]
+
+def test_home_side_is_decided_by_team_id():
+    # statsapi calls the club "Athletics" while the configured name is "Oakland Athletics"
+    paragraph = game_paragraph(final("Athletics", "Boston Red Sox", 5, 2, home_team_id=133, away_team_id=111))
+
+    assert "at home" in paragraph
+    assert "Red Sox" in paragraph
+    assert "five to two" in paragraph
+    assert "Brent Rooker" in paragraph
+    assert "Rafael Devers" not in paragraph
+
+def test_team_id_decides_the_result_on_the_road():
+    win = game_paragraph(final("Boston Red Sox", "Athletics", 2, 5, home_team_id=111, away_team_id=133))
+    loss = game_paragraph(final("Boston Red Sox", "Athletics", 5, 2, home_team_id=111, away_team_id=133))
+
+    assert "on the road" in win
+    assert "Red Sox" in win and "Red Sox" in loss
+    assert win != loss
+    assert "Brent Rooker" in win
+
+def test_equal_scores_are_reported_as_a_tie():
+    paragraph = game_paragraph(final("Athletics", "Boston Red Sox", 3, 3, home_team_id=133, away_team_id=111))
+    assert "three to three" in paragraph
+    assert "tie" in paragraph or "no winner" in paragraph
+
+def test_games_saved_without_ids_fall_back_to_the_name():
+    paragraph = game_paragraph(final("Oakland Athletics", "Boston Red Sox", 5, 2))
+    assert "at home" in paragraph
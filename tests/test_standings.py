@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for the locally maintained division standings.
+
+    python -m pytest tests/test_standings.py
+"""
+
+import os
+import sys
+import datetime
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.standings import StandingsTable
+
+NYY, BOS, TOR, LAD = 147, 111, 141, 119
+
+def seed():
+    return StandingsTable.from_statsapi({"records": [
+        {"division": {"id": 201}, "teamRecords": [
+            {"team": {"id": NYY}, "wins": 50, "losses": 30, "streak": {"streakCode": "W2"}, "divisionRank": "1", "gamesBack": "-"},
+            {"team": {"id": BOS}, "wins": 49, "losses": 31, "streak": {"streakCode": "L1"}, "divisionRank": "2", "gamesBack": "1.0"},
+            {"team": {"id": TOR}, "wins": 40, "losses": 40, "streak": {"streakCode": "W1"}, "divisionRank": "3", "gamesBack": "10.0"},
+        ]},
+        {"division": {"id": 203}, "teamRecords": [
+            {"team": {"id": LAD}, "wins": 52, "losses": 28, "streak": {"streakCode": "W4"}, "divisionRank": "1", "gamesBack": "-"},
+        ]},
+    ]}, since=datetime.date(2024, 7, 1))
+
+def game(game_pk, home, home_score, away, away_score, state="Final", detailed="Final"):
+    return {
+        "gamePk": game_pk,
+        "status": {"abstractGameState": state, "detailedState": detailed},
+        "teams": {
+            "home": {"team": {"id": home}, "score": home_score, "isWinner": home_score > away_score},
+            "away": {"team": {"id": away}, "score": away_score, "isWinner": away_score > home_score},
+        },
+    }
+
+def schedule(*games, date="2024-07-01"):
+    return {"dates": [{"date": date, "games": list(games)}]}
+
+def test_apply_schedule_updates_records_streaks_and_ranks():
+    table = seed()
+    # Boston beats the Yankees twice and passes them
+    assert table.apply_schedule(schedule(game(1, BOS, 5, NYY, 3), game(2, BOS, 4, NYY, 2))) == 2
+
+    assert (table.teams[BOS]["wins"], table.teams[BOS]["losses"]) == (51, 31)
+    assert (table.teams[NYY]["wins"], table.teams[NYY]["losses"]) == (50, 32)
+    assert table.teams[BOS]["streak"] == "W2"
+    assert table.teams[NYY]["streak"] == "L2"
+    assert (table.teams[BOS]["division_rank"], table.teams[BOS]["games_back"]) == ("1", "-")
+    assert (table.teams[NYY]["division_rank"], table.teams[NYY]["games_back"]) == ("2", "1.0")
+    assert table.teams[TOR]["games_back"] == "10.0"
+    # Other divisions are left alone
+    assert table.teams[LAD]["wins"] == 52
+
+def test_apply_schedule_applies_each_game_once():
+    table = seed()
+    slate = schedule(game(1, NYY, 6, TOR, 1))
+    assert table.apply_schedule(slate) == 1
+    assert table.apply_schedule(slate) == 0
+    assert table.teams[NYY]["wins"] == 51
+
+def test_apply_schedule_skips_unfinished_postponed_and_seeded_games():
+    table = seed()
+    slate = {"dates": [
+        # Before the seed pull, so already counted in its records
+        {"date": "2024-06-30", "games": [game(1, NYY, 6, TOR, 1)]},
+        {"date": "2024-07-01", "games": [
+            game(2, NYY, 2, BOS, 1, state="Live", detailed="In Progress"),
+            game(3, TOR, 0, LAD, 0, detailed="Postponed"),
+        ]},
+    ]}
+    assert table.apply_schedule(slate) == 0
+    assert table.teams[NYY]["wins"] == 50
+    assert table.teams[TOR]["losses"] == 40
+
+def test_mark_applied_games_are_not_counted_again():
+    table = seed()
+    slate = schedule(game(1, NYY, 6, TOR, 1))
+    table.mark_applied(slate)
+    assert table.apply_schedule(slate) == 0
+    assert table.teams[NYY]["wins"] == 50
+
+def test_save_and_load_round_trip(tmp_path):
+    table = seed()
+    table.apply_schedule(schedule(game(1, NYY, 6, TOR, 1)))
+    path = str(tmp_path / "standings.json")
+    table.save(path)
+
+    loaded = StandingsTable.load(path)
+    assert loaded.teams == table.teams
+    assert loaded.since == table.since
+    assert loaded.apply_schedule(schedule(game(1, NYY, 6, TOR, 1))) == 0
+    assert loaded.to_statsapi() == table.to_statsapi()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the league-wide daily stat table.
+
+    python -m pytest tests/test_stat_table.py
+"""
+
+import os
+import sys
+import datetime
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.stat_table import DailyStatTable, innings_to_outs
+from utils.mlb_api import LeagueSnapshot, apply_stat_table, needs_boxscore
+
+def player(player_id, name, batting=None, pitching=None):
+    return {"person": {"id": player_id, "fullName": name},
+            "stats": {"batting": batting or {}, "pitching": pitching or {}}}
+
+def team(team_id, name, hits, *players):
+    return {"team": {"id": team_id, "name": name}, "teamStats": {"batting": {"hits": hits}},
+            "players": {f"ID{p['person']['id']}": p for p in players}}
+
+BOXSCORES = {
+    1: {"teams": {
+        "home": team(147, "New York Yankees", 9,
+                     player(592450, "Aaron Judge", {"atBats": 4, "hits": 2, "homeRuns": 2, "rbi": 4}),
+                     player(543037, "Gerrit Cole", pitching={"inningsPitched": "7.0", "strikeOuts": 11, "earnedRuns": 1}),
+                     player(665862, "Jazz Chisholm", {"atBats": 4, "hits": 1})),
+        "away": team(111, "Boston Red Sox", 4,
+                     player(646240, "Rafael Devers", {"atBats": 4, "hits": 3, "rbi": 1})),
+    }},
+    2: {"teams": {
+        "home": team(119, "Los Angeles Dodgers", 7,
+                     player(660271, "Shohei Ohtani", {"atBats": 5, "hits": 2, "homeRuns": 1, "rbi": 2})),
+        "away": team(141, "Toronto Blue Jays", 5,
+                     player(665489, "Vladimir Guerrero Jr.", {"atBats": 4, "hits": 1, "rbi": 3})),
+    }},
+}
+
+def test_innings_pitched_are_counted_in_outs():
+    assert innings_to_outs("6.2") == 20
+    assert innings_to_outs("7.0") == 21
+    assert innings_to_outs(0) == 0
+    assert innings_to_outs("-.--") == 0
+
+def test_standouts_are_grouped_by_game_and_ordered_by_impact():
+    standouts = DailyStatTable.from_boxscores(BOXSCORES).standouts_by_game()
+
+    assert [line.name for line in standouts[1]] == ["Aaron Judge", "Rafael Devers", "Gerrit Cole"]
+    assert [line.name for line in standouts[2]] == ["Shohei Ohtani", "Vladimir Guerrero Jr."]
+    cole = standouts[1][2]
+    assert (cole.team, cole.ip, cole.k, cole.er) == ("New York Yankees", "7.0", 11, 1)
+
+def test_league_leaders_cover_home_runs_rbi_and_strikeouts():
+    leaders = DailyStatTable.from_boxscores(BOXSCORES).league_leaders(count=1)
+    assert [line.name for line in leaders] == ["Aaron Judge", "Gerrit Cole"]
+
+def snapshot_with(table):
+    schedule = {"dates": [{"games": [
+        {"gamePk": 1, "status": {"abstractGameState": "Final"}},
+        {"gamePk": 3, "status": {"abstractGameState": "Final"}},
+    ]}]}
+    snapshot = LeagueSnapshot(datetime.date(2024, 7, 1), schedule, {})
+    snapshot.stat_table = table
+    return snapshot
+
+def test_only_games_missing_from_the_table_need_a_boxscore():
+    snapshot = snapshot_with(DailyStatTable.from_boxscores({1: BOXSCORES[1]}))
+
+    assert not needs_boxscore({"game_id": 1, "status": "Final"}, snapshot, batting_lines=False)
+    # The boxscore fetch for game 3 failed while the table was built
+    assert needs_boxscore({"game_id": 3, "status": "Final"}, snapshot, batting_lines=False)
+    assert not needs_boxscore({"game_id": 4, "status": "Preview"}, snapshot, batting_lines=False)
+    assert needs_boxscore({"game_id": 1, "status": "Final"}, snapshot_with(None), batting_lines=False)
+
+def test_stat_table_fills_only_the_games_it_covers():
+    table = DailyStatTable.from_boxscores({1: BOXSCORES[1]})
+    team_data = {"games": [
+        {"game_id": 1, "status": "Final",
+         "notable_performances": [{"name": "Gerrit Cole", "team": "New York Yankees", "decision": "W"}]},
+        {"game_id": 3, "status": "Final", "home_hits": 8, "away_hits": 2, "notable_performances": []},
+    ]}
+
+    apply_stat_table(team_data, table)
+
+    covered, missing = team_data["games"]
+    assert (covered["home_hits"], covered["away_hits"]) == (9, 4)
+    assert [perf["name"] for perf in covered["notable_performances"]] == [
+        "Aaron Judge", "Rafael Devers", "Gerrit Cole", "Gerrit Cole"
+    ]
+    assert covered["notable_performances"][-1]["decision"] == "W"
+    assert (missing["home_hits"], missing["away_hits"]) == (8, 2)
+    assert [perf["name"] for perf in team_data["league_leaders"]][:2] == ["Aaron Judge", "Rafael Devers"]
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Tests for the statsapi team registry and matching teams by id.
+
+    python -m pytest tests/test_team_registry.py
+"""
+
+import os
+import sys
+import json
+import time
+import datetime
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import MLB_TEAMS, TEAM_REGISTRY_MAX_AGE_DAYS
+from utils.team_registry import TeamRegistry
+from utils.mlb_api import LeagueSnapshot, MLBDataFetcher, snapshot_team_data
+
+TEAMS_PAYLOAD = {"teams": [
+    {"id": 147, "name": "New York Yankees", "abbreviation": "NYY", "division": {"id": 201, "name": "American League East"}},
+    {"id": 111, "name": "Boston Red Sox", "abbreviation": "BOS", "division": {"id": 201, "name": "American League East"}},
+    # statsapi's current name differs from the configured "Oakland Athletics"
+    {"id": 133, "name": "Athletics", "abbreviation": "ATH", "division": {"id": 200, "name": "American League West"}},
+    # Teams outside the configuration, e.g. minor league clubs, are ignored
+    {"id": 4124, "name": "Scranton/Wilkes-Barre RailRiders", "abbreviation": "SWB"},
+]}
+
+def test_codes_ids_and_names_map_both_ways():
+    registry = TeamRegistry.from_teams_payload(TEAMS_PAYLOAD)
+
+    assert registry.id_for("OAK") == 133
+    assert registry.code_for(133) == "OAK"
+    assert registry.name_for("OAK") == "Athletics"
+    assert registry.division_for("NYY") == 201
+    assert sorted(registry.codes_in_division(201)) == ["BOS", "NYY"]
+    assert registry.code_for(4124) is None
+
+def test_teams_missing_from_statsapi_fall_back_to_configuration():
+    registry = TeamRegistry.from_teams_payload(TEAMS_PAYLOAD)
+
+    assert sorted(team["code"] for team in registry.teams) == sorted(MLB_TEAMS)
+    assert registry.id_for("LAD") == 119
+    assert registry.name_for("LAD") == MLB_TEAMS["LAD"]
+    assert registry.division_for("LAD") is None
+
+def test_registry_is_persisted_until_outdated(tmp_path):
+    path = str(tmp_path / "teams.json")
+    TeamRegistry.from_teams_payload(TEAMS_PAYLOAD).save(path)
+
+    assert TeamRegistry.load(path).name_for("OAK") == "Athletics"
+
+    with open(path) as f:
+        data = json.load(f)
+    data["built_at"] = time.time() - (TEAM_REGISTRY_MAX_AGE_DAYS + 1) * 86400
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert TeamRegistry.load(path) is None
+
+    (tmp_path / "broken.json").write_text("{")
+    assert TeamRegistry.load(str(tmp_path / "broken.json")) is None
+    assert TeamRegistry.load(str(tmp_path / "missing.json")) is None
+
+def test_fetcher_uses_configured_ids_when_teams_cannot_be_fetched(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(TeamRegistry, "load", classmethod(lambda cls, path=None: None))
+    fetcher = MLBDataFetcher()
+
+    def unavailable():
+        raise RuntimeError("statsapi unavailable")
+
+    fetcher.get_teams = unavailable
+    registry = fetcher.get_team_registry()
+
+    assert registry.id_for("OAK") == 133
+    assert fetcher.get_team_registry() is registry
+
+def test_renamed_team_is_matched_by_id():
+    schedule = {"dates": [{"games": [{
+        "gamePk": 1,
+        "status": {"abstractGameState": "Final"},
+        "teams": {"home": {"team": {"id": 133, "name": "Athletics"}, "score": 5},
+                  "away": {"team": {"id": 111, "name": "Boston Red Sox"}, "score": 2}},
+    }]}]}
+    standings = {"records": [{"teamRecords": [
+        {"team": {"id": 133}, "wins": 40, "losses": 41, "divisionRank": "3", "gamesBack": "8.0"},
+    ]}]}
+    snapshot = LeagueSnapshot(datetime.date(2024, 7, 1), schedule, standings)
+
+    team_data = snapshot_team_data("OAK", "2024-07-01", snapshot, 133)
+
+    assert team_data["team_name"] == "Oakland Athletics"
+    assert [game["game_id"] for game in team_data["games"]] == [1]
+    assert team_data["games"][0]["home_team_id"] == 133
+    assert team_data["standings"]["wins"] == 40
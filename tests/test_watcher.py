@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Tests for the live game watcher's schedule polling and poll intervals.
+
+    python -m pytest tests/test_watcher.py
+"""
+
+import os
+import sys
+import datetime
+from types import SimpleNamespace
+
+# Add the parent directory to the path so we can import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.config import WATCHER_IDLE_INTERVAL, WATCHER_LIVE_INTERVAL, WATCHER_FAST_INTERVAL, WATCHER_GAME_DURATION_MINUTES
+from utils.watcher import GameWatcher
+
+DATE = datetime.date(2024, 7, 1)
+TEAM_IDS = {147: "NYY", 111: "BOS", 141: "TOR", 119: "LAD"}
+
+def game(game_pk, home, away, state="Preview", detailed=None, start="2024-07-01T23:05:00Z"):
+    return {
+        "gamePk": game_pk,
+        "gameDate": start,
+        "status": {"abstractGameState": state, "detailedState": detailed or state},
+        "teams": {"home": {"team": {"id": home}}, "away": {"team": {"id": away}}},
+    }
+
+class FakeData:
+    """MLB data fetcher serving a scripted sequence of schedules."""
+
+    fetch_mode = "boxscore"
+
+    def __init__(self, *schedules):
+        self.schedules = list(schedules)
+        self.stat_tables = 0
+
+    def get_schedule(self, date, hydrate=None, max_age=None):
+        return {"dates": [{"date": "2024-07-01", "games": self.schedules.pop(0)}]}
+
+    def get_team_registry(self):
+        return SimpleNamespace(code_for=TEAM_IDS.get)
+
+    def get_league_snapshot(self, date, max_age=None):
+        return SimpleNamespace(date=date, hydrated=False, stat_table=None)
+
+    def build_stat_table(self, snapshot):
+        self.stat_tables += 1
+        return "stat table"
+
+def watch(*schedules):
+    processed = []
+
+    def process_team(team_code, date, distribute, snapshot):
+        processed.append((team_code, snapshot.stat_table))
+        return SimpleNamespace(success=True, team_name=team_code, error=None)
+
+    data = FakeData(*schedules)
+    watcher = GameWatcher(SimpleNamespace(mlb_data=data, process_team=process_team))
+    for index in range(len(schedules)):
+        watcher.poll(DATE, initial=index == 0)
+    watcher.executor.shutdown(wait=True)
+    return watcher, data, sorted(processed)
+
+def test_teams_are_queued_when_their_game_goes_final():
+    watcher, data, processed = watch(
+        [game(1, 147, 111, "Live"), game(2, 141, 119, "Live")],
+        [game(1, 147, 111, "Final"), game(2, 141, 119, "Live")],
+    )
+
+    assert processed == [("BOS", "stat table"), ("NYY", "stat table")]
+    assert data.stat_tables == 1
+    assert sorted(watcher.processed_teams(DATE)) == ["BOS", "NYY"]
+
+def test_games_final_on_the_first_poll_are_left_to_the_daily_job():
+    _, _, processed = watch(
+        [game(1, 147, 111, "Final")],
+        [game(1, 147, 111, "Final")],
+    )
+    assert processed == []
+
+def test_doubleheaders_wait_for_the_last_game():
+    _, _, processed = watch(
+        [game(1, 147, 111, "Live"), game(2, 147, 111, "Preview")],
+        [game(1, 147, 111, "Final"), game(2, 147, 111, "Live")],
+        [game(1, 147, 111, "Final"), game(2, 147, 111, "Final")],
+    )
+    assert processed == [("BOS", "stat table"), ("NYY", "stat table")]
+
+def test_postponed_second_game_of_a_doubleheader_releases_the_team():
+    _, _, processed = watch(
+        [game(1, 147, 111, "Live"), game(2, 147, 111, "Preview")],
+        [game(1, 147, 111, "Final"), game(2, 147, 111, "Preview")],
+        [game(1, 147, 111, "Final"), game(2, 147, 111, "Final", "Postponed")],
+    )
+    assert [team_code for team_code, _ in processed] == ["BOS", "NYY"]
+
+def test_teams_whose_only_game_was_postponed_are_not_queued():
+    _, data, processed = watch(
+        [game(1, 147, 111, "Preview")],
+        [game(1, 147, 111, "Final", "Postponed")],
+    )
+    assert processed == []
+    assert data.stat_tables == 0
+
+def now_at(hours, minutes=0):
+    start = datetime.datetime(2024, 7, 1, 23, 5, tzinfo=datetime.timezone.utc)
+    return start + datetime.timedelta(hours=hours, minutes=minutes)
+
+def schedule(*games):
+    return {"dates": [{"games": list(games)}]}
+
+def test_next_interval_idles_without_games_to_watch():
+    assert GameWatcher.next_interval(schedule(), now_at(0)) == WATCHER_IDLE_INTERVAL
+    assert GameWatcher.next_interval(schedule(game(1, 147, 111, "Final")), now_at(0)) == WATCHER_IDLE_INTERVAL
+
+def test_next_interval_wakes_up_for_first_pitch():
+    interval = GameWatcher.next_interval(schedule(game(1, 147, 111, "Preview")), now_at(-3))
+    assert interval == min(WATCHER_IDLE_INTERVAL, 3 * 3600)
+    # Past the scheduled start, a game still in Preview is polled at the live rate
+    assert GameWatcher.next_interval(schedule(game(1, 147, 111, "Preview")), now_at(0, 10)) == WATCHER_LIVE_INTERVAL
+
+def test_next_interval_speeds_up_near_the_expected_end():
+    live = schedule(game(1, 147, 111, "Live"))
+    assert GameWatcher.next_interval(live, now_at(0, 30)) == WATCHER_LIVE_INTERVAL
+    assert GameWatcher.next_interval(live, now_at(0, WATCHER_GAME_DURATION_MINUTES)) == WATCHER_FAST_INTERVAL
+    # Without a start time a live game is always polled quickly
+    assert GameWatcher.next_interval(schedule(game(1, 147, 111, "Live", start=None)), now_at(0)) == WATCHER_FAST_INTERVAL
@@ -1,16 +1,66 @@
 import os
+import re
 import json
 import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator
 import anthropic
 
-from config.config import ANTHROPIC_API_KEY, ANTHROPIC_MODEL, SCRIPTS_DIR, MLB_TEAMS, PODCAST_LENGTH_MINUTES
+from config.config import (
+    ANTHROPIC_API_KEY, ANTHROPIC_MODEL, SCRIPTS_DIR, MLB_TEAMS, PODCAST_LENGTH_MINUTES,
+    NEWS_CONTEXT_DAYS, NEWS_CONTEXT_ITEMS, TEMPLATE_SCRIPTS_ENABLED, SCRIPT_MAX_CONTINUATIONS
+)
 from utils.logger import get_logger
+from utils.models import TeamDay
+from utils.news_dedup import NewsIndex
+from utils.news_archive import NewsArchive
+from utils.script_cache import ScriptCache
+from utils.script_templates import TemplateRenderer
+from utils.script_budget import ScriptBudget
 
 logger = get_logger(__name__)
 
-class ScriptGenerator:
+SYSTEM_PROMPT = "You are a professional sports podcaster specializing in MLB baseball coverage. Your goal is to create engaging, informative daily update podcasts for baseball fans."
+
+# Everything below is the same for every team and date, so it forms the cached
+# prompt prefix; only the team's data follows it in the user message
+SCRIPT_INSTRUCTIONS = f"""Each request gives one team's data for one day. Include a brief intro and outro. The script should sound natural when read aloud and include enthusiasm and personality of a baseball fan and podcaster.
+
+INSTRUCTIONS:
+1. Start with a brief, catchy intro for the team's "Daily Update" podcast, using the podcast name given with the data.
+2. Cover yesterday's game results with excitement, highlight key plays and players.
+3. Mention the current standings and what it means for the team.
+4. Discuss the recent news articles and their implications.
+5. Add some color commentary and baseball insights throughout.
+6. End with a brief outro that encourages listeners to check back tomorrow.
+7. The entire script should be readable in approximately {PODCAST_LENGTH_MINUTES} minutes, about {ScriptBudget().target_words} words. Do not go over {ScriptBudget().max_words} words.
+8. Use a conversational, enthusiastic tone as if you're speaking directly to baseball fans.
+9. Include specific references to players, scores, and stats where relevant.
+"""
+
+class ParagraphSplitter:
+    """Splits streamed script text into paragraphs as soon as each one is complete.
+    
+    A paragraph is complete once a blank line follows it; the text after the
+    last blank line stays buffered until more arrives or the stream ends.
+    """
+    
     def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return the paragraphs it completed."""
+        self._buffer += text
+        parts = re.split(r"\n\s*\n", self._buffer)
+        self._buffer = parts.pop()
+        return [part.strip() for part in parts if part.strip()]
+    
+    def flush(self) -> List[str]:
+        """Return the last paragraph at the end of the stream."""
+        paragraph, self._buffer = self._buffer.strip(), ""
+        return [paragraph] if paragraph else []
+
+class ScriptGenerator:
+    def __init__(self, force_regenerate: bool = False):
         self.api_key = ANTHROPIC_API_KEY
         
         # Always use a valid model name - use claude-3-sonnet-20240229 as a fallback
@@ -26,6 +76,19 @@ class ScriptGenerator:
             # Use a dummy API key for initialization (won't actually be used)
             self.client = anthropic.Anthropic(api_key="sk-ant-dummy123")
         
+        self.news_archive = NewsArchive()
+        
+        # Scripts are reused when their request is unchanged, unless forced
+        self.script_cache = ScriptCache()
+        self.force_regenerate = force_regenerate
+        
+        # Quiet days are rendered from templates without a model call
+        self.template_renderer = TemplateRenderer()
+        self.use_templates = TEMPLATE_SCRIPTS_ENABLED
+        
+        # Word and token budget of a script of the podcast's length
+        self.budget = ScriptBudget()
+        
     def load_team_data(self, team_code: str, date: Optional[datetime.date] = None) -> Dict[str, Any]:
         """Load team data from the JSON file."""
         date = date or datetime.date.today()
@@ -60,51 +123,219 @@ class ScriptGenerator:
         # Add news to team data
         team_data["news"] = news_data
         
+        # Deduplicated news for the prompt, without stories the last episode covered
+        news_index = NewsIndex.for_date(date)
+        if news_index.has_team(team_code):
+            previous_index = NewsIndex.for_date(date - datetime.timedelta(days=1))
+            team_data["news_digest"] = news_index.render_team_news(team_code, previous_index)
+        
+        # Background from the team's archived news of the past week
+        try:
+            team_data["recent_news"] = self.news_archive.recent(
+                team_code, date, days=NEWS_CONTEXT_DAYS, limit=NEWS_CONTEXT_ITEMS
+            )
+        except Exception as e:
+            logger.error(f"Error reading the news archive for {team_code}: {e}")
+        
         return team_data
     
     def generate_script(self, team_data: Dict[str, Any]) -> str:
         """Generate a podcast script based on team data."""
-        team_name = team_data.get("team_name")
-        date_str = team_data.get("date")
-        games = team_data.get("games", [])
-        standings = team_data.get("standings", {})
+        team_day = TeamDay.from_dict(team_data)
         news = team_data.get("news", [])
+        team_name = team_day.team_name
         
-        logger.info(f"Generating script for {team_name} on {date_str}")
+        logger.info(f"Generating script for {team_name} on {team_day.date}")
+        
+        script_text = self.template_script(team_data)
+        if script_text is not None:
+            return script_text
         
         # Build the prompt
-        prompt = self._build_prompt(team_name, date_str, games, standings, news)
+        prompt = self.build_prompt(team_data)
         
         # Check if we're using mock mode (for testing/demo purposes)
         if self.use_mock:
             logger.info("Using mock response for testing")
-            return self._generate_mock_script(team_name, date_str, games, standings, news)
+            return self._generate_mock_script(team_day, news)
+        
+        params = self.message_params(prompt)
+        script_text = self.cached_script(params)
+        if script_text is not None:
+            logger.info(f"Using cached script for {team_name}")
+            return script_text
         
         try:
-            message = self.client.messages.create(
-                model=self.model,
-                system="You are a professional sports podcaster specializing in MLB baseball coverage. Your goal is to create engaging, informative daily update podcasts for baseball fans.",
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                max_tokens=15000
-            )
+            message = self.client.messages.create(**params)
+            self._log_usage(team_name, message.usage)
             
-            script_text = message.content[0].text
-            
-            return script_text
+            return self.finish_script(team_name, params, message)
             
         except Exception as e:
-            logger.error(f"Error generating script for {team_name}: {e}")
-            # Provide a mock script for testing with any API error
-            return self._generate_mock_script(team_name, date_str, games, standings, news)
+            logger.error(f"Error generating script for {team_name}, rendering it from templates: {e}")
+            return self.template_renderer.render(team_day, news)
+    
+    def stream_script(self, team_data: Dict[str, Any]) -> Iterator[str]:
+        """Generate a podcast script, yielding each paragraph as soon as it is complete.
+        
+        Unlike generate_script, API errors are raised so the caller can fall
+        back to generating the script in full.
+        """
+        team_name = team_data.get("team_name")
+        logger.info(f"Streaming script for {team_name} on {team_data.get('date')}")
+        
+        splitter = ParagraphSplitter()
+        script_text = self.template_script(team_data)
+        if script_text is not None:
+            yield from splitter.feed(script_text)
+            yield from splitter.flush()
+            return
+        
+        if self.use_mock:
+            logger.info("Using mock response for testing")
+            yield from splitter.feed(self.mock_script(team_data))
+            yield from splitter.flush()
+            return
+        
+        params = self.message_params(self.build_prompt(team_data))
+        script_text = self.cached_script(params)
+        if script_text is not None:
+            logger.info(f"Using cached script for {team_name}")
+            yield from splitter.feed(script_text)
+            yield from splitter.flush()
+            return
+        
+        # Paragraphs are voiced as they arrive, so a streamed script can only be
+        # continued, not trimmed
+        chunks = []
+        request = params
+        continuations = 0
+        while True:
+            partial = "".join(chunks) if continuations else ""
+            with self.client.messages.stream(**request) as stream:
+                for text in stream.text_stream:
+                    if partial and text:
+                        # Normalize the whitespace where the continuation joins the script
+                        text = self.budget.join_continuation(partial, text)[len(partial):]
+                        partial = ""
+                    chunks.append(text)
+                    yield from splitter.feed(text)
+                message = stream.get_final_message()
+            self._log_usage(team_name, message.usage)
+            if not self._should_continue(team_name, message, continuations):
+                break
+            continuations += 1
+            request = self.budget.continuation_params(params, "".join(chunks))
+        yield from splitter.flush()
+        
+        script_text = "".join(chunks)
+        logger.info(f"Estimated duration of the {team_name} script: {self.budget.estimate_minutes(script_text):.1f} minutes")
+        # A script cut off for good is used once but not reused
+        if message.stop_reason != "max_tokens":
+            self.cache_script(params, script_text)
+    
+    def finish_script(self, team_name: str, params: Dict[str, Any], message: Any, cache: bool = True) -> str:
+        """Complete a generated script, fit it to the length budget and cache it.
+        
+        A script cut off at max_tokens is continued up to SCRIPT_MAX_CONTINUATIONS
+        times, then a script over the budget is trimmed. A script still cut off
+        after that is returned but not cached, so the next run asks again.
+        """
+        script_text = message.content[0].text
+        continuations = 0
+        while self._should_continue(team_name, message, continuations):
+            continuations += 1
+            message = self.client.messages.create(**self.budget.continuation_params(params, script_text))
+            self._log_usage(team_name, message.usage)
+            script_text = self.budget.join_continuation(script_text, message.content[0].text)
+        
+        script_text = self.budget.fit(script_text, f"the {team_name} script")
+        if cache and message.stop_reason != "max_tokens":
+            self.cache_script(params, script_text)
+        return script_text
+    
+    @staticmethod
+    def _should_continue(team_name: str, message: Any, continuations: int) -> bool:
+        """Check whether a response cut off at max_tokens gets another continuation."""
+        if message.stop_reason != "max_tokens":
+            return False
+        if continuations >= SCRIPT_MAX_CONTINUATIONS:
+            logger.warning(f"Script for {team_name} still hit max_tokens, giving up after {continuations} "
+                           f"continuations; it will not be cached")
+            return False
+        logger.warning(f"Script for {team_name} hit max_tokens, continuing it")
+        return True
+    
+    def template_script(self, team_data: Dict[str, Any]) -> Optional[str]:
+        """Render the script from templates if the day is quiet enough to skip the LLM."""
+        if not self.use_templates:
+            return None
+        team_day = TeamDay.from_dict(team_data)
+        news = team_data.get("news", [])
+        if not self.template_renderer.should_render(team_day, news):
+            return None
+        logger.info(f"Rendering script for {team_day.team_name} from templates: off day with little news")
+        return self.template_renderer.render(team_day, news)
+    
+    def cached_script(self, params: Dict[str, Any]) -> Optional[str]:
+        """Return the cached script generated for identical request parameters, if any."""
+        if self.force_regenerate:
+            return None
+        return self.script_cache.get(self.script_cache.key(params))
+    
+    def cache_script(self, params: Dict[str, Any], script: str) -> None:
+        """Cache a script generated by the API for its request parameters."""
+        try:
+            self.script_cache.store(self.script_cache.key(params), script)
+        except OSError as e:
+            logger.warning(f"Could not cache script: {e}")
+    
+    @staticmethod
+    def _log_usage(team_name: str, usage: Any) -> None:
+        logger.info(f"Script prompt for {team_name}: {usage.input_tokens} input tokens, "
+                    f"{getattr(usage, 'cache_read_input_tokens', 0) or 0} read from cache, "
+                    f"{getattr(usage, 'cache_creation_input_tokens', 0) or 0} written to cache")
+    
+    def build_prompt(self, team_data: Dict[str, Any]) -> str:
+        """Build the script prompt for loaded team data."""
+        team_day = TeamDay.from_dict(team_data)
+        news = team_data.get("news_digest") or team_data.get("news", [])
+        return self._build_prompt(team_day, news, team_data.get("recent_news", []))
+    
+    def message_params(self, prompt: str) -> Dict[str, Any]:
+        """Return the Messages API parameters for a script prompt.
+        
+        The system prompt carries the instructions shared by every team; the
+        prompt is the team's own data. Shared by direct requests and Message
+        Batch requests.
+        """
+        return {
+            "model": self.model,
+            # The shared prefix is marked as a cache breakpoint, so back-to-back
+            # teams only pay full price for their own data
+            "system": [
+                {"type": "text", "text": SYSTEM_PROMPT},
+                {
+                    "type": "text",
+                    "text": SCRIPT_INSTRUCTIONS,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            "messages": [
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.7,
+            "max_tokens": self.budget.max_tokens
+        }
+    
+    def mock_script(self, team_data: Dict[str, Any]) -> str:
+        """Generate the mock script for loaded team data."""
+        return self._generate_mock_script(TeamDay.from_dict(team_data), team_data.get("news", []))
             
-    def _generate_mock_script(self, team_name: str, date_str: str, 
-                             games: List[Dict[str, Any]], 
-                             standings: Dict[str, Any],
-                             news: List[Dict[str, Any]]) -> str:
+    def _generate_mock_script(self, team_day: TeamDay, news: Any) -> str:
         """Generate a mock script for testing purposes using SSML."""
+        team_name = team_day.team_name
+        date_str = team_day.date
         
         # Format date for readable output
         try:
@@ -126,15 +357,14 @@ class ScriptGenerator:
         <break time="0.5s"/>
 """
         
-        if games:
-            for game in games:
-                status = game.get("status")
-                home_team = game.get("home_team")
-                away_team = game.get("away_team")
-                home_score = int(game.get("home_score", 0))
-                away_score = int(game.get("away_score", 0))
+        if team_day.games:
+            for game in team_day.games:
+                home_team = game.home_team
+                away_team = game.away_team
+                home_score = game.home_score
+                away_score = game.away_score
                 
-                if status == "Final":
+                if game.is_final:
                     result = "won" if ((home_team == team_name and home_score > away_score) or 
                                       (away_team == team_name and away_score > home_score)) else "lost"
                     
@@ -149,16 +379,15 @@ class ScriptGenerator:
         <break time="0.3s"/>"""
                         
                     # Add notable performances if available
-                    notable_performances = game.get("notable_performances", [])
-                    if notable_performances:
+                    if game.notable_performances:
                         script += """
         <p><prosody pitch="high">Standout performances</prosody> included:</p>
         <break time="0.3s"/>"""
-                        for perf in notable_performances:
-                            name = perf.get("name", "")
-                            hr = perf.get("hr", 0)
-                            hits = perf.get("hits", 0)
-                            rbi = perf.get("rbi", 0)
+                        for perf in game.notable_performances:
+                            name = perf.name
+                            hr = perf.hr
+                            hits = perf.hits
+                            rbi = perf.rbi
                             
                             if name:
                                 script += f"""        <p>{name}: """
@@ -169,6 +398,11 @@ class ScriptGenerator:
                                     stats.append(f"""<say-as interpret-as="cardinal">{hits}</say-as> hit{'s' if hits > 1 else ''}""")
                                 if rbi > 0:
                                     stats.append(f"""<say-as interpret-as="cardinal">{rbi}</say-as> RBI{'s' if rbi > 1 else ''}""")
+                                if perf.k > 0:
+                                    stats.append(f"""<say-as interpret-as="cardinal">{perf.k}</say-as> strikeout{'s' if perf.k > 1 else ''}""")
+                                decision = {"W": "earned the win", "L": "took the loss", "SV": "picked up the save"}.get(perf.decision)
+                                if decision:
+                                    stats.append(decision)
                                 
                                 script += ", ".join(stats) + "</p>\n"
                 else:
@@ -181,15 +415,12 @@ class ScriptGenerator:
         <break time="0.3s"/>"""
         
         # Add standings information if available
+        standings = team_day.standings
         if standings:
-            wins = standings.get("wins", 0)
-            losses = standings.get("losses", 0)
-            division_rank = standings.get("division_rank", "")
-            games_back = standings.get("games_back", 0)
-            try:
-                games_back = float(games_back) if games_back != "-" else 0
-            except (ValueError, TypeError):
-                games_back = 0
+            wins = standings.wins
+            losses = standings.losses
+            division_rank = standings.division_rank
+            games_back = standings.games_back_value
             
             script += """
         <break time="0.7s"/>
@@ -237,9 +468,10 @@ class ScriptGenerator:
         
         return script
     
-    def _build_prompt(self, team_name: str, date_str: str, games: List[Dict[str, Any]], 
-                    standings: Dict[str, Any], news: List[Dict[str, Any]]) -> str:
-        """Build a prompt for the script generation."""
+    def _build_prompt(self, team_day: TeamDay, news: Any, recent_news: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Build the team-specific part of the script prompt."""
+        team_name = team_day.team_name
+        date_str = team_day.date
         # Format date for readable output
         try:
             date_obj = datetime.datetime.strptime(date_str, "%Y-%m-%d")
@@ -249,34 +481,28 @@ class ScriptGenerator:
             
         prompt = f"""Generate a {PODCAST_LENGTH_MINUTES}-minute podcast script for the {team_name} for {formatted_date}.
 
-Include a brief intro and outro. The script should sound natural when read aloud and include enthusiasm and personality of a baseball fan and podcaster.
-
 Here is the data to include in the podcast:
 
 """
 
         # Add game information
-        if games:
+        if team_day.games:
             prompt += "GAME RESULTS:\n"
-            for game in games:
-                status = game.get("status")
-                home_team = game.get("home_team")
-                away_team = game.get("away_team")
-                home_score = game.get("home_score")
-                away_score = game.get("away_score")
+            for game in team_day.games:
+                home_team = game.home_team
+                away_team = game.away_team
                 
-                if status == "Final":
-                    prompt += f"- {away_team} ({away_score}) at {home_team} ({home_score}) - Game completed\n"
+                if game.is_final:
+                    prompt += f"- {away_team} ({game.away_score}) at {home_team} ({game.home_score}) - Game completed\n"
                     
                     # Add notable performances
-                    notable_performances = game.get("notable_performances", [])
-                    if notable_performances:
+                    if game.notable_performances:
                         prompt += "  Notable performances:\n"
-                        for perf in notable_performances:
-                            name = perf.get("name")
-                            hr = perf.get("hr", 0)
-                            hits = perf.get("hits", 0)
-                            rbi = perf.get("rbi", 0)
+                        for perf in game.notable_performances:
+                            name = perf.name
+                            hr = perf.hr
+                            hits = perf.hits
+                            rbi = perf.rbi
                             
                             stats = []
                             if hr > 0:
@@ -286,43 +512,58 @@ Here is the data to include in the podcast:
                             if rbi > 0:
                                 stats.append(f"{rbi} RBI")
                                 
+                            if perf.ip:
+                                stats.append(f"{perf.ip} IP, {perf.k} K, {perf.er} ER")
+                            if perf.decision:
+                                stats.append(f"pitching decision {perf.decision}")
+                                
                             if stats:
                                 prompt += f"  - {name}: {', '.join(stats)}\n"
                 else:
                     # Game not completed or scheduled for future
-                    prompt += f"- {away_team} at {home_team} - {status}\n"
+                    prompt += f"- {away_team} at {home_team} - {game.status}\n"
+                    
+                    if game.probable_away_pitcher or game.probable_home_pitcher:
+                        prompt += f"  Probable pitchers: {game.probable_away_pitcher or 'TBD'} vs. {game.probable_home_pitcher or 'TBD'}\n"
         else:
             prompt += "NO GAMES: The team did not play yesterday.\n"
             
         # Add standings information
+        standings = team_day.standings
         if standings:
-            wins = standings.get("wins", 0)
-            losses = standings.get("losses", 0)
-            division_rank = standings.get("division_rank", "")
-            games_back = standings.get("games_back", 0)
-            streak = standings.get("streak", "")
-            
             prompt += f"\nSTANDINGS:\n"
-            prompt += f"- Record: {wins}-{losses}\n"
-            prompt += f"- Division Rank: {division_rank}\n"
-            prompt += f"- Games Back: {games_back}\n"
-            prompt += f"- Current Streak: {streak}\n"
+            prompt += f"- Record: {standings.wins}-{standings.losses}\n"
+            prompt += f"- Division Rank: {standings.division_rank}\n"
+            prompt += f"- Games Back: {standings.games_back}\n"
+            prompt += f"- Current Streak: {standings.streak}\n"
+            
+        # Add league-wide context
+        if team_day.league_leaders:
+            prompt += "\nAROUND THE LEAGUE (yesterday's top performances):\n"
+            for perf in team_day.league_leaders:
+                stats = []
+                if perf.hr > 0:
+                    stats.append(f"{perf.hr} HR")
+                if perf.rbi > 0:
+                    stats.append(f"{perf.rbi} RBI")
+                if perf.ip:
+                    stats.append(f"{perf.ip} IP, {perf.k} K")
+                prompt += f"- {perf.name} ({perf.team}): {', '.join(stats)}\n"
             
         # Add news
         if news:
             prompt += f"\nRECENT NEWS:\n {news}"
-        # Add final instructions
+        
+        # Add background from earlier in the week
+        if recent_news:
+            prompt += "\n\nEARLIER THIS WEEK (background only, already covered):\n"
+            for item in recent_news:
+                prompt += f"- {item['date']}: {item['headline']}\n"
+            
+        # The instructions are in the cached system prompt
         prompt += f"""
-INSTRUCTIONS:
-1. Start with a brief, catchy intro for the "{team_name} Daily Update" podcast.
-2. Cover yesterday's game results with excitement, highlight key plays and players.
-3. Mention the current standings and what it means for the team.
-4. Discuss the recent news articles and their implications.
-5. Add some color commentary and baseball insights throughout.
-6. End with a brief outro that encourages listeners to check back tomorrow.
-7. The entire script should be readable in approximately {PODCAST_LENGTH_MINUTES} minutes.
-8. Use a conversational, enthusiastic tone as if you're speaking directly to baseball fans.
-9. Include specific references to players, scores, and stats where relevant.
+
+Write the script for the "{team_name} Daily Update" podcast, following the instructions.
 """
         
         return prompt
@@ -330,8 +571,6 @@ INSTRUCTIONS:
     def generate_and_save_script(self, team_code: str, date: Optional[datetime.date] = None) -> str:
         """Generate and save a script for a team as SSML."""
         date = date or datetime.date.today()
-        date_str = date.strftime("%Y-%m-%d")
-        team_name = MLB_TEAMS.get(team_code)
         
         # Load team data
         team_data = self.load_team_data(team_code, date)
@@ -339,14 +578,23 @@ INSTRUCTIONS:
         # Generate script
         script = self.generate_script(team_data)
         
+        self.save_script(team_code, date, script)
+        return script
+    
+    @staticmethod
+    def script_path(team_code: str, date: datetime.date) -> str:
+        return os.path.join(SCRIPTS_DIR, team_code, f"{date.strftime('%Y-%m-%d')}.txt")
+    
+    def save_script(self, team_code: str, date: datetime.date, script: str) -> str:
+        """Save a team's script and return its file path."""
+        team_name = MLB_TEAMS.get(team_code)
+        
         # Save to file
-        team_script_dir = os.path.join(SCRIPTS_DIR, team_code)
-        os.makedirs(team_script_dir, exist_ok=True)
+        script_file_path = self.script_path(team_code, date)
+        os.makedirs(os.path.dirname(script_file_path), exist_ok=True)
         
-        # Save as XML file
-        script_file_path = os.path.join(team_script_dir, f"{date_str}.txt")
         with open(script_file_path, "w") as f:
             f.write(script)
             
         logger.info(f"Saved script for {team_name} to {script_file_path}")
-        return script
\ No newline at end of file
+        return script_file_path
\ No newline at end of file
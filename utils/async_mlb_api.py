@@ -0,0 +1,381 @@
+import asyncio
+import datetime
+import functools
+from typing import Dict, List, Any, Optional
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+try:
+    import ijson
+except ImportError:  # Selective boxscore parsing falls back to response.json()
+    ijson = None
+
+from config.config import (
+    MLB_API_BASE_URL, MLB_API_KEY, MLB_TEAMS, MLB_HTTP_CACHE_ENABLED,
+    MLB_API_MAX_CONCURRENCY, MLB_API_MAX_CONNECTIONS, MLB_FETCH_MODE, MLB_SCHEDULE_HYDRATE
+)
+from utils.logger import get_logger
+from utils.http_cache import ResponseCache
+from utils.team_registry import TeamRegistry
+from utils.standings import StandingsTable
+from utils.models import TeamDay
+from utils.stat_table import DailyStatTable
+from utils.mlb_api import (
+    LeagueSnapshot, BoxscoreSummaryBuilder, cache_ttl, schedule_params, schedule_range_params, standings_params,
+    split_schedule_by_date, is_retryable, standings_reconcile_window, seed_standings_table, update_standings_table,
+    final_game_ids, needs_boxscore, apply_stat_table, snapshot_team_data, add_boxscore_summary,
+    save_team_data, load_or_create_mock_team_data
+)
+
+logger = get_logger(__name__)
+
+async def to_thread(function, *args):
+    """Run blocking disk I/O in a worker thread, like asyncio.to_thread (Python 3.9+)."""
+    if hasattr(asyncio, "to_thread"):
+        return await asyncio.to_thread(function, *args)
+    return await asyncio.get_running_loop().run_in_executor(None, functools.partial(function, *args))
+
+class _AsyncByteStream:
+    """Expose an httpx response body as the async file-like object ijson reads from."""
+
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+
+    async def read(self, size: int = -1) -> bytes:
+        # ijson probes the stream type with read(0), which must not consume a chunk
+        if size == 0:
+            return b""
+        # An empty chunk means EOF to ijson, so skip the empty chunks decoders may yield
+        async for chunk in self._chunks:
+            if chunk:
+                return chunk
+        return b""
+
+async def parse_boxscore_summary_async(response: httpx.Response) -> Dict[str, Any]:
+    """Parse only the summary fields of a boxscore while its body streams in."""
+    builder = BoxscoreSummaryBuilder()
+    async for prefix, event, value in ijson.parse_async(_AsyncByteStream(response)):
+        builder.add(prefix, event, value)
+    return builder.summary
+
+class AsyncMLBDataFetcher:
+    """Asyncio counterpart of MLBDataFetcher with the same, awaitable, public methods.
+
+    All requests go through one pooled HTTP/1.1 keep-alive client, and boxscores
+    are fetched concurrently under a semaphore instead of one after another.
+    Use it as an async context manager, or call close() when done.
+    """
+
+    def __init__(self, max_concurrency: int = MLB_API_MAX_CONCURRENCY,
+                 transport: Optional[httpx.AsyncBaseTransport] = None,
+                 fetch_mode: str = MLB_FETCH_MODE):
+        self.base_url = MLB_API_BASE_URL
+        self.api_key = MLB_API_KEY
+        self.use_mock = False
+        self.fetch_mode = fetch_mode
+        self.cache = ResponseCache() if MLB_HTTP_CACHE_ENABLED else None
+
+        headers = {}
+        if self.api_key and not self.use_mock:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        self.client = httpx.AsyncClient(
+            headers=headers,
+            limits=httpx.Limits(
+                max_connections=MLB_API_MAX_CONNECTIONS,
+                max_keepalive_connections=MLB_API_MAX_CONNECTIONS
+            ),
+            timeout=httpx.Timeout(30.0),
+            transport=transport
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+        # In-flight and completed Final boxscore fetches keyed by gamePk
+        self._boxscore_tasks: Dict[Any, asyncio.Task] = {}
+        self._team_registry: Optional[TeamRegistry] = None
+        self._registry_lock = asyncio.Lock()
+        self._standings_table: Optional[StandingsTable] = None
+        self._standings_lock = asyncio.Lock()
+
+    async def __aenter__(self) -> "AsyncMLBDataFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.client.aclose()
+
+    @retry(retry=retry_if_exception(is_retryable), stop=stop_after_attempt(3),
+           wait=wait_exponential(multiplier=1, min=4, max=10))
+    async def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                            immutable: bool = False, max_age: Optional[float] = None,
+                            summary_only: bool = False) -> Dict[str, Any]:
+        """Make a request to the MLB API with retries, sharing the on-disk response cache.
+
+        With summary_only, a boxscore body is parsed selectively as it streams in.
+        Cache reads and writes run in a worker thread, so disk I/O does not
+        stall the other requests on the event loop.
+        """
+        url = f"{self.base_url}/{endpoint}"
+        ttl = None if immutable else (max_age if max_age is not None else cache_ttl(endpoint))
+        selective = summary_only and ijson is not None
+        cache_url = f"{url}#summary" if selective else url
+
+        entry = await to_thread(self.cache.get, cache_url, params) if self.cache else None
+        if entry and self.cache.is_fresh(entry, ttl):
+            return entry["body"]
+
+        async with self._semaphore:
+            try:
+                request = self.client.build_request(
+                    "GET", url, params=params, headers=ResponseCache.conditional_headers(entry)
+                )
+                response = await self.client.send(request, stream=True)
+                try:
+                    if response.status_code == 304 and entry:
+                        logger.debug(f"MLB API response for {endpoint} not modified")
+                        await to_thread(self.cache.touch, entry)
+                        return entry["body"]
+                    response.raise_for_status()
+                    if selective:
+                        body = await parse_boxscore_summary_async(response)
+                    else:
+                        await response.aread()
+                        body = response.json()
+                finally:
+                    await response.aclose()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching from MLB API: {e}")
+                raise
+
+        if self.cache:
+            await to_thread(self.cache.store, cache_url, params, body, response.headers)
+        return body
+
+    async def get_schedule(self, date: Optional[datetime.date] = None, hydrate: Optional[str] = None,
+                           max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get MLB schedule for a specific date, optionally with hydrated game details.
+
+        max_age overrides how long a cached schedule is served without revalidation.
+        """
+        return await self._make_request("schedule", schedule_params(date, hydrate), max_age=max_age)
+
+    async def get_schedule_range(self, start_date: datetime.date, end_date: datetime.date,
+                                 hydrate: Optional[str] = None) -> Dict[str, Any]:
+        """Get the MLB schedule for every date in a range with a single request."""
+        return await self._make_request("schedule", schedule_range_params(start_date, end_date, hydrate))
+
+    async def get_game_boxscore(self, game_id: str, final: bool = False, summary_only: bool = False) -> Dict[str, Any]:
+        """Get detailed boxscore for a specific game."""
+        return await self._make_request(f"game/{game_id}/boxscore", immutable=final, summary_only=summary_only)
+
+    async def get_final_boxscore(self, game_id: str) -> Dict[str, Any]:
+        """Get the boxscore of a Final game, fetching it at most once.
+
+        Concurrent callers await the same task. Failed fetches are dropped so
+        they can be retried.
+        """
+        task = self._boxscore_tasks.get(game_id)
+        if task is None:
+            task = asyncio.ensure_future(self.get_game_boxscore(game_id, final=True, summary_only=True))
+            self._boxscore_tasks[game_id] = task
+
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if self._boxscore_tasks.get(game_id) is task:
+                del self._boxscore_tasks[game_id]
+            raise
+
+    async def build_stat_table(self, snapshot: LeagueSnapshot, max_workers: Optional[int] = None) -> DailyStatTable:
+        """Fetch every Final boxscore of the slate and build the league-wide stat table.
+
+        Concurrency is bounded by max_concurrency; max_workers is accepted so
+        calls written for MLBDataFetcher work unchanged.
+        """
+        return DailyStatTable.from_boxscores(await self.prefetch_boxscores(snapshot))
+
+    def clear_boxscore_cache(self) -> None:
+        """Drop cached boxscores, e.g. once a batch for a date has finished."""
+        self._boxscore_tasks.clear()
+
+    async def get_teams(self) -> Dict[str, Any]:
+        """Get all MLB teams."""
+        return await self._make_request("teams", {"sportId": 1, "hydrate": "division"})
+
+    async def get_team_registry(self) -> TeamRegistry:
+        """Return the team registry, building and persisting it on first use."""
+        async with self._registry_lock:
+            if self._team_registry is None:
+                registry = await to_thread(TeamRegistry.load)
+                if registry is None:
+                    try:
+                        registry = TeamRegistry.from_teams_payload(await self.get_teams())
+                        await to_thread(registry.save)
+                    except Exception as e:
+                        logger.error(f"Error building team registry, using configured team ids: {e}")
+                        registry = TeamRegistry.fallback()
+                self._team_registry = registry
+            return self._team_registry
+
+    async def get_team_stats(self, team_id: str) -> Dict[str, Any]:
+        """Get team stats."""
+        return await self._make_request(f"teams/{team_id}/stats")
+
+    async def get_standings(self, date: Optional[datetime.date] = None, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get current league standings, or the standings as of a past date."""
+        return await self._make_request("standings", standings_params(date), max_age=max_age)
+
+    async def get_current_standings(self, schedule: Optional[Dict[str, Any]] = None,
+                                    date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """Get current league standings from the local standings table.
+
+        The Final games of the given schedule are applied to the table, so only
+        the periodic reconciliation downloads the full standings, as of the
+        schedule's date when one is given.
+        """
+        async with self._standings_lock:
+            # Loading and saving the table touches the disk, so it runs in a worker thread
+            table = await to_thread(update_standings_table, self._standings_table, schedule)
+            if table is None:
+                table = await self._reconcile_standings(date)
+            self._standings_table = table
+            return table.to_statsapi()
+
+    async def _reconcile_standings(self, date: Optional[datetime.date] = None) -> StandingsTable:
+        """Replace the standings table with a full standings pull as of a date."""
+        logger.info("Reconciling standings table with a full standings pull")
+        since, end = standings_reconcile_window(date)
+        standings, schedule = await asyncio.gather(self.get_standings(date, max_age=0), self.get_schedule_range(since, end))
+        return await to_thread(seed_standings_table, standings, schedule, since)
+
+    async def get_team_roster(self, team_id: str) -> Dict[str, Any]:
+        """Get team roster."""
+        return await self._make_request(f"teams/{team_id}/roster")
+
+    async def get_league_snapshot(self, date: Optional[datetime.date] = None, max_age: Optional[float] = None) -> LeagueSnapshot:
+        """Fetch the schedule for a date and update the standings table from its Final games.
+
+        max_age overrides how long a cached schedule is served.
+        """
+        date = date or datetime.date.today() - datetime.timedelta(days=1)
+        hydrated = self.fetch_mode == "hydrated"
+        schedule = await self.get_schedule(date, hydrate=MLB_SCHEDULE_HYDRATE if hydrated else None, max_age=max_age)
+
+        try:
+            standings = await self.get_current_standings(schedule, date)
+        except Exception as e:
+            logger.error(f"Error fetching standings data: {e}")
+            standings = {}
+
+        return LeagueSnapshot(date, schedule, standings, hydrated=hydrated)
+
+    async def get_league_snapshots(self, start_date: datetime.date,
+                                   end_date: datetime.date) -> Dict[datetime.date, LeagueSnapshot]:
+        """Build a league snapshot for every date in a range.
+
+        The schedule for the whole range is fetched in one request and split by
+        date, and the standings as of each date are fetched concurrently.
+        """
+        hydrated = self.fetch_mode == "hydrated"
+        schedule = await self.get_schedule_range(start_date, end_date, hydrate=MLB_SCHEDULE_HYDRATE if hydrated else None)
+        schedule_by_date = split_schedule_by_date(schedule)
+
+        dates = [start_date + datetime.timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+        standings_by_date = await asyncio.gather(*(self.get_standings(date) for date in dates), return_exceptions=True)
+
+        snapshots = {}
+        for date, standings in zip(dates, standings_by_date):
+            if isinstance(standings, BaseException):
+                logger.error(f"Error fetching standings data for {date.strftime('%Y-%m-%d')}: {standings}")
+                standings = {}
+            date_schedule = schedule_by_date.get(date.strftime("%Y-%m-%d"), {"dates": []})
+            snapshots[date] = LeagueSnapshot(date, date_schedule, standings, hydrated=hydrated)
+        return snapshots
+
+    async def prefetch_boxscores(self, snapshot: LeagueSnapshot) -> Dict[Any, Dict[str, Any]]:
+        """Fetch the boxscores of every Final game of the slate concurrently."""
+        game_ids = final_game_ids(snapshot)
+        logger.info(f"Prefetching {len(game_ids)} boxscores for {snapshot.date.strftime('%Y-%m-%d')}")
+
+        results = await asyncio.gather(
+            *(self.get_final_boxscore(game_id) for game_id in game_ids), return_exceptions=True
+        )
+        boxscores = {}
+        for game_id, result in zip(game_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error fetching boxscore for game {game_id}: {result}")
+            else:
+                boxscores[game_id] = result
+        return boxscores
+
+    async def process_team_daily_data(self, team_code: str, date: Optional[datetime.date] = None,
+                                      snapshot: Optional[LeagueSnapshot] = None,
+                                      batting_lines: Optional[bool] = None) -> TeamDay:
+        """Process daily data for a specific team, fetching its boxscores concurrently."""
+        date = date or datetime.date.today() - datetime.timedelta(days=1)  # Default to yesterday
+        date_str = date.strftime("%Y-%m-%d")
+        team_name = MLB_TEAMS.get(team_code)
+
+        logger.info(f"Processing data for {team_name} on {date_str}")
+
+        if self.use_mock:
+            return await to_thread(load_or_create_mock_team_data, team_code, date_str)
+
+        if snapshot is None or snapshot.date != date:
+            snapshot = await self.get_league_snapshot(date)
+        if batting_lines is None:
+            batting_lines = self.fetch_mode != "hydrated"
+        team_id = (await self.get_team_registry()).id_for(team_code)
+        team_data = snapshot_team_data(team_code, date_str, snapshot, team_id)
+
+        final_games = [game_info for game_info in team_data["games"] if needs_boxscore(game_info, snapshot, batting_lines)]
+        boxscores = await asyncio.gather(
+            *(self.get_final_boxscore(game_info["game_id"]) for game_info in final_games),
+            return_exceptions=True
+        )
+        for game_info, boxscore in zip(final_games, boxscores):
+            if isinstance(boxscore, BaseException):
+                logger.error(f"Error fetching boxscore for game {game_info['game_id']}: {boxscore}")
+            else:
+                add_boxscore_summary(game_info, boxscore)
+
+        if snapshot.stat_table is not None:
+            apply_stat_table(team_data, snapshot.stat_table)
+
+        team_day = TeamDay.from_dict(team_data)
+        await to_thread(save_team_data, team_day)
+        return team_day
+
+    async def process_all_teams_daily_data(self, date: Optional[datetime.date] = None,
+                                           team_codes: Optional[List[str]] = None,
+                                           snapshot: Optional[LeagueSnapshot] = None) -> Dict[str, TeamDay]:
+        """Process daily data for many teams, fetching the whole slate concurrently.
+
+        A snapshot for the date can be passed, e.g. one of get_league_snapshots.
+        Returns team data keyed by team code. Teams that fail are logged and left out.
+        """
+        date = date or datetime.date.today() - datetime.timedelta(days=1)
+        team_codes = team_codes or list(MLB_TEAMS.keys())
+
+        if snapshot is None or snapshot.date != date:
+            snapshot = await self.get_league_snapshot(date)
+        if not snapshot.hydrated and snapshot.stat_table is None:
+            snapshot.stat_table = await self.build_stat_table(snapshot)
+
+        results = await asyncio.gather(
+            *(self.process_team_daily_data(team_code, date, snapshot) for team_code in team_codes),
+            return_exceptions=True
+        )
+
+        team_days = {}
+        for team_code, result in zip(team_codes, results):
+            if isinstance(result, BaseException):
+                logger.error(f"Error processing data for {MLB_TEAMS.get(team_code)}: {result}")
+            else:
+                team_days[team_code] = result
+
+        self.clear_boxscore_cache()
+        return team_days
@@ -0,0 +1,164 @@
+import asyncio
+import datetime
+from typing import Dict, List, Any, Optional, AsyncIterator
+import httpx
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from config.config import (
+    PERPLEXITY_API_BASE_URL, PERPLEXITY_API_KEY, PERPLEXITY_MAX_CONCURRENCY, PERPLEXITY_STREAMING, MLB_TEAMS
+)
+from utils.logger import get_logger
+from utils.news_cache import NewsCache
+from utils.perplexity_api import (
+    team_news_payload, group_news_payload, response_content, parse_group_news, wait_retry_after,
+    ThinkStripper, stream_deltas
+)
+
+logger = get_logger(__name__)
+
+def is_retryable(exception: BaseException) -> bool:
+    """Retry rate limits, server errors and transport failures, not client errors."""
+    if isinstance(exception, httpx.HTTPStatusError):
+        return exception.response.status_code == 429 or exception.response.status_code >= 500
+    return isinstance(exception, httpx.TransportError)
+
+class AsyncPerplexityNewsFetcher:
+    """Asynchronous Perplexity news client for fetching many teams' news at once.
+
+    Requests run concurrently on one pooled client, capped by a semaphore.
+    Rate-limited requests wait as long as the server's Retry-After asks.
+    Results are saved through the same news cache as PerplexityNewsFetcher.
+    """
+
+    def __init__(self, max_concurrency: int = PERPLEXITY_MAX_CONCURRENCY,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = PERPLEXITY_API_BASE_URL
+        self.api_key = PERPLEXITY_API_KEY
+        self.news_cache = NewsCache()
+        self.streaming = PERPLEXITY_STREAMING
+        self.client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            # Reasoning calls can take minutes
+            timeout=httpx.Timeout(300.0, connect=10.0),
+            transport=transport
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def __aenter__(self) -> "AsyncPerplexityNewsFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.client.aclose()
+
+    @retry(stop=stop_after_attempt(4), retry=retry_if_exception(is_retryable),
+           wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=30)))
+    async def _post_chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Post a chat completion request to the Perplexity API with retries."""
+        async with self._semaphore:
+            try:
+                response = await self.client.post(f"{self.base_url}/chat/completions", json=payload)
+                response.raise_for_status()
+                return response.json()
+            except httpx.HTTPError as e:
+                logger.error(f"Error fetching from Perplexity API: {e}")
+                raise
+
+    async def _stream_chat_completion(self, payload: Dict[str, Any]) -> AsyncIterator[str]:
+        """Stream a chat completion and yield the visible text as it arrives."""
+        stripper = ThinkStripper()
+        async with self.client.stream("POST", f"{self.base_url}/chat/completions",
+                                      json={**payload, "stream": True},
+                                      headers={"Accept": "text/event-stream"}) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                for delta in stream_deltas([line]):
+                    text = stripper.feed(delta)
+                    if text:
+                        yield text
+        text = stripper.flush()
+        if text:
+            yield text
+
+    @retry(stop=stop_after_attempt(4), retry=retry_if_exception(is_retryable),
+           wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=30)))
+    async def _stream_chat_content(self, payload: Dict[str, Any]) -> str:
+        """Stream a chat completion with retries and return its visible text."""
+        async with self._semaphore:
+            try:
+                return "".join([text async for text in self._stream_chat_completion(payload)]).strip()
+            except httpx.HTTPError as e:
+                logger.error(f"Error streaming from Perplexity API: {e}")
+                raise
+
+    async def _chat_content(self, payload: Dict[str, Any]) -> str:
+        """Return the visible text of a chat completion, streamed if enabled."""
+        if self.streaming:
+            return await self._stream_chat_content(payload)
+        return response_content(await self._post_chat_completion(payload))
+
+    async def get_team_news(self, team_name: str) -> Any:
+        """Get news for a specific team, or None if the request fails."""
+        try:
+            return await self._chat_content(team_news_payload(f"{team_name} MLB baseball recent news"))
+        except Exception as e:
+            logger.error(f"Error fetching news for {team_name}: {e}")
+            return None
+
+    async def get_group_news(self, team_names: List[str]) -> Dict[str, Any]:
+        """Get news for several teams with a single structured request.
+
+        Teams missing from the response are fetched individually and concurrently;
+        the news of a team whose request failed is None.
+        """
+        if len(team_names) == 1:
+            return {team_names[0]: await self.get_team_news(team_names[0])}
+
+        news: Dict[str, Any] = {}
+        try:
+            content = await self._chat_content(group_news_payload(team_names))
+            news = parse_group_news(content, team_names)
+        except Exception as e:
+            logger.error(f"Error fetching news for {', '.join(team_names)}: {e}")
+
+        missing = [team_name for team_name in team_names if team_name not in news]
+        if missing:
+            logger.warning(f"Batched news response missed {', '.join(missing)}, fetching individually")
+            results = await asyncio.gather(*(self.get_team_news(team_name) for team_name in missing))
+            news.update(zip(missing, results))
+        return news
+
+    async def fetch_and_save_news(self, groups: List[List[str]], date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """Fetch the news of every group of team codes concurrently and save each team's file.
+
+        Failed requests are not saved, so they are not cached as empty news
+        and each team's own pipeline fetches its news again. Returns the news
+        keyed by team code.
+        """
+        date = date or datetime.date.today()
+
+        async def fetch_group(team_codes: List[str]) -> Dict[str, Any]:
+            team_names = {team_code: MLB_TEAMS.get(team_code) for team_code in team_codes}
+            news = await self.get_group_news(list(team_names.values()))
+            return {team_code: news.get(team_name, "") for team_code, team_name in team_names.items()}
+
+        news_by_team = {}
+        failed = []
+        for group_news in await asyncio.gather(*(fetch_group(group) for group in groups)):
+            for team_code, news in group_news.items():
+                if news is None:
+                    failed.append(team_code)
+                    continue
+                self.news_cache.store(team_code, date, news)
+                news_by_team[team_code] = news
+
+        logger.info(f"Fetched news for {len(news_by_team)} teams in {len(groups)} concurrent requests")
+        if failed:
+            logger.warning(f"News requests failed for {', '.join(failed)}, leaving them to the teams' pipelines")
+        return news_by_team
@@ -3,8 +3,10 @@ import json
 import datetime
 import time
 import base64
+import re
 import uuid
-from typing import Dict, Any, Optional, List, Tuple
+import concurrent.futures
+from typing import Dict, Any, Optional, List, Tuple, Iterable
 from google.cloud import texttospeech, storage
 from google.cloud.storage import Blob
 from google.oauth2 import service_account
@@ -16,7 +18,7 @@ import requests
 
 from config.config import (
     GOOGLE_CLOUD_API_KEY, GOOGLE_WAVENET_VOICE, GOOGLE_WAVENET_LANGUAGE_CODE,
-    SCRIPTS_DIR, AUDIO_DIR, MLB_TEAMS
+    SCRIPTS_DIR, AUDIO_DIR, MLB_TEAMS, TTS_STREAM_WORKERS, TTS_SPEAKING_RATE
 )
 
 # Try to import optional Long Audio API settings, with fallbacks
@@ -178,7 +180,7 @@ class GoogleWavenetTTS:
                 # Select the audio encoding
                 audio_config = texttospeech.AudioConfig(
                     audio_encoding=texttospeech.AudioEncoding.MP3,
-                    speaking_rate=1.0,
+                    speaking_rate=TTS_SPEAKING_RATE,
                     pitch=0.0,
                     sample_rate_hertz=24000
                 )
@@ -211,7 +213,7 @@ class GoogleWavenetTTS:
                     },
                     "audioConfig": {
                         "audioEncoding": "MP3",
-                        "speakingRate": 1.0,
+                        "speakingRate": TTS_SPEAKING_RATE,
                         "pitch": 0.0,
                         "sampleRateHertz": 24000
                     }
@@ -291,7 +293,7 @@ class GoogleWavenetTTS:
                         },
                         "audioConfig": {
                             "audioEncoding": "LINEAR16",  # Long Audio API only supports LINEAR16 currently
-                            "speakingRate": 1.0,
+                            "speakingRate": TTS_SPEAKING_RATE,
                             "pitch": 0.0,
                             "sampleRateHertz": 24000
                         },
@@ -401,7 +403,7 @@ class GoogleWavenetTTS:
                 },
                 "audioConfig": {
                     "audioEncoding": "LINEAR16",  # Long Audio API only supports LINEAR16 currently
-                    "speakingRate": 1.0,
+                    "speakingRate": TTS_SPEAKING_RATE,
                     "pitch": 0.0,
                     "sampleRateHertz": 24000
                 },
@@ -898,6 +900,62 @@ class GoogleWavenetTTS:
             logger.error(f"Failed to generate audio: {e}")
             raise
     
+    def _split_for_request(self, text: str) -> List[str]:
+        """Split text at sentence boundaries into pieces within the request size limit."""
+        if len(text.encode("utf-8")) <= self.max_char_limit:
+            return [text]
+        
+        pieces = []
+        current = ""
+        for sentence in re.split(r"(?<=[.!?])\s+", text):
+            candidate = f"{current} {sentence}".strip()
+            if current and len(candidate.encode("utf-8")) > self.max_char_limit:
+                pieces.append(current)
+                candidate = sentence
+            current = candidate
+        if current:
+            pieces.append(current)
+        return pieces
+    
+    def synthesize_paragraphs(self, paragraphs: Iterable[str], voice_name: Optional[str] = None,
+                              max_workers: int = TTS_STREAM_WORKERS) -> bytes:
+        """Synthesize paragraphs as they arrive and return the audio in script order.
+        
+        Each paragraph is queued for synthesis as soon as the iterable yields it,
+        so a script streamed from the LLM is voiced while it is still being
+        written. The MP3 segments are joined in order once all are done.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            segments = []
+            for paragraph in paragraphs:
+                for piece in self._split_for_request(paragraph):
+                    segments.append(executor.submit(self._tts_request, piece, voice_name))
+            
+            logger.info(f"Synthesizing {len(segments)} script paragraphs")
+            return b"".join(segment.result() for segment in segments)
+    
+    def generate_and_save_streamed_audio(self, team_code: str, date: datetime.date,
+                                         paragraphs: Iterable[str]) -> str:
+        """Generate audio from a streamed script's paragraphs and save it to file.
+        
+        Unlike generate_and_save_audio, errors are raised so the caller can
+        fall back to generating the script and audio in full.
+        """
+        date_str = date.strftime("%Y-%m-%d")
+        team_audio_dir = os.path.join(AUDIO_DIR, team_code)
+        os.makedirs(team_audio_dir, exist_ok=True)
+        output_file = os.path.join(team_audio_dir, f"{date_str}.mp3")
+        
+        audio_data = self.synthesize_paragraphs(paragraphs)
+        if not audio_data:
+            raise ValueError(f"No script text streamed for {MLB_TEAMS.get(team_code, team_code)} on {date_str}")
+        
+        with open(output_file, "wb") as f:
+            f.write(audio_data)
+        
+        logger.info(f"Audio saved to {output_file}")
+        return output_file
+    
     def get_script_text(self, team_code: str, date: Optional[datetime.date] = None) -> tuple[str, bool]:
         """Get the script text for a team.
         
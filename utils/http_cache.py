@@ -0,0 +1,98 @@
+import os
+import json
+import time
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+
+from config.config import HTTP_CACHE_DIR
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ResponseCache:
+    """Persistent on-disk cache of JSON API responses.
+
+    Each entry stores the response body together with its ETag and
+    Last-Modified validators, so stale entries can be revalidated with a
+    conditional request instead of being downloaded again.
+    """
+
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Build a stable cache key for a URL and its query parameters."""
+        raw = json.dumps([url, params or {}], sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for a request, or None if there is none."""
+        path = self._path(self._key(url, params))
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+    @staticmethod
+    def is_fresh(entry: Dict[str, Any], ttl: Optional[float]) -> bool:
+        """Check whether an entry can be served without revalidation.
+
+        A ttl of None marks the response as immutable.
+        """
+        if ttl is None:
+            return True
+        return time.time() - entry.get("fetched_at", 0) < ttl
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry."""
+        headers = {}
+        if not entry:
+            return headers
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, params: Optional[Dict[str, Any]], body: Dict[str, Any],
+              headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+        """Store a response body and its validators."""
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "params": params or {},
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+            "body": body,
+        }
+        self._write(self._key(url, params), entry)
+        return entry
+
+    def touch(self, entry: Dict[str, Any]) -> None:
+        """Mark an entry as freshly validated after a 304 response."""
+        entry["fetched_at"] = time.time()
+        self._write(self._key(entry["url"], entry["params"]), entry)
+
+    def _write(self, key: str, entry: Dict[str, Any]) -> None:
+        """Write an entry atomically so concurrent readers never see a partial file."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            logger.warning(f"Failed to write cache entry {key}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
@@ -1,63 +1,663 @@
 import os
-import json
 import datetime
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from decimal import Decimal
+from typing import Dict, List, Any, Optional, Tuple, IO
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 
-from config.config import MLB_API_BASE_URL, MLB_API_KEY, DATA_DIR, MLB_TEAMS
+try:
+    import ijson
+except ImportError:  # Selective boxscore parsing falls back to response.json()
+    ijson = None
+
+from config.config import (
+    MLB_API_BASE_URL, MLB_API_KEY, DATA_DIR, MLB_TEAMS, MLB_HTTP_CACHE_ENABLED, MLB_CACHE_TTLS,
+    MLB_FETCH_MODE, MLB_SCHEDULE_HYDRATE
+)
 from utils.logger import get_logger
+from utils.http_cache import ResponseCache
+from utils.team_registry import TeamRegistry
+from utils.standings import StandingsTable
+from utils.models import TeamDay
+from utils.stat_table import DailyStatTable
 
 logger = get_logger(__name__)
 
-class MLBDataFetcher:
+class LeagueSnapshot:
+    """League-wide schedule and standings for a single date.
+
+    Fetched once and shared read-only by every team processed for that date,
+    so a full run does not repeat the same schedule and standings requests.
+    A hydrated snapshot carries linescores and pitching decisions for each game.
+    Games and standings rows are indexed by statsapi team id when it is built.
+    """
+
+    def __init__(self, date: datetime.date, schedule: Dict[str, Any], standings: Dict[str, Any],
+                 hydrated: bool = False):
+        self.date = date
+        self.schedule = schedule
+        self.standings = standings
+        self.hydrated = hydrated
+        # League-wide stat table, attached once the slate's boxscores are available
+        self.stat_table: Optional[DailyStatTable] = None
+        
+        self._games_by_team_id: Dict[int, List[Dict[str, Any]]] = {}
+        for date_data in schedule.get("dates", []):
+            for game in date_data.get("games", []):
+                for side in ("away", "home"):
+                    team_id = game.get("teams", {}).get(side, {}).get("team", {}).get("id")
+                    self._games_by_team_id.setdefault(team_id, []).append(game)
+        
+        self._standings_by_team_id: Dict[int, Dict[str, Any]] = {}
+        for division in standings.get("records", []):
+            for team_record in division.get("teamRecords", []):
+                self._standings_by_team_id[team_record.get("team", {}).get("id")] = team_record
+
+    def games_for_team(self, team_id: int) -> List[Dict[str, Any]]:
+        """Return the raw schedule games involving a team."""
+        return self._games_by_team_id.get(team_id, [])
+
+    def standings_for_team(self, team_id: int) -> Dict[str, Any]:
+        """Return the standings record for a team, or an empty dict."""
+        team_record = self._standings_by_team_id.get(team_id)
+        if team_record is None:
+            return {}
+        
+        return {
+            "wins": team_record.get("wins", 0),
+            "losses": team_record.get("losses", 0),
+            "division_rank": team_record.get("divisionRank", ""),
+            "games_back": team_record.get("gamesBack", 0),
+            "streak": team_record.get("streak", {}).get("streakCode", "")
+        }
+
+def cache_ttl(endpoint: str) -> Optional[float]:
+    """Look up how long a cached response for a statsapi endpoint stays fresh."""
+    if endpoint.endswith("/boxscore"):
+        return MLB_CACHE_TTLS["boxscore"]
+    return MLB_CACHE_TTLS.get(endpoint.split("/", 1)[0], 0)
+
+def schedule_params(date: Optional[datetime.date] = None, hydrate: Optional[str] = None) -> Dict[str, Any]:
+    """Build the /schedule query for a date, optionally with hydrated game details."""
+    date_str = date.strftime("%Y-%m-%d") if date else datetime.date.today().strftime("%Y-%m-%d")
+    params = {"date": date_str, "sportId": 1}
+    if hydrate:
+        params["hydrate"] = hydrate
+    return params
+
+def schedule_range_params(start_date: datetime.date, end_date: datetime.date,
+                          hydrate: Optional[str] = None) -> Dict[str, Any]:
+    """Build the /schedule query for every date in a range."""
+    params = {
+        "startDate": start_date.strftime("%Y-%m-%d"),
+        "endDate": end_date.strftime("%Y-%m-%d"),
+        "sportId": 1
+    }
+    if hydrate:
+        params["hydrate"] = hydrate
+    return params
+
+def standings_params(date: Optional[datetime.date] = None) -> Dict[str, Any]:
+    """Build the /standings query for the current standings, or as of a past date."""
+    params = {"leagueId": "103,104"}
+    if date:
+        params["date"] = date.strftime("%Y-%m-%d")
+    return params
+
+def split_schedule_by_date(schedule: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Split a date-range schedule into single-date schedules keyed by date string."""
+    return {
+        date_data.get("date"): {"dates": [date_data]}
+        for date_data in schedule.get("dates", [])
+    }
+
+def standings_reconcile_window(date: Optional[datetime.date] = None) -> Tuple[datetime.date, datetime.date]:
+    """Return the first and last date whose Final games a standings pull as of a date may include.
+    
+    Without a date the window ends today, for a pull of the current standings.
+    """
+    end = date or datetime.date.today()
+    return end - datetime.timedelta(days=1), end
+
+def is_retryable(error: BaseException) -> bool:
+    """Retry network failures and server errors, but not requests statsapi rejected.
+    
+    A 404 or 400 answers the same way every time, e.g. a replayed request
+    without a recorded fixture, so retrying it only adds the backoff delay.
+    """
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    return status is None or status >= 500 or status in (408, 429)
+
+def seed_standings_table(standings: Dict[str, Any], schedule: Dict[str, Any], since: datetime.date) -> StandingsTable:
+    """Build and save the standings table from a full standings pull.
+    
+    schedule covers the reconcile window; its games already Final when the
+    standings were pulled are part of them.
+    """
+    table = StandingsTable.from_statsapi(standings, since)
+    table.mark_applied(schedule)
+    table.save()
+    return table
+
+def update_standings_table(table: Optional[StandingsTable],
+                           schedule: Optional[Dict[str, Any]] = None) -> Optional[StandingsTable]:
+    """Apply the Final games of a schedule to the in-memory or saved standings table.
+    
+    Returns None if there is no table yet or it is due for a full standings pull.
+    """
+    table = table or StandingsTable.load()
+    if table is None or table.needs_reconcile():
+        return None
+    if schedule and table.apply_schedule(schedule):
+        table.save()
+    return table
+
+def final_game_ids(snapshot: LeagueSnapshot) -> List[Any]:
+    """Return the gamePks of every Final game in a snapshot."""
+    return [
+        game.get("gamePk")
+        for date_data in snapshot.schedule.get("dates", [])
+        for game in date_data.get("games", [])
+        if game.get("status", {}).get("abstractGameState") == "Final"
+    ]
+
+def needs_boxscore(game_info: Dict[str, Any], snapshot: LeagueSnapshot, batting_lines: bool) -> bool:
+    """Check whether a team must summarize a game's boxscore itself.
+    
+    Only Final games need one, and only when the schedule alone is not enough
+    and the snapshot's stat table does not already cover the game.
+    """
+    if game_info["status"] != "Final" or not (batting_lines or not snapshot.hydrated):
+        return False
+    return snapshot.stat_table is None or not snapshot.stat_table.has_game(game_info["game_id"])
+
+def apply_stat_table(team_data: Dict[str, Any], stat_table: DailyStatTable) -> None:
+    """Fill in hits and standouts of the games in the stat table and add league leaders."""
+    standouts = stat_table.standouts_by_game()
+    for game_info in team_data["games"]:
+        if game_info["status"] == "Final" and stat_table.has_game(game_info["game_id"]):
+            game_info.update(stat_table.game_hits[game_info["game_id"]])
+            decisions = [perf for perf in game_info.get("notable_performances", []) if perf.get("decision")]
+            game_info["notable_performances"] = [
+                perf.to_dict() for perf in standouts.get(game_info["game_id"], ())
+            ] + decisions
+    team_data["league_leaders"] = [perf.to_dict() for perf in stat_table.league_leaders()]
+
+def build_game_info(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the game summary stored in team data from a schedule game."""
+    away_team = game.get("teams", {}).get("away", {}).get("team", {})
+    home_team = game.get("teams", {}).get("home", {}).get("team", {})
+    
+    return {
+        "game_id": game.get("gamePk"),
+        "status": game.get("status", {}).get("abstractGameState"),
+        "home_team": home_team.get("name"),
+        "away_team": away_team.get("name"),
+        "home_team_id": home_team.get("id"),
+        "away_team_id": away_team.get("id"),
+        "home_score": game.get("teams", {}).get("home", {}).get("score", 0),
+        "away_score": game.get("teams", {}).get("away", {}).get("score", 0),
+        "venue": game.get("venue", {}).get("name", ""),
+        "start_time": game.get("gameDate", "")
+    }
+
+def snapshot_team_data(team_code: str, date_str: str, snapshot: LeagueSnapshot, team_id: int) -> Dict[str, Any]:
+    """Slice a team's games and standings from a league snapshot into team data."""
+    team_data = {
+        "team_code": team_code,
+        "team_name": MLB_TEAMS.get(team_code),
+        "date": date_str,
+        "games": [],
+        "standings": snapshot.standings_for_team(team_id),
+    }
+    for game in snapshot.games_for_team(team_id):
+        game_info = build_game_info(game)
+        if snapshot.hydrated:
+            game_info.update(summarize_hydrated_game(game))
+        team_data["games"].append(game_info)
+    return team_data
+
+def add_boxscore_summary(game_info: Dict[str, Any], boxscore: Dict[str, Any]) -> None:
+    """Add a boxscore's hits and notable performances to a game summary."""
+    summary = summarize_boxscore(boxscore)
+    summary["notable_performances"] += game_info.get("notable_performances", [])
+    game_info.update(summary)
+
+def summarize_boxscore(boxscore: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract team hits and notable batting performances from a boxscore."""
+    home_hits = boxscore.get("teams", {}).get("home", {}).get("teamStats", {}).get("batting", {}).get("hits", 0)
+    away_hits = boxscore.get("teams", {}).get("away", {}).get("teamStats", {}).get("batting", {}).get("hits", 0)
+    
+    # Add notable performances
+    notable_performances = []
+    
+    for side in ["home", "away"]:
+        players = boxscore.get("teams", {}).get(side, {}).get("players", {})
+        for player_id, player_data in players.items():
+            # Check for notable batting performances
+            batting_stats = player_data.get("stats", {}).get("batting", {})
+            if batting_stats.get("homeRuns", 0) > 0 or batting_stats.get("rbi", 0) > 2:
+                notable_performances.append({
+                    "name": player_data.get("person", {}).get("fullName", ""),
+                    "team": boxscore.get("teams", {}).get(side, {}).get("team", {}).get("name", ""),
+                    "hr": batting_stats.get("homeRuns", 0),
+                    "rbi": batting_stats.get("rbi", 0),
+                    "hits": batting_stats.get("hits", 0)
+                })
+    
+    return {
+        "home_hits": home_hits,
+        "away_hits": away_hits,
+        "notable_performances": notable_performances
+    }
+
+# Boxscore fields read by summarize_boxscore and DailyStatTable, "*" matches any side or player key
+BOXSCORE_SUMMARY_FIELDS: Tuple[Tuple[str, ...], ...] = (
+    ("teams", "*", "team", "id"),
+    ("teams", "*", "team", "name"),
+    ("teams", "*", "teamStats", "batting", "hits"),
+    ("teams", "*", "players", "*", "person", "id"),
+    ("teams", "*", "players", "*", "person", "fullName"),
+) + tuple(
+    ("teams", "*", "players", "*", "stats", "batting", stat)
+    for stat in ("atBats", "hits", "homeRuns", "rbi", "baseOnBalls")
+) + tuple(
+    ("teams", "*", "players", "*", "stats", "pitching", stat)
+    for stat in ("inningsPitched", "strikeOuts", "earnedRuns", "hits")
+)
+
+class BoxscoreSummaryBuilder:
+    """Collect the BOXSCORE_SUMMARY_FIELDS of a boxscore from ijson parse events.
+
+    Only matching scalar values are kept, so the full nested payload is never
+    materialized. The result has the same shape as the full boxscore for the
+    fields it contains and can be passed to summarize_boxscore.
+    """
+
     def __init__(self):
+        self.summary: Dict[str, Any] = {}
+
+    def add(self, prefix: str, event: str, value: Any) -> None:
+        if event not in ("string", "number", "boolean") or not prefix.startswith("teams."):
+            return
+        
+        path = prefix.split(".")
+        for field in BOXSCORE_SUMMARY_FIELDS:
+            if len(field) == len(path) and all(part == "*" or part == key for part, key in zip(field, path)):
+                node = self.summary
+                for key in path[:-1]:
+                    node = node.setdefault(key, {})
+                node[path[-1]] = float(value) if isinstance(value, Decimal) else value
+                return
+
+def parse_boxscore_summary(stream: IO[bytes]) -> Dict[str, Any]:
+    """Parse only the summary fields of a boxscore from a byte stream."""
+    builder = BoxscoreSummaryBuilder()
+    for prefix, event, value in ijson.parse(stream):
+        builder.add(prefix, event, value)
+    return builder.summary
+
+def summarize_hydrated_game(game: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract hits, decisions and probable pitchers from a hydrated schedule game.
+    
+    Pitchers credited with a decision are reported as notable performances, so a
+    game can be covered without fetching its boxscore.
+    """
+    teams = game.get("teams", {})
+    home_name = teams.get("home", {}).get("team", {}).get("name", "")
+    away_name = teams.get("away", {}).get("team", {}).get("name", "")
+    
+    if game.get("status", {}).get("abstractGameState") != "Final":
+        return {
+            "probable_pitchers": {
+                "home": teams.get("home", {}).get("probablePitcher", {}).get("fullName", ""),
+                "away": teams.get("away", {}).get("probablePitcher", {}).get("fullName", "")
+            }
+        }
+    
+    linescore = game.get("linescore", {}).get("teams", {})
+    decisions = game.get("decisions", {})
+    home_won = teams.get("home", {}).get("score", 0) > teams.get("away", {}).get("score", 0)
+    winning_team, losing_team = (home_name, away_name) if home_won else (away_name, home_name)
+    
+    notable_performances = []
+    for key, code, team in (("winner", "W", winning_team), ("loser", "L", losing_team), ("save", "SV", winning_team)):
+        name = decisions.get(key, {}).get("fullName")
+        if name:
+            notable_performances.append({"name": name, "team": team, "decision": code})
+    
+    return {
+        "home_hits": linescore.get("home", {}).get("hits", 0),
+        "away_hits": linescore.get("away", {}).get("hits", 0),
+        "decisions": {key: decisions.get(key, {}).get("fullName", "") for key in ("winner", "loser", "save")},
+        "notable_performances": notable_performances
+    }
+
+def save_team_data(team_day: TeamDay) -> str:
+    """Save processed team data to the data directory and return its path."""
+    team_dir = os.path.join(DATA_DIR, team_day.team_code)
+    os.makedirs(team_dir, exist_ok=True)
+    
+    file_path = os.path.join(team_dir, f"{team_day.date}.json")
+    with open(file_path, "w") as f:
+        f.write(team_day.to_json())
+    
+    logger.info(f"Saved data for {team_day.team_name} to {file_path}")
+    return file_path
+
+def load_or_create_mock_team_data(team_code: str, date_str: str) -> TeamDay:
+    """Return demo data for a team, reusing a saved data file if one exists."""
+    team_name = MLB_TEAMS.get(team_code)
+    logger.info(f"Using mock MLB data for {team_name} (demo mode)")
+    
+    # Get the existing data if available
+    file_path = os.path.join(DATA_DIR, team_code, f"{date_str}.json")
+    
+    if os.path.exists(file_path):
+        try:
+            with open(file_path, "r") as f:
+                return TeamDay.from_json(f.read())
+        except:
+            pass  # If file exists but can't be read, generate new mock data
+    
+    # Generate mock data
+    team_data = {
+        "team_code": team_code,
+        "team_name": team_name,
+        "date": date_str,
+        "games": [
+            {
+                "game_id": 12345,
+                "status": "Final",
+                "home_team": team_name,
+                "away_team": "Visiting Team",
+                "home_score": 8,
+                "away_score": 3,
+                "venue": "Home Stadium",
+                "start_time": f"{date_str}T19:05:00Z",
+                "home_hits": 12,
+                "away_hits": 6,
+                "notable_performances": [
+                    {
+                        "name": "Star Player 1",
+                        "team": team_name,
+                        "hr": 2,
+                        "rbi": 4,
+                        "hits": 3
+                    },
+                    {
+                        "name": "Star Player 2",
+                        "team": team_name,
+                        "hr": 1,
+                        "rbi": 2,
+                        "hits": 2
+                    }
+                ]
+            }
+        ],
+        "standings": {
+            "wins": 5,
+            "losses": 2,
+            "division_rank": "1",
+            "games_back": 0,
+            "streak": "W3"
+        }
+    }
+    
+    team_day = TeamDay.from_dict(team_data)
+    save_team_data(team_day)
+    return team_day
+
+class MLBDataFetcher:
+    def __init__(self, fetch_mode: str = MLB_FETCH_MODE):
         self.base_url = MLB_API_BASE_URL
         self.api_key = MLB_API_KEY
         self.use_mock = False
+        # "boxscore" pulls every Final boxscore; "hydrated" derives game details
+        # from a hydrated schedule and only fetches boxscores for batting lines
+        self.fetch_mode = fetch_mode
         self.session = requests.Session()
+        self.cache = ResponseCache() if MLB_HTTP_CACHE_ENABLED else None
+        
+        # Boxscores of Final games keyed by gamePk, shared by all worker threads.
+        # Each entry is a Future so concurrent requesters wait on a single fetch.
+        self._boxscore_cache: Dict[Any, Future] = {}
+        self._boxscore_lock = threading.Lock()
+        
+        self._team_registry: Optional[TeamRegistry] = None
+        self._registry_lock = threading.Lock()
+        
+        self._standings_table: Optional[StandingsTable] = None
+        self._standings_lock = threading.Lock()
         
         # Only set headers if we have a valid API key
         if self.api_key and not self.use_mock:
             self.session.headers.update({"Authorization": f"Bearer {self.api_key}"})
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
-    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Make a request to the MLB API with retries."""
+    @retry(retry=retry_if_exception(is_retryable), stop=stop_after_attempt(3),
+           wait=wait_exponential(multiplier=1, min=4, max=10))
+    def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                      immutable: bool = False, max_age: Optional[float] = None,
+                      summary_only: bool = False) -> Dict[str, Any]:
+        """Make a request to the MLB API with retries.
+        
+        Responses are cached on disk. Fresh entries are served without a request,
+        stale ones are revalidated with If-None-Match / If-Modified-Since.
+        Immutable responses never expire; max_age overrides the endpoint TTL.
+        With summary_only, a boxscore body is streamed through the selective
+        parser and only BOXSCORE_SUMMARY_FIELDS are kept (and cached).
+        """
         url = f"{self.base_url}/{endpoint}"
+        ttl = None if immutable else (max_age if max_age is not None else cache_ttl(endpoint))
+        selective = summary_only and ijson is not None
+        cache_url = f"{url}#summary" if selective else url
+        
+        entry = self.cache.get(cache_url, params) if self.cache else None
+        if entry and self.cache.is_fresh(entry, ttl):
+            return entry["body"]
+        
         try:
-            response = self.session.get(url, params=params)
-            response.raise_for_status()
-            return response.json()
+            response = self.session.get(url, params=params, headers=ResponseCache.conditional_headers(entry),
+                                        stream=selective)
+            with response:
+                if response.status_code == 304 and entry:
+                    logger.debug(f"MLB API response for {endpoint} not modified")
+                    self.cache.touch(entry)
+                    return entry["body"]
+                response.raise_for_status()
+                if selective:
+                    response.raw.decode_content = True
+                    body = parse_boxscore_summary(response.raw)
+                else:
+                    body = response.json()
         except requests.RequestException as e:
             logger.error(f"Error fetching from MLB API: {e}")
             raise
+        
+        if self.cache:
+            self.cache.store(cache_url, params, body, response.headers)
+        return body
+
+    def get_schedule(self, date: Optional[datetime.date] = None, hydrate: Optional[str] = None,
+                     max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get MLB schedule for a specific date, optionally with hydrated game details.
+        
+        max_age overrides how long a cached schedule is served without revalidation.
+        """
+        return self._make_request("schedule", schedule_params(date, hydrate), max_age=max_age)
+
+    def get_schedule_range(self, start_date: datetime.date, end_date: datetime.date,
+                           hydrate: Optional[str] = None) -> Dict[str, Any]:
+        """Get the MLB schedule for every date in a range with a single request."""
+        return self._make_request("schedule", schedule_range_params(start_date, end_date, hydrate))
+
+    def get_game_boxscore(self, game_id: str, final: bool = False, summary_only: bool = False) -> Dict[str, Any]:
+        """Get detailed boxscore for a specific game.
+        
+        Boxscores of Final games are immutable and cached without expiry.
+        With summary_only, only the fields used by summarize_boxscore are parsed.
+        """
+        return self._make_request(f"game/{game_id}/boxscore", immutable=final, summary_only=summary_only)
+
+    def get_final_boxscore(self, game_id: str) -> Dict[str, Any]:
+        """Get the summary fields of a Final game's boxscore, fetching it at most once.
+        
+        Both teams of a game request the same boxscore, often concurrently from
+        different threads. The first caller performs the fetch and later callers
+        wait on its result. Failed fetches are not cached so they can be retried.
+        """
+        with self._boxscore_lock:
+            future = self._boxscore_cache.get(game_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self._boxscore_cache[game_id] = future
+        
+        if is_owner:
+            try:
+                future.set_result(self.get_game_boxscore(game_id, final=True, summary_only=True))
+            except Exception as e:
+                with self._boxscore_lock:
+                    self._boxscore_cache.pop(game_id, None)
+                future.set_exception(e)
+        else:
+            logger.debug(f"Waiting on in-flight boxscore fetch for game {game_id}")
+        
+        return future.result()
+
+    def build_stat_table(self, snapshot: LeagueSnapshot, max_workers: int = 5) -> DailyStatTable:
+        """Fetch every Final boxscore of the slate and build the league-wide stat table.
+        
+        The boxscores land in the single-flight cache, so the per-team pipelines
+        that follow do not fetch them again.
+        """
+        game_ids = final_game_ids(snapshot)
+        boxscores = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            future_to_game = {executor.submit(self.get_final_boxscore, game_id): game_id for game_id in game_ids}
+            for future in as_completed(future_to_game):
+                game_id = future_to_game[future]
+                try:
+                    boxscores[game_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching boxscore for game {game_id}: {e}")
+        
+        return DailyStatTable.from_boxscores(boxscores)
 
-    def get_schedule(self, date: Optional[datetime.date] = None) -> Dict[str, Any]:
-        """Get MLB schedule for a specific date."""
-        date_str = date.strftime("%Y-%m-%d") if date else datetime.date.today().strftime("%Y-%m-%d")
-        return self._make_request("schedule", {"date": date_str, "sportId": 1})
+    def clear_boxscore_cache(self) -> None:
+        """Drop cached boxscores, e.g. once a batch for a date has finished."""
+        with self._boxscore_lock:
+            self._boxscore_cache.clear()
 
-    def get_game_boxscore(self, game_id: str) -> Dict[str, Any]:
-        """Get detailed boxscore for a specific game."""
-        return self._make_request(f"game/{game_id}/boxscore")
+    def get_teams(self) -> Dict[str, Any]:
+        """Get all MLB teams."""
+        return self._make_request("teams", {"sportId": 1, "hydrate": "division"})
+
+    def get_team_registry(self) -> TeamRegistry:
+        """Return the team registry, building and persisting it on first use."""
+        with self._registry_lock:
+            if self._team_registry is None:
+                registry = TeamRegistry.load()
+                if registry is None:
+                    try:
+                        registry = TeamRegistry.from_teams_payload(self.get_teams())
+                        registry.save()
+                    except Exception as e:
+                        logger.error(f"Error building team registry, using configured team ids: {e}")
+                        registry = TeamRegistry.fallback()
+                self._team_registry = registry
+            return self._team_registry
 
     def get_team_stats(self, team_id: str) -> Dict[str, Any]:
         """Get team stats."""
         return self._make_request(f"teams/{team_id}/stats")
 
-    def get_standings(self) -> Dict[str, Any]:
-        """Get current league standings."""
-        return self._make_request("standings", {"leagueId": "103,104"})
+    def get_standings(self, date: Optional[datetime.date] = None, max_age: Optional[float] = None) -> Dict[str, Any]:
+        """Get current league standings, or the standings as of a past date."""
+        return self._make_request("standings", standings_params(date), max_age=max_age)
+
+    def get_current_standings(self, schedule: Optional[Dict[str, Any]] = None,
+                              date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """Get current league standings from the local standings table.
+        
+        The Final games of the given schedule are applied to the table, so only
+        the periodic reconciliation downloads the full standings, as of the
+        schedule's date when one is given.
+        """
+        with self._standings_lock:
+            table = update_standings_table(self._standings_table, schedule)
+            if table is None:
+                table = self._reconcile_standings(date)
+            self._standings_table = table
+            return table.to_statsapi()
+
+    def _reconcile_standings(self, date: Optional[datetime.date] = None) -> StandingsTable:
+        """Replace the standings table with a full standings pull as of a date."""
+        logger.info("Reconciling standings table with a full standings pull")
+        since, end = standings_reconcile_window(date)
+        return seed_standings_table(self.get_standings(date, max_age=0), self.get_schedule_range(since, end), since)
 
     def get_team_roster(self, team_id: str) -> Dict[str, Any]:
         """Get team roster."""
         return self._make_request(f"teams/{team_id}/roster")
 
-    def process_team_daily_data(self, team_code: str, date: Optional[datetime.date] = None) -> Dict[str, Any]:
+    def get_league_snapshot(self, date: Optional[datetime.date] = None, max_age: Optional[float] = None) -> LeagueSnapshot:
+        """Fetch the schedule and standings for a date once for all teams.
+        
+        Standings come from the local standings table, updated with the Final
+        games of the schedule. max_age overrides how long a cached schedule is served.
+        """
+        date = date or datetime.date.today() - datetime.timedelta(days=1)
+        hydrated = self.fetch_mode == "hydrated"
+        schedule = self.get_schedule(date, hydrate=MLB_SCHEDULE_HYDRATE if hydrated else None, max_age=max_age)
+        
+        try:
+            standings = self.get_current_standings(schedule, date)
+        except Exception as e:
+            logger.error(f"Error fetching standings data: {e}")
+            standings = {}
+            
+        return LeagueSnapshot(date, schedule, standings, hydrated=hydrated)
+
+    def get_league_snapshots(self, start_date: datetime.date, end_date: datetime.date) -> Dict[datetime.date, LeagueSnapshot]:
+        """Build a league snapshot for every date in a range.
+        
+        The schedule for the whole range is fetched in one request and split by
+        date. Standings are fetched as of each date, since they are not available
+        for a range.
+        """
+        hydrated = self.fetch_mode == "hydrated"
+        schedule = self.get_schedule_range(start_date, end_date, hydrate=MLB_SCHEDULE_HYDRATE if hydrated else None)
+        schedule_by_date = split_schedule_by_date(schedule)
+        
+        snapshots = {}
+        date = start_date
+        while date <= end_date:
+            try:
+                standings = self.get_standings(date)
+            except Exception as e:
+                logger.error(f"Error fetching standings data for {date.strftime('%Y-%m-%d')}: {e}")
+                standings = {}
+            
+            date_schedule = schedule_by_date.get(date.strftime("%Y-%m-%d"), {"dates": []})
+            snapshots[date] = LeagueSnapshot(date, date_schedule, standings, hydrated=hydrated)
+            date += datetime.timedelta(days=1)
+            
+        return snapshots
+
+    def process_team_daily_data(self, team_code: str, date: Optional[datetime.date] = None,
+                                snapshot: Optional[LeagueSnapshot] = None,
+                                batting_lines: Optional[bool] = None) -> TeamDay:
         """
         Process daily data for a specific team.
         Returns a structured format with game results, standings, and roster information.
+        
+        If a league snapshot for the date is given, games and standings are sliced
+        from it instead of being fetched for this team alone. With a hydrated
+        snapshot, boxscores are only fetched when batting_lines is requested;
+        by default that follows the fetch mode.
         """
         date = date or datetime.date.today() - datetime.timedelta(days=1)  # Default to yesterday
         date_str = date.strftime("%Y-%m-%d")
@@ -67,162 +667,32 @@ class MLBDataFetcher:
         
         # If we're using mock mode, return demo data
         if self.use_mock:
-            logger.info(f"Using mock MLB data for {team_name} (demo mode)")
-            
-            # Get the existing data if available
-            team_dir = os.path.join(DATA_DIR, team_code)
-            file_path = os.path.join(team_dir, f"{date_str}.json")
-            
-            if os.path.exists(file_path):
-                try:
-                    with open(file_path, "r") as f:
-                        return json.load(f)
-                except:
-                    pass  # If file exists but can't be read, generate new mock data
-            
-            # Generate mock data
-            team_data = {
-                "team_code": team_code,
-                "team_name": team_name,
-                "date": date_str,
-                "games": [
-                    {
-                        "game_id": 12345,
-                        "status": "Final",
-                        "home_team": team_name,
-                        "away_team": "Visiting Team",
-                        "home_score": 8,
-                        "away_score": 3,
-                        "venue": "Home Stadium",
-                        "start_time": f"{date_str}T19:05:00Z",
-                        "home_hits": 12,
-                        "away_hits": 6,
-                        "notable_performances": [
-                            {
-                                "name": "Star Player 1",
-                                "team": team_name,
-                                "hr": 2,
-                                "rbi": 4,
-                                "hits": 3
-                            },
-                            {
-                                "name": "Star Player 2",
-                                "team": team_name,
-                                "hr": 1,
-                                "rbi": 2,
-                                "hits": 2
-                            }
-                        ]
-                    }
-                ],
-                "standings": {
-                    "wins": 5,
-                    "losses": 2,
-                    "division_rank": "1",
-                    "games_back": 0,
-                    "streak": "W3"
-                }
-            }
-            
-            # Save to file
-            os.makedirs(os.path.join(DATA_DIR, team_code), exist_ok=True)
-            with open(file_path, "w") as f:
-                json.dump(team_data, f, indent=2)
-                
-            return team_data
+            return load_or_create_mock_team_data(team_code, date_str)
         
         # Use the real API
-        schedule_data = self.get_schedule(date)
-        team_data = {
-            "team_code": team_code,
-            "team_name": team_name,
-            "date": date_str,
-            "games": [],
-            "standings": {},
-        }
+        if snapshot is None or snapshot.date != date:
+            snapshot = self.get_league_snapshot(date)
         
-        # Process games for this team
-        for date_data in schedule_data.get("dates", []):
-            for game in date_data.get("games", []):
-                away_team = game.get("teams", {}).get("away", {}).get("team", {})
-                home_team = game.get("teams", {}).get("home", {}).get("team", {})
-                
-                if (away_team.get("name") == team_name or home_team.get("name") == team_name):
-                    # This game involves our team
-                    game_id = game.get("gamePk")
-                    game_status = game.get("status", {}).get("abstractGameState")
-                    
-                    game_info = {
-                        "game_id": game_id,
-                        "status": game_status,
-                        "home_team": home_team.get("name"),
-                        "away_team": away_team.get("name"),
-                        "home_score": game.get("teams", {}).get("home", {}).get("score", 0),
-                        "away_score": game.get("teams", {}).get("away", {}).get("score", 0),
-                        "venue": game.get("venue", {}).get("name", ""),
-                        "start_time": game.get("gameDate", "")
-                    }
-                    
-                    # Add detailed boxscore data if game is finished
-                    if game_status == "Final":
-                        try:
-                            boxscore = self.get_game_boxscore(game_id)
-                            
-                            # Extract key stats like home runs, RBIs, pitching stats
-                            home_hr = 0
-                            away_hr = 0
-                            home_hits = boxscore.get("teams", {}).get("home", {}).get("teamStats", {}).get("batting", {}).get("hits", 0)
-                            away_hits = boxscore.get("teams", {}).get("away", {}).get("teamStats", {}).get("batting", {}).get("hits", 0)
-                            
-                            # Add notable performances
-                            notable_performances = []
-                            
-                            for side in ["home", "away"]:
-                                players = boxscore.get("teams", {}).get(side, {}).get("players", {})
-                                for player_id, player_data in players.items():
-                                    # Check for notable batting performances
-                                    batting_stats = player_data.get("stats", {}).get("batting", {})
-                                    if batting_stats.get("homeRuns", 0) > 0 or batting_stats.get("rbi", 0) > 2:
-                                        notable_performances.append({
-                                            "name": player_data.get("person", {}).get("fullName", ""),
-                                            "team": boxscore.get("teams", {}).get(side, {}).get("team", {}).get("name", ""),
-                                            "hr": batting_stats.get("homeRuns", 0),
-                                            "rbi": batting_stats.get("rbi", 0),
-                                            "hits": batting_stats.get("hits", 0)
-                                        })
-                            
-                            game_info["home_hits"] = home_hits
-                            game_info["away_hits"] = away_hits
-                            game_info["notable_performances"] = notable_performances
-                            
-                        except Exception as e:
-                            logger.error(f"Error fetching boxscore for game {game_id}: {e}")
-                    
-                    team_data["games"].append(game_info)
-        
-        # Get standings data
-        try:
-            standings = self.get_standings()
-            for division in standings.get("records", []):
-                for team_record in division.get("teamRecords", []):
-                    if team_record.get("team", {}).get("name") == team_name:
-                        team_data["standings"] = {
-                            "wins": team_record.get("wins", 0),
-                            "losses": team_record.get("losses", 0),
-                            "division_rank": team_record.get("divisionRank", ""),
-                            "games_back": team_record.get("gamesBack", 0),
-                            "streak": team_record.get("streak", {}).get("streakCode", "")
-                        }
-        except Exception as e:
-            logger.error(f"Error fetching standings data: {e}")
-            
-        # Save the data
-        team_dir = os.path.join(DATA_DIR, team_code)
-        os.makedirs(team_dir, exist_ok=True)
+        if batting_lines is None:
+            batting_lines = self.fetch_mode != "hydrated"
+        
+        # Slice games and standings data from the snapshot
+        team_id = self.get_team_registry().id_for(team_code)
+        team_data = snapshot_team_data(team_code, date_str, snapshot, team_id)
         
-        file_path = os.path.join(team_dir, f"{date_str}.json")
-        with open(file_path, "w") as f:
-            json.dump(team_data, f, indent=2)
+        # Add detailed boxscore data if a game is finished and neither the schedule
+        # nor the stat table covers it
+        for game_info in team_data["games"]:
+            if needs_boxscore(game_info, snapshot, batting_lines):
+                try:
+                    add_boxscore_summary(game_info, self.get_final_boxscore(game_info["game_id"]))
+                except Exception as e:
+                    logger.error(f"Error fetching boxscore for game {game_info['game_id']}: {e}")
+        
+        if snapshot.stat_table is not None:
+            apply_stat_table(team_data, snapshot.stat_table)
             
-        logger.info(f"Saved data for {team_name} to {file_path}")
-        return team_data
\ No newline at end of file
+        # Save the data
+        team_day = TeamDay.from_dict(team_data)
+        save_team_data(team_day)
+        return team_day
@@ -0,0 +1,203 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, Tuple, Any, Optional
+
+@dataclass(frozen=True, slots=True)
+class PlayerLine:
+    """A notable individual performance in a game."""
+    name: str
+    team: str
+    hr: int = 0
+    rbi: int = 0
+    hits: int = 0
+    decision: str = ""  # Pitching decision: "W", "L" or "SV"
+    ip: str = ""  # Innings pitched, e.g. "6.2"
+    k: int = 0  # Strikeouts pitched
+    er: int = 0  # Earned runs allowed
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PlayerLine":
+        return cls(
+            name=data.get("name", ""),
+            team=data.get("team", ""),
+            hr=data.get("hr", 0),
+            rbi=data.get("rbi", 0),
+            hits=data.get("hits", 0),
+            decision=data.get("decision", ""),
+            ip=data.get("ip", ""),
+            k=data.get("k", 0),
+            er=data.get("er", 0),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"name": self.name, "team": self.team, "hr": self.hr, "rbi": self.rbi, "hits": self.hits}
+        if self.decision:
+            data["decision"] = self.decision
+        if self.ip:
+            data.update({"ip": self.ip, "k": self.k, "er": self.er})
+        return data
+
+@dataclass(frozen=True, slots=True)
+class Game:
+    """A game involving the team, with boxscore details once it is Final."""
+    game_id: int
+    status: str
+    home_team: str
+    away_team: str
+    home_score: int = 0
+    away_score: int = 0
+    venue: str = ""
+    start_time: str = ""
+    home_hits: Optional[int] = None
+    away_hits: Optional[int] = None
+    notable_performances: Tuple[PlayerLine, ...] = ()
+    # Pitching decisions and probable pitchers from a hydrated schedule
+    winning_pitcher: str = ""
+    losing_pitcher: str = ""
+    save_pitcher: str = ""
+    probable_home_pitcher: str = ""
+    probable_away_pitcher: str = ""
+    # statsapi team ids; the names are statsapi's and can differ from the configured ones
+    home_team_id: Optional[int] = None
+    away_team_id: Optional[int] = None
+
+    @property
+    def is_final(self) -> bool:
+        return self.status == "Final"
+
+    def is_home_team(self, team_id: Optional[int], team_name: str = "") -> bool:
+        """Check whether a team is the home side, by id, or by name for data saved without ids."""
+        if team_id is not None and self.home_team_id is not None:
+            return self.home_team_id == team_id
+        return self.home_team == team_name
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Game":
+        decisions = data.get("decisions", {})
+        probable_pitchers = data.get("probable_pitchers", {})
+        return cls(
+            game_id=data.get("game_id"),
+            status=data.get("status", ""),
+            home_team=data.get("home_team", ""),
+            away_team=data.get("away_team", ""),
+            home_score=int(data.get("home_score", 0) or 0),
+            away_score=int(data.get("away_score", 0) or 0),
+            venue=data.get("venue", ""),
+            start_time=data.get("start_time", ""),
+            home_hits=data.get("home_hits"),
+            away_hits=data.get("away_hits"),
+            notable_performances=tuple(PlayerLine.from_dict(perf) for perf in data.get("notable_performances", [])),
+            winning_pitcher=decisions.get("winner", ""),
+            losing_pitcher=decisions.get("loser", ""),
+            save_pitcher=decisions.get("save", ""),
+            probable_home_pitcher=probable_pitchers.get("home", ""),
+            probable_away_pitcher=probable_pitchers.get("away", ""),
+            home_team_id=data.get("home_team_id"),
+            away_team_id=data.get("away_team_id"),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "game_id": self.game_id,
+            "status": self.status,
+            "home_team": self.home_team,
+            "away_team": self.away_team,
+            "home_score": self.home_score,
+            "away_score": self.away_score,
+            "venue": self.venue,
+            "start_time": self.start_time,
+        }
+        if self.home_team_id is not None or self.away_team_id is not None:
+            data["home_team_id"] = self.home_team_id
+            data["away_team_id"] = self.away_team_id
+        if self.home_hits is not None or self.away_hits is not None:
+            data["home_hits"] = self.home_hits
+            data["away_hits"] = self.away_hits
+        if self.notable_performances:
+            data["notable_performances"] = [perf.to_dict() for perf in self.notable_performances]
+        if self.winning_pitcher or self.losing_pitcher or self.save_pitcher:
+            data["decisions"] = {"winner": self.winning_pitcher, "loser": self.losing_pitcher, "save": self.save_pitcher}
+        if self.probable_home_pitcher or self.probable_away_pitcher:
+            data["probable_pitchers"] = {"home": self.probable_home_pitcher, "away": self.probable_away_pitcher}
+        return data
+
+@dataclass(frozen=True, slots=True)
+class StandingsRow:
+    """A team's record and place in its division."""
+    wins: int = 0
+    losses: int = 0
+    division_rank: str = ""
+    games_back: Any = 0  # statsapi reports "-" for the division leader
+    streak: str = ""
+
+    @property
+    def games_back_value(self) -> float:
+        """Games back as a number, 0 for the division leader."""
+        try:
+            return float(self.games_back) if self.games_back != "-" else 0.0
+        except (ValueError, TypeError):
+            return 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> Optional["StandingsRow"]:
+        if not data:
+            return None
+        return cls(
+            wins=data.get("wins", 0),
+            losses=data.get("losses", 0),
+            division_rank=data.get("division_rank", ""),
+            games_back=data.get("games_back", 0),
+            streak=data.get("streak", ""),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "wins": self.wins,
+            "losses": self.losses,
+            "division_rank": self.division_rank,
+            "games_back": self.games_back,
+            "streak": self.streak,
+        }
+
+@dataclass(frozen=True, slots=True)
+class TeamDay:
+    """Everything known about one team on one date.
+
+    Serialized to the same JSON layout as the data/{team}/{date}.json files.
+    """
+    team_code: str
+    team_name: str
+    date: str
+    games: Tuple[Game, ...] = ()
+    standings: Optional[StandingsRow] = None
+    league_leaders: Tuple[PlayerLine, ...] = ()  # The day's top performances across the league
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TeamDay":
+        return cls(
+            team_code=data.get("team_code", ""),
+            team_name=data.get("team_name", ""),
+            date=data.get("date", ""),
+            games=tuple(Game.from_dict(game) for game in data.get("games", [])),
+            standings=StandingsRow.from_dict(data.get("standings", {})),
+            league_leaders=tuple(PlayerLine.from_dict(perf) for perf in data.get("league_leaders", [])),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "team_code": self.team_code,
+            "team_name": self.team_name,
+            "date": self.date,
+            "games": [game.to_dict() for game in self.games],
+            "standings": self.standings.to_dict() if self.standings else {},
+        }
+        if self.league_leaders:
+            data["league_leaders"] = [perf.to_dict() for perf in self.league_leaders]
+        return data
+
+    @classmethod
+    def from_json(cls, text: str) -> "TeamDay":
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(",", ":"))
@@ -0,0 +1,168 @@
+import os
+import re
+import hashlib
+import sqlite3
+import datetime
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterator
+
+from config.config import NEWS_ARCHIVE_DB
+from utils.logger import get_logger
+from utils.news_dedup import split_news_items
+
+logger = get_logger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS news_items (
+    id INTEGER PRIMARY KEY,
+    team_code TEXT NOT NULL,
+    date TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT '',
+    headline TEXT NOT NULL DEFAULT '',
+    body TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    UNIQUE (team_code, date, content_hash)
+);
+CREATE INDEX IF NOT EXISTS news_items_team_date ON news_items (team_code, date);
+CREATE VIRTUAL TABLE IF NOT EXISTS news_fts USING fts5(
+    headline, body, content='news_items', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS news_items_insert AFTER INSERT ON news_items BEGIN
+    INSERT INTO news_fts (rowid, headline, body) VALUES (new.id, new.headline, new.body);
+END;
+CREATE TRIGGER IF NOT EXISTS news_items_delete AFTER DELETE ON news_items BEGIN
+    INSERT INTO news_fts (news_fts, rowid, headline, body) VALUES ('delete', old.id, old.headline, old.body);
+END;
+"""
+
+def parse_news_items(news: Any) -> List[Dict[str, str]]:
+    """Parse a team's news into items with a source, headline and body.
+
+    Articles keep their own fields. Summary paragraphs use a leading markdown
+    heading or bold lead-in as the headline, otherwise their first sentence.
+    """
+    if isinstance(news, list):
+        return [
+            {
+                "source": article.get("source", ""),
+                "headline": article.get("title", ""),
+                "body": article.get("description", ""),
+            }
+            for article in news if isinstance(article, dict)
+        ]
+
+    items = []
+    for paragraph in split_news_items(news):
+        # Drop citation markers like [1][2]
+        paragraph = re.sub(r"\s*\[\d+\]", "", paragraph).strip()
+        lines = paragraph.split("\n", 1)
+        heading = re.match(r"^(?:#+\s*|\*\*)(.+?):?(?:\*\*)?:?\s*$", lines[0])
+        if heading and len(lines) > 1:
+            headline, body = heading.group(1).strip(), lines[1].strip()
+        else:
+            headline = re.split(r"(?<=[.!?])\s", paragraph, maxsplit=1)[0][:200]
+            body = paragraph
+        items.append({"source": "Perplexity", "headline": headline, "body": body})
+    return items
+
+class NewsArchive:
+    """Searchable history of every team's news, backed by SQLite FTS5.
+
+    Each day's news is parsed into items (team, date, source, headline, body)
+    and indexed for full-text queries such as the last week of injury news
+    for a team. If the database cannot be set up, e.g. SQLite was built
+    without FTS5 or the file is locked or corrupt, the archive is disabled:
+    nothing is stored and searches return nothing.
+    """
+
+    def __init__(self, db_path: str = NEWS_ARCHIVE_DB):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.enabled = True
+        try:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            with self._connect() as connection:
+                connection.executescript(SCHEMA)
+        except (sqlite3.Error, OSError) as e:
+            logger.error(f"News archive {db_path} is unavailable, archiving is disabled: {e}")
+            self.enabled = False
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Open a connection that commits on success and is always closed."""
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        connection.row_factory = sqlite3.Row
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    def add_team_news(self, team_code: str, date: datetime.date, news: Any) -> int:
+        """Store a team's news for a date, replacing what was stored before.
+
+        Returns the number of items stored.
+        """
+        if not self.enabled:
+            return 0
+        date_str = date.strftime("%Y-%m-%d")
+        rows = []
+        for item in parse_news_items(news):
+            content_hash = hashlib.sha256(f"{item['headline']}\n{item['body']}".encode("utf-8")).hexdigest()
+            rows.append((team_code, date_str, item["source"], item["headline"], item["body"], content_hash))
+
+        with self._lock, self._connect() as connection:
+            connection.execute("DELETE FROM news_items WHERE team_code = ? AND date = ?", (team_code, date_str))
+            connection.executemany(
+                "INSERT OR IGNORE INTO news_items (team_code, date, source, headline, body, content_hash) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        logger.info(f"Archived {len(rows)} news items for {team_code} on {date_str}")
+        return len(rows)
+
+    def search(self, query: Optional[str] = None, team_code: Optional[str] = None,
+               since: Optional[datetime.date] = None, until: Optional[datetime.date] = None,
+               limit: int = 20) -> List[Dict[str, Any]]:
+        """Search archived news, newest first, ranked by relevance when a query is given.
+
+        The query uses FTS5 syntax, e.g. "injury OR injured" or "trade NEAR(deadline)".
+        """
+        if not self.enabled:
+            return []
+        conditions, params = [], []
+        if query:
+            conditions.append("news_fts MATCH ?")
+            params.append(query)
+        if team_code:
+            conditions.append("news_items.team_code = ?")
+            params.append(team_code)
+        if since:
+            conditions.append("news_items.date >= ?")
+            params.append(since.strftime("%Y-%m-%d"))
+        if until:
+            conditions.append("news_items.date <= ?")
+            params.append(until.strftime("%Y-%m-%d"))
+
+        sql = "SELECT news_items.team_code, news_items.date, news_items.source, news_items.headline, news_items.body FROM news_items"
+        if query:
+            sql += " JOIN news_fts ON news_fts.rowid = news_items.id"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY news_items.date DESC" + (", bm25(news_fts)" if query else ", news_items.id") + " LIMIT ?"
+        params.append(limit)
+
+        with self._connect() as connection:
+            return [dict(row) for row in connection.execute(sql, params)]
+
+    def recent(self, team_code: str, before: datetime.date, days: int = 7,
+               query: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return a team's archived news from the days before a date."""
+        return self.search(
+            query=query,
+            team_code=team_code,
+            since=before - datetime.timedelta(days=days),
+            until=before - datetime.timedelta(days=1),
+            limit=limit
+        )
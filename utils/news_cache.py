@@ -0,0 +1,100 @@
+import os
+import json
+import time
+import hashlib
+import datetime
+from typing import Dict, Any, Optional
+
+from config.config import DATA_DIR, NEWS_CACHE_TTL, NEWS_NEGATIVE_CACHE_TTL
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class NewsCache:
+    """Team news files with freshness metadata.
+
+    News is kept in data/{team}/{date}_news.txt as before, with a sidecar
+    data/{team}/{date}_news.meta.json recording when it was fetched and a hash
+    of its content. Non-empty news is served for NEWS_CACHE_TTL seconds, while
+    empty or failed results expire after NEWS_NEGATIVE_CACHE_TTL so they are
+    retried soon instead of being reused.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, ttl: float = NEWS_CACHE_TTL,
+                 negative_ttl: float = NEWS_NEGATIVE_CACHE_TTL):
+        self.data_dir = data_dir
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+    def news_path(self, team_code: str, date: datetime.date) -> str:
+        return os.path.join(self.data_dir, team_code, f"{date.strftime('%Y-%m-%d')}_news.txt")
+
+    def _meta_path(self, team_code: str, date: datetime.date) -> str:
+        return os.path.join(self.data_dir, team_code, f"{date.strftime('%Y-%m-%d')}_news.meta.json")
+
+    @staticmethod
+    def content_hash(news: Any) -> str:
+        return hashlib.sha256(json.dumps(news, sort_keys=True).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def is_empty(news: Any) -> bool:
+        return not news or (isinstance(news, str) and not news.strip())
+
+    def _metadata(self, team_code: str, date: datetime.date) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._meta_path(team_code, date), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            pass
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable news metadata for {team_code}: {e}")
+
+        # News files written before the metadata existed are aged by mtime
+        news_path = self.news_path(team_code, date)
+        if not os.path.exists(news_path):
+            return None
+        try:
+            with open(news_path, "r") as f:
+                news = json.load(f)
+        except (ValueError, OSError):
+            return None
+        return {"fetched_at": os.path.getmtime(news_path), "hash": self.content_hash(news), "empty": self.is_empty(news)}
+
+    def is_fresh(self, team_code: str, date: datetime.date) -> bool:
+        """Check whether a team's news for a date can be reused without refetching."""
+        meta = self._metadata(team_code, date)
+        if meta is None:
+            return False
+        ttl = self.negative_ttl if meta.get("empty") else self.ttl
+        return time.time() - meta.get("fetched_at", 0) < ttl
+
+    def get(self, team_code: str, date: datetime.date) -> Optional[Any]:
+        """Return a team's cached news if it is fresh, otherwise None."""
+        if not self.is_fresh(team_code, date):
+            return None
+        try:
+            with open(self.news_path(team_code, date), "r") as f:
+                return json.load(f)
+        except (ValueError, OSError):
+            return None
+
+    def store(self, team_code: str, date: datetime.date, news: Any) -> str:
+        """Save a team's news and its metadata, and return the news file path.
+
+        The news file is only rewritten when its content changed, so files
+        keyed on it stay valid when a refetch returns the same news.
+        """
+        news_path = self.news_path(team_code, date)
+        os.makedirs(os.path.dirname(news_path), exist_ok=True)
+
+        content_hash = self.content_hash(news)
+        previous = self._metadata(team_code, date)
+        if previous is None or previous.get("hash") != content_hash or not os.path.exists(news_path):
+            with open(news_path, "w") as f:
+                json.dump(news, f, indent=2)
+        else:
+            logger.debug(f"News for {team_code} is unchanged")
+
+        with open(self._meta_path(team_code, date), "w") as f:
+            json.dump({"fetched_at": time.time(), "hash": content_hash, "empty": self.is_empty(news)}, f)
+        return news_path
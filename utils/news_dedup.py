@@ -0,0 +1,237 @@
+import os
+import re
+import json
+import hashlib
+import datetime
+import tempfile
+import threading
+from typing import Dict, List, Any, Optional
+
+import numpy as np
+
+from config.config import (
+    MLB_TEAMS, NEWS_INDEX_DIR, NEWS_DEDUP_THRESHOLD, NEWS_MINHASH_PERMUTATIONS, NEWS_MINHASH_BANDS
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Mersenne prime 2^31 - 1 keeps (a * x + b) within 64 bits for 32-bit shingle hashes
+MINHASH_PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3  # Words per shingle; news paragraphs are short
+
+def split_news_items(news: Any) -> List[str]:
+    """Split a team's news into items: paragraphs of a summary, or articles."""
+    if isinstance(news, list):
+        items = [f"{article.get('title', '')}: {article.get('description', '')}" for article in news if isinstance(article, dict)]
+    elif isinstance(news, str):
+        items = re.split(r"\n\s*\n", news)
+    else:
+        items = []
+    return [item.strip() for item in items if item.strip()]
+
+class MinHasher:
+    """MinHash signatures of word shingles, for estimating Jaccard similarity."""
+
+    def __init__(self, num_permutations: int = NEWS_MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = np.random.RandomState(seed)
+        self.a = rng.randint(1, MINHASH_PRIME, size=num_permutations, dtype=np.int64)
+        self.b = rng.randint(0, MINHASH_PRIME, size=num_permutations, dtype=np.int64)
+
+    @staticmethod
+    def shingles(text: str) -> np.ndarray:
+        words = re.findall(r"[a-z0-9']+", text.lower())
+        if len(words) < SHINGLE_SIZE:
+            grams = [" ".join(words)] if words else []
+        else:
+            grams = {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+        return np.array(
+            [int.from_bytes(hashlib.blake2b(gram.encode("utf-8"), digest_size=4).digest(), "little") for gram in grams],
+            dtype=np.int64
+        )
+
+    def signature(self, text: str) -> np.ndarray:
+        shingles = self.shingles(text)
+        if shingles.size == 0:
+            return np.full(self.a.size, MINHASH_PRIME, dtype=np.int64)
+        # One row per permutation, one column per shingle
+        hashes = (np.outer(self.a, shingles) + self.b[:, None]) % MINHASH_PRIME
+        return hashes.min(axis=1)
+
+    @staticmethod
+    def similarity(first: np.ndarray, second: np.ndarray) -> float:
+        return float(np.mean(first == second))
+
+class NewsIndex:
+    """Deduplicated news items of every team for one date.
+
+    Each paragraph (or article) is fingerprinted with MinHash and stored once;
+    near-identical items from different teams are linked to the same entry.
+    Candidates are found with locality-sensitive hashing over signature bands
+    and confirmed by their estimated Jaccard similarity.
+    """
+
+    # Days before the latest loaded date whose indexes stay in memory: the
+    # watcher renders yesterday's late games, which look back one more day
+    KEEP_DAYS = 2
+
+    _instances: Dict[datetime.date, "NewsIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, date: datetime.date, index_dir: str = NEWS_INDEX_DIR):
+        self.date = date
+        self.path = os.path.join(index_dir, f"{date.strftime('%Y-%m-%d')}.json")
+        self.hasher = MinHasher()
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.team_items: Dict[str, List[str]] = {}
+        # Each team's own wording of its items, which may differ from the
+        # stored text of an item first reported for another team
+        self.team_texts: Dict[str, Dict[str, str]] = {}
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._buckets: Dict[tuple, List[str]] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_date(cls, date: datetime.date) -> "NewsIndex":
+        """Return the shared index of a date, loading it from disk on first use.
+
+        Loading a new date evicts the indexes of dates more than
+        KEEP_DAYS before it, so long-running processes keep only the dates
+        still being rendered and the previous episodes they look back on.
+        Evicted indexes are saved and are loaded again if needed.
+        """
+        with cls._instances_lock:
+            if date not in cls._instances:
+                oldest = date - datetime.timedelta(days=cls.KEEP_DAYS)
+                for cached_date in [cached_date for cached_date in cls._instances if cached_date < oldest]:
+                    del cls._instances[cached_date]
+                cls._instances[date] = cls.load(date)
+            return cls._instances[date]
+
+    @classmethod
+    def load(cls, date: datetime.date, index_dir: str = NEWS_INDEX_DIR) -> "NewsIndex":
+        index = cls(date, index_dir)
+        try:
+            with open(index.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return index
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable news index {index.path}: {e}")
+            return index
+
+        index.team_items = data.get("team_items", {})
+        index.team_texts = data.get("team_texts", {})
+        for item_id, item in data.get("items", {}).items():
+            index._add_item(item_id, item["text"], np.array(item["signature"], dtype=np.int64), item["teams"])
+        return index
+
+    def save(self) -> None:
+        """Write the index atomically so a crash never leaves a partial file."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump({
+                    "date": self.date.strftime("%Y-%m-%d"),
+                    "items": {
+                        item_id: {**item, "signature": self._signatures[item_id].tolist()}
+                        for item_id, item in self.items.items()
+                    },
+                    "team_items": self.team_items,
+                    "team_texts": self.team_texts,
+                }, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _bands(self, signature: np.ndarray) -> List[tuple]:
+        rows = signature.size // NEWS_MINHASH_BANDS
+        return [(band, tuple(signature[band * rows:(band + 1) * rows])) for band in range(NEWS_MINHASH_BANDS)]
+
+    def _add_item(self, item_id: str, text: str, signature: np.ndarray, teams: List[str]) -> None:
+        self.items[item_id] = {"text": text, "teams": teams}
+        self._signatures[item_id] = signature
+        for band in self._bands(signature):
+            self._buckets.setdefault(band, []).append(item_id)
+
+    def find_similar(self, signature: np.ndarray) -> Optional[str]:
+        """Return the id of the most similar stored item above the threshold."""
+        candidates = {item_id for band in self._bands(signature) for item_id in self._buckets.get(band, [])}
+        best_id, best_similarity = None, NEWS_DEDUP_THRESHOLD
+        for item_id in candidates:
+            similarity = MinHasher.similarity(signature, self._signatures[item_id])
+            if similarity >= best_similarity:
+                best_id, best_similarity = item_id, similarity
+        return best_id
+
+    def add_team_news(self, team_code: str, news: Any) -> List[str]:
+        """Index a team's news, linking it to existing items where they match.
+
+        Returns the item ids of the team, in the order of its news.
+        """
+        with self._lock:
+            # A refetch replaces the team's previous links
+            for item_id in self.team_items.pop(team_code, []):
+                if team_code in self.items.get(item_id, {}).get("teams", []):
+                    self.items[item_id]["teams"].remove(team_code)
+
+            item_ids = []
+            texts = {}
+            for text in split_news_items(news):
+                signature = self.hasher.signature(text)
+                item_id = self.find_similar(signature)
+                if item_id is None:
+                    item_id = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+                    self._add_item(item_id, text, signature, [])
+                if team_code not in self.items[item_id]["teams"]:
+                    self.items[item_id]["teams"].append(team_code)
+                if item_id not in item_ids:
+                    item_ids.append(item_id)
+                    texts[item_id] = text
+
+            self.team_items[team_code] = item_ids
+            self.team_texts[team_code] = texts
+            shared = sum(1 for item_id in item_ids if len(self.items[item_id]["teams"]) > 1)
+            logger.info(f"Indexed {len(item_ids)} news items for {team_code} ({shared} shared with other teams)")
+            self.save()
+            return item_ids
+
+    def has_team(self, team_code: str) -> bool:
+        return bool(self.team_items.get(team_code))
+
+    def covered_by(self, team_code: str, text: str) -> bool:
+        """Check whether a team's news in this index already covered a story."""
+        signature = self.hasher.signature(text)
+        item_id = self.find_similar(signature)
+        return item_id is not None and team_code in self.items[item_id]["teams"]
+
+    def render_team_news(self, team_code: str, previous: Optional["NewsIndex"] = None) -> str:
+        """Render a team's deduplicated news for a prompt.
+
+        Stories the team's previous episode already covered are left out, and
+        stories shared with other teams are marked as such.
+        """
+        lines = []
+        skipped = 0
+        texts = self.team_texts.get(team_code, {})
+        for item_id in self.team_items.get(team_code, []):
+            item = self.items[item_id]
+            # The team's own wording and sorted teams keep the digest independent
+            # of the order teams were indexed in
+            text = texts.get(item_id, item["text"])
+            if previous is not None and previous.covered_by(team_code, text):
+                skipped += 1
+                continue
+            others = [MLB_TEAMS.get(code, code) for code in sorted(item["teams"]) if code != team_code]
+            if others:
+                lines.append(f"{text} (also reported for the {', '.join(others)})")
+            else:
+                lines.append(text)
+
+        if skipped:
+            stories = "story" if skipped == 1 else "stories"
+            lines.append(f"({skipped} {stories} already covered in the previous episode left out.)")
+        return "\n\n".join(lines)
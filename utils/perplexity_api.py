@@ -2,25 +2,218 @@ import os
 import json
 import datetime
 import re
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator, Union
 import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
+import email.utils
+from tenacity import retry, stop_after_attempt, wait_exponential, RetryCallState
 
-from config.config import PERPLEXITY_API_BASE_URL, PERPLEXITY_API_KEY, DATA_DIR, NEWS_ARTICLES_COUNT, MLB_TEAMS
+from config.config import (
+    PERPLEXITY_API_BASE_URL, PERPLEXITY_API_KEY, PERPLEXITY_STREAMING, DATA_DIR, NEWS_ARTICLES_COUNT, MLB_TEAMS
+)
 from utils.logger import get_logger
+from utils.news_cache import NewsCache
 
 logger = get_logger(__name__)
 
+# Structured response requested for batched news: one summary per team
+NEWS_BATCH_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "teams": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "team": {"type": "string"},
+                    "summary": {"type": "string"}
+                },
+                "required": ["team", "summary"]
+            }
+        }
+    },
+    "required": ["teams"]
+}
+
+NEWS_SYSTEM_PROMPT = "You are a sports news reporter specializing in Major League Baseball."
+
+def team_news_payload(query: str) -> Dict[str, Any]:
+    """Build the chat completion request for one team's news."""
+    return {
+        "model": "sonar-reasoning-pro",
+        "messages": [
+            {
+                "role": "system",
+                "content": NEWS_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"Generate a summary of today's sports opinion pieces about the {query}. Make sure the news sources you use are only from today, {datetime.date.today().strftime('%B %d %Y')}."
+            }
+        ],
+    }
+
+def group_news_payload(team_names: List[str]) -> Dict[str, Any]:
+    """Build the structured chat completion request for several teams' news."""
+    return {
+        "model": "sonar-reasoning-pro",
+        "messages": [
+            {
+                "role": "system",
+                "content": NEWS_SYSTEM_PROMPT
+            },
+            {
+                "role": "user",
+                "content": f"For each of these MLB teams: {', '.join(team_names)}, generate a summary of today's sports opinion pieces and recent news about the team. Make sure the news sources you use are only from today, {datetime.date.today().strftime('%B %d %Y')}. Return one entry per team, using the team names exactly as given."
+            }
+        ],
+        "response_format": {
+            "type": "json_schema",
+            "json_schema": {"schema": NEWS_BATCH_SCHEMA}
+        },
+    }
+
+def response_content(response: Dict[str, Any]) -> str:
+    """Extract the message content of a chat completion, without the <think> section."""
+    choices = response.get("choices", [])
+    if not choices:
+        return ""
+    content = choices[0].get("message", {}).get("content", "")
+    return re.sub(r"<think>.*?</think>", "", content, flags=re.DOTALL).strip()
+
+def parse_group_news(content: str, team_names: List[str]) -> Dict[str, str]:
+    """Split a batched news response into summaries keyed by the requested team names."""
+    # Reasoning models may wrap the JSON in prose or a code fence
+    match = re.search(r"\{.*\}", content, flags=re.DOTALL)
+    entries = json.loads(match.group(0)).get("teams", []) if match else []
+    names_by_key = {team_name.lower(): team_name for team_name in team_names}
+    
+    news = {}
+    for entry in entries:
+        team_name = names_by_key.get(str(entry.get("team", "")).strip().lower())
+        if team_name and entry.get("summary"):
+            news[team_name] = entry["summary"].strip()
+    return news
+
+class ThinkStripper:
+    """Remove <think>...</think> sections from text that arrives in pieces.
+    
+    Reasoning text is dropped as it streams in instead of being accumulated,
+    and visible text is returned as soon as it is known not to be part of a
+    tag, even when a tag is split across chunks.
+    """
+    
+    OPEN_TAG = "<think>"
+    CLOSE_TAG = "</think>"
+    
+    def __init__(self):
+        self.in_think = False
+        self.started = False
+        self._pending = ""
+    
+    def feed(self, text: str) -> str:
+        """Consume a chunk and return the visible text it completes."""
+        buffer = self._pending + text
+        visible = []
+        while buffer:
+            tag = self.CLOSE_TAG if self.in_think else self.OPEN_TAG
+            index = buffer.find(tag)
+            if index >= 0:
+                if not self.in_think:
+                    visible.append(buffer[:index])
+                buffer = buffer[index + len(tag):]
+                self.in_think = not self.in_think
+                continue
+            
+            # Hold back a trailing partial tag until the next chunk
+            keep = self._partial_tag_length(buffer, tag)
+            if not self.in_think:
+                visible.append(buffer[:len(buffer) - keep])
+            buffer = buffer[len(buffer) - keep:]
+            break
+        
+        self._pending = buffer
+        return self._emit("".join(visible))
+    
+    def flush(self) -> str:
+        """Return any held-back visible text at the end of the stream."""
+        text, self._pending = ("" if self.in_think else self._pending), ""
+        return self._emit(text)
+    
+    def _emit(self, text: str) -> str:
+        # Drop the whitespace between the think section and the summary
+        if not self.started:
+            text = text.lstrip()
+            self.started = bool(text)
+        return text
+    
+    @staticmethod
+    def _partial_tag_length(buffer: str, tag: str) -> int:
+        for length in range(min(len(tag) - 1, len(buffer)), 0, -1):
+            if buffer.endswith(tag[:length]):
+                return length
+        return 0
+
+def stream_deltas(lines: Iterator[str]) -> Iterator[str]:
+    """Yield the content deltas of a server-sent chat completion stream."""
+    for line in lines:
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[len("data:"):].strip()
+        if data == "[DONE]":
+            break
+        choices = json.loads(data).get("choices", [])
+        if choices:
+            content = choices[0].get("delta", {}).get("content")
+            if content:
+                yield content
+
+class wait_retry_after:
+    """Tenacity wait that honors a rate-limited response's Retry-After header.
+    
+    Falls back to the given wait strategy when the failure carries no
+    Retry-After, and never waits longer than max_wait seconds.
+    """
+    
+    def __init__(self, fallback, max_wait: float = 120):
+        self.fallback = fallback
+        self.max_wait = max_wait
+    
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        response = getattr(exception, "response", None)
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            delay = self._parse(retry_after)
+            if delay is not None:
+                logger.warning(f"Perplexity API asked to retry after {delay:.0f} seconds")
+                return min(delay, self.max_wait)
+        return self.fallback(retry_state)
+    
+    @staticmethod
+    def _parse(retry_after: str) -> Optional[float]:
+        """Parse Retry-After as delay seconds or an HTTP date."""
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_at = email.utils.parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, (retry_at - datetime.datetime.now(retry_at.tzinfo)).total_seconds())
+
 class PerplexityNewsFetcher:
     def __init__(self):
         self.base_url = PERPLEXITY_API_BASE_URL
         self.api_key = PERPLEXITY_API_KEY
         self.session = requests.Session()
+        self.news_cache = NewsCache()
+        # Stream completions so the <think> section is dropped as it arrives
+        self.streaming = PERPLEXITY_STREAMING
         
         # Check if we're using a demo key
         self.use_mock = not self.api_key or self.api_key == "sample_perplexity_api_key"
         
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def _make_request(self, query: str) -> Dict[str, Any]:
         """Make a request to the Perplexity API with retries."""
         # If using mock mode, we're not making actual API calls
@@ -28,26 +221,18 @@ class PerplexityNewsFetcher:
             # Return empty response for mock
             return {"answer": "", "web_search": []}
             
+        payload = team_news_payload(query)
+        return self._post_chat_completion(payload)
+
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)))
+    def _post_chat_completion(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Post a chat completion request to the Perplexity API with retries."""
         url = f"{self.base_url}/chat/completions"
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
-        payload = {
-            "model": "sonar-reasoning-pro",
-            "messages": [
-                {
-                    "role": "system",
-                    "content": "You are a sports news reporter specializing in Major League Baseball."
-                },
-                {
-                    "role": "user",
-                    "content": f"Generate a summary of today's sports opinion pieces about the {query}. Make sure the news sources you use are only from today, {datetime.date.today().strftime('%B %d %Y')}."
-                }
-            ],
-        }
-        
         try:
             response = self.session.post(url, headers=headers, json=payload)
             response.raise_for_status()
@@ -56,8 +241,45 @@ class PerplexityNewsFetcher:
             logger.error(f"Error fetching from Perplexity API: {e}")
             raise
 
-    def get_team_news(self, team_name: str, days: int = 1) -> List[Dict[str, Any]]:
-        """Get news for a specific team over the last few days."""
+    def _stream_chat_completion(self, payload: Dict[str, Any]) -> Iterator[str]:
+        """Stream a chat completion and yield the visible text as it arrives.
+        
+        The <think> section is discarded incrementally, so the summary is
+        yielded as soon as it begins.
+        """
+        url = f"{self.base_url}/chat/completions"
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+            "Accept": "text/event-stream"
+        }
+        
+        stripper = ThinkStripper()
+        with self.session.post(url, headers=headers, json={**payload, "stream": True}, stream=True) as response:
+            response.raise_for_status()
+            for delta in stream_deltas(response.iter_lines(decode_unicode=True)):
+                text = stripper.feed(delta)
+                if text:
+                    yield text
+        text = stripper.flush()
+        if text:
+            yield text
+
+    @retry(stop=stop_after_attempt(3), wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)))
+    def _stream_chat_content(self, payload: Dict[str, Any]) -> str:
+        """Stream a chat completion with retries and return its visible text."""
+        try:
+            return "".join(self._stream_chat_completion(payload)).strip()
+        except requests.RequestException as e:
+            logger.error(f"Error streaming from Perplexity API: {e}")
+            raise
+
+    def get_team_news(self, team_name: str, days: int = 1) -> Union[str, List[Dict[str, Any]]]:
+        """Get news for a specific team over the last few days.
+        
+        Returns the summary text from the API, sample articles in mock mode,
+        or an empty list if the request fails.
+        """
         # If we're in mock mode, return sample news data
         if self.use_mock:
             logger.info(f"Using mock news data for {team_name} (demo mode)")
@@ -103,32 +325,67 @@ class PerplexityNewsFetcher:
         search_query = f"{team_name} MLB baseball recent news"
         
         try:
-            response = self._make_request(search_query)
-            
-            # Extract content from response
-            raw_content = ""
-            choices = response.get("choices", [])
-            
-            if choices and len(choices) > 0:
-                # Extract content from message
-                content = choices[0].get("message", {}).get("content", "")
+            if self.streaming:
+                raw_content = self._stream_chat_content(team_news_payload(search_query))
+            else:
+                response = self._make_request(search_query)
                 
-                # Remove the <think> section if present
-                if "<think>" in content and "</think>" in content:
-                    # Extract content outside of <think> tags
-                    pattern = r"<think>.*?</think>"
-                    # Remove the thinking section, preserving content outside of it
-                    raw_content = re.sub(pattern, "", content, flags=re.DOTALL).strip()
-                else:
-                    # If no think tags, use the whole content
-                    raw_content = content
+                # Extract content from the message, without the <think> section
+                raw_content = response_content(response)
             
             return raw_content
         except Exception as e:
             logger.error(f"Error fetching news for {team_name}: {e}")
             return []
 
-    def fetch_and_save_team_news(self, team_code: str, date: Optional[datetime.date] = None) -> List[Dict[str, Any]]:
+    def get_group_news(self, team_names: List[str]) -> Dict[str, str]:
+        """Get news for several teams (a division or a matchup) with a single request.
+        
+        The response is requested as JSON with one summary per team and split by
+        team name. Teams missing from the response are fetched individually.
+        """
+        if self.use_mock or len(team_names) == 1:
+            return {team_name: self.get_team_news(team_name) for team_name in team_names}
+        
+        news = {}
+        try:
+            payload = group_news_payload(team_names)
+            if self.streaming:
+                content = self._stream_chat_content(payload)
+            else:
+                content = response_content(self._post_chat_completion(payload))
+            news = parse_group_news(content, team_names)
+        except Exception as e:
+            logger.error(f"Error fetching news for {', '.join(team_names)}: {e}")
+        
+        missing = [team_name for team_name in team_names if team_name not in news]
+        if missing:
+            logger.warning(f"Batched news response missed {', '.join(missing)}, fetching individually")
+            for team_name in missing:
+                news[team_name] = self.get_team_news(team_name)
+        return news
+
+    def fetch_and_save_group_news(self, team_codes: List[str], date: Optional[datetime.date] = None) -> Dict[str, Any]:
+        """Fetch news for a group of teams in one request and save each team's file."""
+        date = date or datetime.date.today()
+        team_names = {team_code: MLB_TEAMS.get(team_code) for team_code in team_codes}
+        
+        logger.info(f"Fetching batched news for {', '.join(team_codes)} on {date.strftime('%Y-%m-%d')}")
+        news = self.get_group_news(list(team_names.values()))
+        
+        return {
+            team_code: self.save_team_news(team_code, date, news.get(team_name, ""))
+            for team_code, team_name in team_names.items()
+        }
+
+    def save_team_news(self, team_code: str, date: datetime.date, articles: Any) -> Any:
+        """Save a team's news to its news file through the news cache."""
+        news_file_path = self.news_cache.store(team_code, date, articles)
+        
+        logger.info(f"Saved {len(articles)} news articles for {MLB_TEAMS.get(team_code)} to {news_file_path}")
+        return articles
+
+    def fetch_and_save_team_news(self, team_code: str, date: Optional[datetime.date] = None) -> Union[str, List[Dict[str, Any]]]:
         """Fetch and save news for a specific team."""
         date = date or datetime.date.today()
         date_str = date.strftime("%Y-%m-%d")
@@ -140,12 +397,4 @@ class PerplexityNewsFetcher:
         articles = self.get_team_news(team_name)
         
         # Save to file
-        team_dir = os.path.join(DATA_DIR, team_code)
-        os.makedirs(team_dir, exist_ok=True)
-        
-        news_file_path = os.path.join(team_dir, f"{date_str}_news.txt")
-        with open(news_file_path, "w") as f:
-            json.dump(articles, f, indent=2)
-            
-        logger.info(f"Saved {len(articles)} news articles for {team_name} to {news_file_path}")
-        return articles
\ No newline at end of file
+        return self.save_team_news(team_code, date, articles)
\ No newline at end of file
@@ -1,14 +1,20 @@
 import os
+import asyncio
 import datetime
 from typing import List, Dict, Any, Optional
 import concurrent.futures
 from pydantic import BaseModel
 
-from config.config import MLB_TEAMS
+from config.config import MLB_TEAMS, MLB_DIVISIONS, NEWS_BATCH_MODE, SCRIPT_STREAMING
 from utils.logger import get_logger
-from utils.mlb_api import MLBDataFetcher
+from utils.mlb_api import MLBDataFetcher, LeagueSnapshot
+from utils.async_mlb_api import AsyncMLBDataFetcher
 from utils.perplexity_api import PerplexityNewsFetcher
+from utils.async_perplexity_api import AsyncPerplexityNewsFetcher
+from utils.news_dedup import NewsIndex
+from utils.news_archive import NewsArchive
 from utils.anthropic_generator import ScriptGenerator
+from utils.script_batch import BatchScriptGenerator
 from utils.google_wavenet_tts import GoogleWavenetTTS
 from utils.podbean_distributor import PodbeanDistributor
 
@@ -36,12 +42,14 @@ class TeamPodcastResult(BaseModel):
 class PodcastProcessor:
     """Main processor for generating team podcasts."""
     
-    def __init__(self):
+    def __init__(self, force_regenerate: bool = False):
         self.mlb_data = MLBDataFetcher()
         self.perplexity_api = PerplexityNewsFetcher()
-        self.script_generator = ScriptGenerator()
+        self.script_generator = ScriptGenerator(force_regenerate=force_regenerate)
         self.tts = GoogleWavenetTTS()
         self.distributor = PodbeanDistributor()
+        self.news_archive = NewsArchive()
+        self.stream_scripts = SCRIPT_STREAMING
         
     @staticmethod
     def fix_ssml_for_long_audio_api(ssml_text: str) -> str:
@@ -130,8 +138,13 @@ class PodcastProcessor:
         
         return ssml_text
     
-    def process_team(self, team_code: str, date: Optional[datetime.date] = None, distribute: bool = True) -> TeamPodcastResult:
-        """Process a single team's podcast."""
+    def process_team(self, team_code: str, date: Optional[datetime.date] = None, distribute: bool = True,
+                     snapshot: Optional[LeagueSnapshot] = None) -> TeamPodcastResult:
+        """Process a single team's podcast.
+        
+        A league snapshot shared across teams can be passed to avoid refetching
+        the schedule and standings for this team.
+        """
         date = date or datetime.date.today()
         date_str = date.strftime("%Y-%m-%d")
         team_name = MLB_TEAMS.get(team_code)
@@ -145,67 +158,16 @@ class PodcastProcessor:
         )
         
         try:
-            # Step 1: Fetch MLB Data
-            team_data = self.mlb_data.process_team_daily_data(team_code, date)
-            result.data_file = os.path.join("data", team_code, f"{date_str}.json")
+            self._prepare_team(result, team_code, date, snapshot)
             
-            # Step 2: Fetch News Data
-            news_file_path = os.path.join("data", team_code, f"{date_str}_news.txt")
-            result.news_file = news_file_path
-            
-            if os.path.exists(news_file_path):
-                logger.info(f"News file for {team_name} on {date_str} already exists. Using existing file.")
-                # Load existing news data if needed
-                with open(news_file_path, 'r') as f:
-                    news_data = f.read()
+            if self.stream_scripts and self._stream_team_script(result, team_code, date):
+                self._distribute_team(result, distribute)
             else:
-                logger.info(f"Fetching news data for {team_name} on {date_str}")
-                news_data = self.perplexity_api.fetch_and_save_team_news(team_code, date)
-            
-            # Step 3: Generate Script
-            script = self.script_generator.generate_and_save_script(team_code, date)
-            result.script_file = os.path.join("scripts", team_code, f"{date_str}.txt")
-            
-            # Step 4: Generate Audio
-            audio_file = self.tts.generate_and_save_audio(team_code, date)
-            if audio_file:
-                result.audio_file = audio_file
-                result.success = True
-                
-                # Step 5: Distribute to Podbean
-                if result.success and result.audio_file and distribute:
-                    logger.info(f"Distributing podcast for {team_name} to Podbean")
-                    
-                    # Load script content for episode description
-                    script_content = ""
-                    if os.path.exists(result.script_file):
-                        with open(result.script_file, 'r') as f:
-                            script_content = f.read()
-                    
-                    # Prepare metadata for Podbean
-                    metadata = {
-                        "title": f"{team_name} Daily Update - {date_str}",
-                        "description": script_content[:1000] if script_content else f"Daily update for {team_name}",
-                        "tags": ["MLB", "baseball", "sports", team_code, team_name],
-                        "category": "Sports & Recreation"
-                    }
-                    
-                    # Distribute the podcast
-                    distribution_success, podbean_url = self.distributor.distribute_podcast(
-                        result.audio_file, metadata
-                    )
-                    
-                    if distribution_success and podbean_url:
-                        result.podbean_url = podbean_url
-                        result.distribution_success = True
-                        logger.info(f"Successfully distributed {team_name} podcast to Podbean: {podbean_url}")
-                    else:
-                        logger.error(f"Failed to distribute {team_name} podcast to Podbean")
-                elif result.success and not distribute:
-                    logger.info(f"Skipping Podbean distribution for {team_name} (--no-distribute flag set)")
+                # Step 3: Generate Script
+                script = self.script_generator.generate_and_save_script(team_code, date)
+                result.script_file = os.path.join("scripts", team_code, f"{date_str}.txt")
                 
-            else:
-                result.error = "Failed to generate audio file"
+                self._publish_team(result, distribute)
                 
         except Exception as e:
             logger.error(f"Error processing {team_name}: {str(e)}")
@@ -214,50 +176,399 @@ class PodcastProcessor:
             
         return result
     
-    def process_all_teams(self, date: Optional[datetime.date] = None, max_workers: int = 5, distribute: bool = True) -> List[TeamPodcastResult]:
-        """Process podcasts for all MLB teams using parallel processing."""
+    def _prepare_team(self, result: TeamPodcastResult, team_code: str, date: datetime.date,
+                      snapshot: Optional[LeagueSnapshot] = None) -> TeamPodcastResult:
+        """Fetch a team's MLB data and news, the inputs of its script."""
+        date_str = date.strftime("%Y-%m-%d")
+        team_name = MLB_TEAMS.get(team_code)
+        
+        # Step 1: Fetch MLB Data
+        team_data = self.mlb_data.process_team_daily_data(team_code, date, snapshot=snapshot)
+        result.data_file = os.path.join("data", team_code, f"{date_str}.json")
+        
+        # Step 2: Fetch News Data
+        news_file_path = os.path.join("data", team_code, f"{date_str}_news.txt")
+        result.news_file = news_file_path
+        
+        news_data = self.perplexity_api.news_cache.get(team_code, date)
+        if news_data is not None:
+            logger.info(f"News for {team_name} on {date_str} is cached and fresh. Using existing file.")
+        else:
+            logger.info(f"Fetching news data for {team_name} on {date_str}")
+            news_data = self.perplexity_api.fetch_and_save_team_news(team_code, date)
+        
+        # Link the team's news to stories already seen for other teams; the
+        # index only shapes the prompt, so a failure must not cost the episode
+        try:
+            NewsIndex.for_date(date).add_team_news(team_code, news_data)
+        except Exception as e:
+            logger.error(f"Error indexing news for {team_name}: {str(e)}")
+        try:
+            self.news_archive.add_team_news(team_code, date, news_data)
+        except Exception as e:
+            logger.error(f"Error archiving news for {team_name}: {str(e)}")
+        return result
+    
+    def _publish_team(self, result: TeamPodcastResult, distribute: bool = True) -> TeamPodcastResult:
+        """Generate the audio of a team's saved script and distribute it."""
+        team_code = result.team_code
+        date = datetime.datetime.strptime(result.date, "%Y-%m-%d").date()
+        
+        # Step 4: Generate Audio
+        audio_file = self.tts.generate_and_save_audio(team_code, date)
+        if audio_file:
+            result.audio_file = audio_file
+            result.success = True
+            self._distribute_team(result, distribute)
+        else:
+            result.error = "Failed to generate audio file"
+        
+        return result
+    
+    def _stream_team_script(self, result: TeamPodcastResult, team_code: str, date: datetime.date) -> bool:
+        """Generate a team's script and audio together, voicing paragraphs as they are written.
+        
+        Returns False if streaming failed, in which case the script and audio
+        should be generated in full instead.
+        """
+        team_data = self.script_generator.load_team_data(team_code, date)
+        paragraphs = []
+        
+        def script_paragraphs():
+            for paragraph in self.script_generator.stream_script(team_data):
+                paragraphs.append(paragraph)
+                yield paragraph
+        
+        # Steps 3 and 4: Generate Script and Audio
+        try:
+            audio_file = self.tts.generate_and_save_streamed_audio(team_code, date, script_paragraphs())
+        except Exception as e:
+            logger.error(f"Error streaming script for {result.team_name}, generating it in full: {str(e)}")
+            return False
+        
+        result.script_file = self.script_generator.save_script(team_code, date, "\n\n".join(paragraphs))
+        result.audio_file = audio_file
+        result.success = True
+        return True
+    
+    def _distribute_team(self, result: TeamPodcastResult, distribute: bool = True) -> TeamPodcastResult:
+        """Distribute a team's generated podcast to Podbean."""
+        team_code = result.team_code
+        team_name = result.team_name
+        date_str = result.date
+        
+        # Step 5: Distribute to Podbean
+        if result.success and result.audio_file and distribute:
+            logger.info(f"Distributing podcast for {team_name} to Podbean")
+            
+            # Load script content for episode description
+            script_content = ""
+            if os.path.exists(result.script_file):
+                with open(result.script_file, 'r') as f:
+                    script_content = f.read()
+            
+            # Prepare metadata for Podbean
+            metadata = {
+                "title": f"{team_name} Daily Update - {date_str}",
+                "description": script_content[:1000] if script_content else f"Daily update for {team_name}",
+                "tags": ["MLB", "baseball", "sports", team_code, team_name],
+                "category": "Sports & Recreation"
+            }
+            
+            # Distribute the podcast
+            distribution_success, podbean_url = self.distributor.distribute_podcast(
+                result.audio_file, metadata
+            )
+            
+            if distribution_success and podbean_url:
+                result.podbean_url = podbean_url
+                result.distribution_success = True
+                logger.info(f"Successfully distributed {team_name} podcast to Podbean: {podbean_url}")
+            else:
+                logger.error(f"Failed to distribute {team_name} podcast to Podbean")
+        elif result.success and not distribute:
+            logger.info(f"Skipping Podbean distribution for {team_name} (--no-distribute flag set)")
+        
+        return result
+    
+    def process_all_teams(self, date: Optional[datetime.date] = None, max_workers: int = 5, distribute: bool = True,
+                          team_codes: Optional[List[str]] = None, batch: bool = False) -> List[TeamPodcastResult]:
+        """Process podcasts for all MLB teams (or the given team codes) using parallel processing.
+        
+        With batch, the teams are processed in stages instead: all data and
+        news, then every script with one Anthropic Message Batch, then all
+        audio and distribution.
+        """
         date = date or datetime.date.today()
+        team_codes = list(MLB_TEAMS.keys()) if team_codes is None else team_codes
         logger.info(f"Starting batch processing for all teams on {date.strftime('%Y-%m-%d')}")
         
         results = []
         
-        # Process teams in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_team = {
-                executor.submit(self.process_team, team_code, date, distribute): team_code 
-                for team_code in MLB_TEAMS.keys()
-            }
+        # Fetch the league-wide schedule and standings once for every team
+        snapshot = None
+        try:
+            snapshot = self.mlb_data.get_league_snapshot(date)
+            if not snapshot.hydrated:
+                snapshot.stat_table = self.mlb_data.build_stat_table(snapshot, max_workers=max_workers)
+        except Exception as e:
+            logger.error(f"Error fetching league snapshot, teams will fetch individually: {str(e)}")
+        
+        # Fetch news for groups of teams before the per-team pipelines read it
+        self.prefetch_news(team_codes, date, snapshot)
+        
+        if batch:
+            results = self._process_teams_staged(team_codes, date, max_workers, distribute, snapshot)
+        else:
+            # Process teams in parallel
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_team = {
+                    executor.submit(self.process_team, team_code, date, distribute, snapshot): team_code 
+                    for team_code in team_codes
+                }
             
-            for future in concurrent.futures.as_completed(future_to_team):
-                team_code = future_to_team[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    status = "Success"
-                    if not result.success:
-                        status = "Failed"
-                    elif not result.distribution_success and distribute:
-                        status = "Generated but not distributed"
-                    elif not distribute:
-                        status = "Generated (distribution skipped)"
-                    logger.info(f"Completed processing for {MLB_TEAMS.get(team_code)}: {status}")
-                except Exception as e:
-                    logger.error(f"Error in thread for {MLB_TEAMS.get(team_code)}: {str(e)}")
-                    results.append(TeamPodcastResult(
-                        team_code=team_code,
-                        team_name=MLB_TEAMS.get(team_code),
-                        date=date.strftime("%Y-%m-%d"),
-                        success=False,
-                        error=str(e)
-                    ))
+                for future in concurrent.futures.as_completed(future_to_team):
+                    team_code = future_to_team[future]
+                    try:
+                        result = future.result()
+                        results.append(result)
+                        status = "Success"
+                        if not result.success:
+                            status = "Failed"
+                        elif not result.distribution_success and distribute:
+                            status = "Generated but not distributed"
+                        elif not distribute:
+                            status = "Generated (distribution skipped)"
+                        logger.info(f"Completed processing for {MLB_TEAMS.get(team_code)}: {status}")
+                    except Exception as e:
+                        logger.error(f"Error in thread for {MLB_TEAMS.get(team_code)}: {str(e)}")
+                        results.append(TeamPodcastResult(
+                            team_code=team_code,
+                            team_name=MLB_TEAMS.get(team_code),
+                            date=date.strftime("%Y-%m-%d"),
+                            success=False,
+                            error=str(e)
+                        ))
+        
+        # Boxscores are only shared within a batch
+        self.mlb_data.clear_boxscore_cache()
         
         # Log summary
         success_count = sum(1 for result in results if result.success)
         distributed_count = sum(1 for result in results if result.distribution_success)
         
         if distribute:
-            logger.info(f"Batch processing complete: {success_count}/{len(MLB_TEAMS)} teams generated, {distributed_count}/{len(MLB_TEAMS)} distributed")
+            logger.info(f"Batch processing complete: {success_count}/{len(team_codes)} teams generated, {distributed_count}/{len(team_codes)} distributed")
+        else:
+            logger.info(f"Batch processing complete: {success_count}/{len(team_codes)} teams generated (distribution skipped)")
+        
+        return results
+    
+    def _process_teams_staged(self, team_codes: List[str], date: datetime.date, max_workers: int,
+                              distribute: bool, snapshot: Optional[LeagueSnapshot] = None) -> List[TeamPodcastResult]:
+        """Process teams stage by stage, generating every script with one message batch.
+        
+        LLM concurrency no longer bounds the run: the thread pool only fetches
+        data and news, and renders audio once the batch has ended.
+        """
+        date_str = date.strftime("%Y-%m-%d")
+        results = {
+            team_code: TeamPodcastResult(team_code=team_code, team_name=MLB_TEAMS.get(team_code), date=date_str)
+            for team_code in team_codes
+        }
+        
+        def run_stage(stage, codes):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_team = {executor.submit(stage, team_code): team_code for team_code in codes}
+                for future in concurrent.futures.as_completed(future_to_team):
+                    team_code = future_to_team[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing {MLB_TEAMS.get(team_code)}: {str(e)}")
+                        results[team_code].error = str(e)
+        
+        # Stage 1: MLB data and news
+        run_stage(lambda team_code: self._prepare_team(results[team_code], team_code, date, snapshot), team_codes)
+        
+        # Stage 2: Scripts, with one message batch
+        prepared = [team_code for team_code in team_codes if not results[team_code].error]
+        script_files = BatchScriptGenerator(self.script_generator).generate_and_save_scripts(prepared, date)
+        for team_code in prepared:
+            if team_code in script_files:
+                results[team_code].script_file = script_files[team_code]
+            else:
+                results[team_code].error = "Failed to generate script"
+        
+        # Stage 3: Audio and distribution
+        scripted = [team_code for team_code in prepared if team_code in script_files]
+        run_stage(lambda team_code: self._publish_team(results[team_code], distribute), scripted)
+        
+        return list(results.values())
+    
+    def news_groups(self, team_codes: List[str], snapshot: Optional[LeagueSnapshot] = None,
+                    mode: str = NEWS_BATCH_MODE) -> List[List[str]]:
+        """Group teams whose news is fetched with a single request.
+        
+        "division" groups the teams of each division, "matchup" the two teams of
+        each game in the snapshot. Teams left over are fetched on their own.
+        """
+        if mode == "division":
+            groups = [[code for code in division if code in team_codes] for division in MLB_DIVISIONS.values()]
+        elif mode == "matchup" and snapshot is not None:
+            registry = self.mlb_data.get_team_registry()
+            groups = []
+            grouped = set()
+            for date_data in snapshot.schedule.get("dates", []):
+                for game in date_data.get("games", []):
+                    codes = [
+                        registry.code_for(game.get("teams", {}).get(side, {}).get("team", {}).get("id"))
+                        for side in ("home", "away")
+                    ]
+                    codes = [code for code in codes if code in team_codes and code not in grouped]
+                    if codes:
+                        groups.append(codes)
+                        grouped.update(codes)
+        else:
+            groups = []
+        
+        grouped = {code for group in groups for code in group}
+        groups = [group for group in groups if group]
+        groups.extend([code] for code in team_codes if code not in grouped)
+        return groups
+    
+    def prefetch_news(self, team_codes: List[str], date: datetime.date, snapshot: Optional[LeagueSnapshot] = None) -> None:
+        """Fetch and save the news of every team without fresh cached news.
+        
+        All groups (see news_groups) are fetched concurrently by the async news
+        client before the per-team pipelines start, which then read the cache.
+        The cached news is then indexed (see index_news).
+        """
+        if self.perplexity_api.use_mock:
+            return
+        
+        news_cache = self.perplexity_api.news_cache
+        missing = [team_code for team_code in team_codes if not news_cache.is_fresh(team_code, date)]
+        if missing:
+            groups = self.news_groups(missing, snapshot)
+            
+            async def fetch_news():
+                async with AsyncPerplexityNewsFetcher() as news_fetcher:
+                    await news_fetcher.fetch_and_save_news(groups, date)
+            
+            logger.info(f"Prefetching news for {len(missing)} teams in {len(groups)} requests")
+            try:
+                asyncio.run(fetch_news())
+            except Exception as e:
+                # The teams' pipelines fetch their news individually instead
+                logger.error(f"Error prefetching news: {str(e)}")
+        
+        self.index_news(team_codes, date)
+    
+    def index_news(self, team_codes: List[str], date: datetime.date) -> None:
+        """Add the cached news of every team to the date's news index.
+        
+        A team's news digest notes the other teams that reported the same
+        story, so every team is indexed before any prompt is built. Prompts
+        then do not depend on the order teams are processed in, and a rerun
+        builds the same prompts and reuses their cached scripts.
+        """
+        news_cache = self.perplexity_api.news_cache
+        news_index = NewsIndex.for_date(date)
+        for team_code in team_codes:
+            news_data = news_cache.get(team_code, date)
+            if not news_data:
+                continue
+            try:
+                news_index.add_team_news(team_code, news_data)
+            except Exception as e:
+                logger.error(f"Error indexing news for {MLB_TEAMS.get(team_code)}: {str(e)}")
+    
+    def process_date_range(self, start_date: datetime.date, end_date: datetime.date, max_workers: int = 5,
+                           distribute: bool = False, data_only: bool = False) -> List[TeamPodcastResult]:
+        """Backfill every team for every date in a range.
+        
+        The schedule for the whole range is fetched with one request, then the
+        dates are processed one at a time (see _process_date), so only one
+        date's stat table and boxscores are held at once. Backfilled episodes
+        are only published to Podbean with distribute. With data_only, only the
+        MLB data files are rebuilt, with the async fetcher (see _backfill_data).
+        """
+        logger.info(f"Starting backfill for all teams from {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
+        
+        if data_only:
+            results = asyncio.run(self._backfill_data(start_date, end_date))
         else:
-            logger.info(f"Batch processing complete: {success_count}/{len(MLB_TEAMS)} teams generated (distribution skipped)")
+            snapshots = self.mlb_data.get_league_snapshots(start_date, end_date)
+            results = []
+            for date in sorted(snapshots):
+                # Drop each snapshot once its date is done
+                snapshot = snapshots.pop(date)
+                results.extend(self._process_date(date, snapshot, max_workers, distribute))
+        
+        success_count = sum(1 for result in results if result.success)
+        logger.info(f"Backfill complete: {success_count}/{len(results)} team-days processed")
+        
+        return results
+    
+    def _process_date(self, date: datetime.date, snapshot: LeagueSnapshot, max_workers: int,
+                      distribute: bool) -> List[TeamPodcastResult]:
+        """Process every team for one date of a backfill.
+        
+        The date's stat table is built, its team jobs fan out across a bounded
+        worker pool, and its boxscores are released before the next date.
+        """
+        results = []
+        try:
+            if not snapshot.hydrated:
+                snapshot.stat_table = self.mlb_data.build_stat_table(snapshot, max_workers=max_workers)
+            self.prefetch_news(list(MLB_TEAMS.keys()), date, snapshot)
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                future_to_team = {
+                    executor.submit(self.process_team, team_code, date, distribute, snapshot): team_code
+                    for team_code in MLB_TEAMS.keys()
+                }
+                
+                for future in concurrent.futures.as_completed(future_to_team):
+                    team_code = future_to_team[future]
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        logger.error(f"Error in thread for {MLB_TEAMS.get(team_code)} on {date.strftime('%Y-%m-%d')}: {str(e)}")
+                        results.append(TeamPodcastResult(
+                            team_code=team_code,
+                            team_name=MLB_TEAMS.get(team_code),
+                            date=date.strftime("%Y-%m-%d"),
+                            success=False,
+                            error=str(e)
+                        ))
+        finally:
+            self.mlb_data.clear_boxscore_cache()
+            snapshot.stat_table = None
+        
+        return results
+    
+    async def _backfill_data(self, start_date: datetime.date, end_date: datetime.date) -> List[TeamPodcastResult]:
+        """Rebuild only the MLB data files of every team for every date in a range.
         
-        return results
\ No newline at end of file
+        Nothing but statsapi requests is involved, so the async fetcher is used:
+        every standings pull, boxscore and team of a date is fetched
+        concurrently on one pooled connection. Dates still run one at a time.
+        """
+        results = []
+        async with AsyncMLBDataFetcher() as mlb_data:
+            snapshots = await mlb_data.get_league_snapshots(start_date, end_date)
+            for date in sorted(snapshots):
+                date_str = date.strftime("%Y-%m-%d")
+                team_days = await mlb_data.process_all_teams_daily_data(date, snapshot=snapshots.pop(date))
+                for team_code in MLB_TEAMS.keys():
+                    results.append(TeamPodcastResult(
+                        team_code=team_code,
+                        team_name=MLB_TEAMS.get(team_code),
+                        date=date_str,
+                        data_file=os.path.join("data", team_code, f"{date_str}.json") if team_code in team_days else None,
+                        success=team_code in team_days,
+                        error=None if team_code in team_days else "Failed to process MLB data"
+                    ))
+        return results
@@ -0,0 +1,162 @@
+import asyncio
+import io
+import os
+import json
+import time
+import random
+import hashlib
+import urllib.parse
+from typing import Dict, Any, Optional, Tuple
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.response import HTTPResponse
+
+try:
+    import httpx
+except ImportError:  # Only the async replay transport needs httpx
+    httpx = None
+
+from config.config import MLB_FIXTURES_DIR
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class FixtureStore:
+    """Recorded statsapi responses on disk, keyed by path and query string.
+
+    Each fixture is a JSON file holding the status, content type and decoded
+    body of one response, so it can be replayed through the real parsers.
+    """
+
+    def __init__(self, root: str = MLB_FIXTURES_DIR):
+        self.root = root
+
+    @staticmethod
+    def key(url: str) -> str:
+        parsed = urllib.parse.urlsplit(url)
+        query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parsed.query)))
+        return hashlib.sha256(f"{parsed.path}?{query}".encode("utf-8")).hexdigest()
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.root, f"{self.key(url)}.json")
+
+    def save(self, url: str, status: int, content_type: str, body: bytes) -> None:
+        os.makedirs(self.root, exist_ok=True)
+        with open(self._path(url), "w") as f:
+            json.dump({
+                "url": url,
+                "status": status,
+                "content_type": content_type,
+                "body": body.decode("utf-8"),
+            }, f)
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), "r") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+class ReplayConditions:
+    """Latency and failures injected into replayed responses."""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 error_status: int = 503, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+
+    def delay(self) -> float:
+        return max(0.0, self.latency + self.random.uniform(-self.jitter, self.jitter))
+
+    def fail(self) -> bool:
+        return self.error_rate > 0 and self.random.random() < self.error_rate
+
+    def respond(self, store: FixtureStore, url: str) -> Tuple[int, str, bytes]:
+        """Look up the response for a URL, or an injected error or a 404."""
+        if self.fail():
+            return self.error_status, "application/json", b'{"message": "Injected failure"}'
+        fixture = store.load(url)
+        if fixture is None:
+            logger.warning(f"No recorded fixture for {url}")
+            return 404, "application/json", b'{"message": "No recorded fixture"}'
+        return fixture["status"], fixture["content_type"], fixture["body"].encode("utf-8")
+
+def build_response(request: requests.PreparedRequest, status: int, content_type: str, body: bytes) -> requests.Response:
+    """Build a requests response whose raw stream can be read by the selective parser."""
+    raw = HTTPResponse(
+        body=io.BytesIO(body),
+        headers={"Content-Type": content_type, "Content-Length": str(len(body))},
+        status=status,
+        preload_content=False,
+        decode_content=False,
+    )
+    return HTTPAdapter().build_response(request, raw)
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter that passes requests through and records every response."""
+
+    def __init__(self, store: FixtureStore, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request, stream=False, **kwargs):
+        # Conditional headers would record 304s instead of bodies
+        request.headers.pop("If-None-Match", None)
+        request.headers.pop("If-Modified-Since", None)
+        response = super().send(request, stream=False, **kwargs)
+        body = response.content
+        content_type = response.headers.get("Content-Type", "application/json")
+        self.store.save(request.url, response.status_code, content_type, body)
+        return build_response(request, response.status_code, content_type, body)
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter that serves recorded responses without the network."""
+
+    def __init__(self, store: FixtureStore, conditions: Optional[ReplayConditions] = None):
+        super().__init__()
+        self.store = store
+        self.conditions = conditions or ReplayConditions()
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        time.sleep(self.conditions.delay())
+        status, content_type, body = self.conditions.respond(self.store, request.url)
+        return build_response(request, status, content_type, body)
+
+    def close(self):
+        pass
+
+if httpx is not None:
+    class AsyncReplayTransport(httpx.AsyncBaseTransport):
+        """httpx transport that serves recorded responses to the async fetcher."""
+
+        def __init__(self, store: FixtureStore, conditions: Optional[ReplayConditions] = None):
+            self.store = store
+            self.conditions = conditions or ReplayConditions()
+
+        async def handle_async_request(self, request: "httpx.Request") -> "httpx.Response":
+            await asyncio.sleep(self.conditions.delay())
+            status, content_type, body = self.conditions.respond(self.store, str(request.url))
+            return httpx.Response(status, headers={"Content-Type": content_type}, content=body, request=request)
+
+def _mount_prefix(base_url: str) -> str:
+    parsed = urllib.parse.urlsplit(base_url)
+    return f"{parsed.scheme}://{parsed.netloc}/"
+
+def record_fetcher(fetcher, store: Optional[FixtureStore] = None) -> FixtureStore:
+    """Record every statsapi response made by an MLBDataFetcher."""
+    store = store or FixtureStore()
+    fetcher.cache = None
+    fetcher.session.mount(_mount_prefix(fetcher.base_url), RecordingAdapter(store))
+    return store
+
+def replay_fetcher(fetcher, store: Optional[FixtureStore] = None,
+                   conditions: Optional[ReplayConditions] = None) -> FixtureStore:
+    """Serve an MLBDataFetcher's statsapi requests from recorded fixtures."""
+    store = store or FixtureStore()
+    fetcher.cache = None
+    fetcher.session.mount(_mount_prefix(fetcher.base_url), ReplayAdapter(store, conditions))
+    return store
@@ -2,8 +2,9 @@ import time
 import datetime
 import schedule
 
-from config.config import UPDATE_TIME
+from config.config import UPDATE_TIME, MLB_TEAMS, ANTHROPIC_BATCH_MODE
 from utils.processor import PodcastProcessor
+from utils.watcher import GameWatcher
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -11,8 +12,11 @@ logger = get_logger(__name__)
 class PodcastScheduler:
     """Scheduler for daily podcast generation."""
     
-    def __init__(self):
+    def __init__(self, watch: bool = False):
         self.processor = PodcastProcessor()
+        # The live game watcher publishes episodes as games end; the daily job
+        # then only processes the teams it has not covered
+        self.watcher = GameWatcher(self.processor) if watch else None
         
     def daily_job(self):
         """Process all teams for daily update."""
@@ -22,8 +26,15 @@ class PodcastScheduler:
         logger.info(f"Running daily job for date: {yesterday.strftime('%Y-%m-%d')}")
         
         try:
-            # Process yesterday's data for all teams
-            results = self.processor.process_all_teams(date=yesterday)
+            # Process yesterday's data for all teams not already covered by the watcher
+            team_codes = list(MLB_TEAMS.keys())
+            if self.watcher:
+                processed = set(self.watcher.processed_teams(yesterday))
+                team_codes = [team_code for team_code in team_codes if team_code not in processed]
+                if processed:
+                    logger.info(f"Skipping {len(processed)} teams already processed by the live game watcher")
+            # With batch mode, the nightly run's scripts come from one message batch
+            results = self.processor.process_all_teams(date=yesterday, team_codes=team_codes, batch=ANTHROPIC_BATCH_MODE)
             
             # Log results
             success_count = sum(1 for result in results if result.success)
@@ -52,6 +63,9 @@ class PodcastScheduler:
         """Start the scheduler."""
         logger.info(f"Starting scheduler, will run daily at {UPDATE_TIME}")
         
+        if self.watcher:
+            self.watcher.start_in_background()
+        
         # Schedule the job to run daily
         schedule.every().day.at(UPDATE_TIME).do(self.daily_job)
         
@@ -0,0 +1,219 @@
+import time
+import uuid
+import datetime
+import threading
+import concurrent.futures
+from types import SimpleNamespace
+from typing import Dict, List, Any, Optional, Callable, Iterator
+
+from config.config import (
+    MLB_TEAMS, ANTHROPIC_BATCH_POLL_MIN, ANTHROPIC_BATCH_POLL_MAX, ANTHROPIC_BATCH_TIMEOUT
+)
+from utils.logger import get_logger
+from utils.anthropic_generator import ScriptGenerator
+
+logger = get_logger(__name__)
+
+class LocalBatchClient:
+    """Stand-in for the Anthropic Message Batches endpoint.
+
+    Implements the create/retrieve/results calls of client.messages.batches
+    with the same shapes, answering each request with a responder function
+    after a simulated latency. Used in mock mode and for testing the batch
+    pipeline without the API.
+    """
+
+    def __init__(self, responder: Callable[[str, Dict[str, Any]], str], latency: float = 0.0,
+                 max_workers: int = 8):
+        self.responder = responder
+        self.latency = latency
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+        self._batches: Dict[str, Dict[str, concurrent.futures.Future]] = {}
+        self._lock = threading.Lock()
+
+    def _answer(self, custom_id: str, params: Dict[str, Any]) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        return self.responder(custom_id, params)
+
+    def create(self, requests: List[Dict[str, Any]]) -> SimpleNamespace:
+        batch_id = f"msgbatch_local_{uuid.uuid4().hex[:12]}"
+        futures = {
+            request["custom_id"]: self._executor.submit(self._answer, request["custom_id"], request["params"])
+            for request in requests
+        }
+        with self._lock:
+            self._batches[batch_id] = futures
+        return self.retrieve(batch_id)
+
+    def retrieve(self, message_batch_id: str) -> SimpleNamespace:
+        with self._lock:
+            futures = self._batches[message_batch_id]
+        done = [future for future in futures.values() if future.done()]
+        errored = sum(1 for future in done if future.exception() is not None)
+        return SimpleNamespace(
+            id=message_batch_id,
+            processing_status="ended" if len(done) == len(futures) else "in_progress",
+            request_counts=SimpleNamespace(
+                processing=len(futures) - len(done),
+                succeeded=len(done) - errored,
+                errored=errored,
+                canceled=0,
+                expired=0
+            )
+        )
+
+    def results(self, message_batch_id: str) -> Iterator[SimpleNamespace]:
+        with self._lock:
+            futures = self._batches[message_batch_id]
+        for custom_id, future in futures.items():
+            if not future.done():
+                continue
+            if future.exception() is not None:
+                result = SimpleNamespace(type="errored", error=SimpleNamespace(message=str(future.exception())))
+            else:
+                message = SimpleNamespace(content=[SimpleNamespace(type="text", text=future.result())],
+                                          stop_reason="end_turn")
+                result = SimpleNamespace(type="succeeded", message=message)
+            yield SimpleNamespace(custom_id=custom_id, result=result)
+
+    def cancel(self, message_batch_id: str) -> SimpleNamespace:
+        with self._lock:
+            futures = self._batches[message_batch_id]
+        for future in futures.values():
+            future.cancel()
+        return self.retrieve(message_batch_id)
+
+def next_poll_interval(interval: float, progressed: bool, minimum: float = ANTHROPIC_BATCH_POLL_MIN,
+                       maximum: float = ANTHROPIC_BATCH_POLL_MAX) -> float:
+    """Poll again soon while results keep arriving, and back off while they don't."""
+    if progressed:
+        return minimum
+    return min(interval * 2, maximum)
+
+class BatchScriptGenerator:
+    """Generates the scripts of many teams with one Anthropic Message Batch.
+
+    Every team's prompt is submitted as one request of a batch, which is
+    polled with adaptive intervals until it ends; results can only be read
+    once the whole batch has ended, and each script is saved as its result
+    streams in. Teams rendered from templates or with a cached script for the
+    same request are left out of the batch. Teams whose request failed, or every team if waiting timed
+    out, are generated directly instead.
+    """
+
+    def __init__(self, script_generator: Optional[ScriptGenerator] = None, batches: Optional[Any] = None,
+                 poll_min: float = ANTHROPIC_BATCH_POLL_MIN, poll_max: float = ANTHROPIC_BATCH_POLL_MAX,
+                 timeout: float = ANTHROPIC_BATCH_TIMEOUT):
+        self.script_generator = script_generator or ScriptGenerator()
+        self.poll_min = poll_min
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self._team_data: Dict[str, Dict[str, Any]] = {}
+
+        if batches is not None:
+            self.batches = batches
+        elif self.script_generator.use_mock:
+            self.batches = LocalBatchClient(self._mock_response)
+        else:
+            self.batches = self.script_generator.client.messages.batches
+
+    @staticmethod
+    def custom_id(team_code: str, date: datetime.date) -> str:
+        return f"{team_code}-{date.strftime('%Y%m%d')}"
+
+    def _mock_response(self, custom_id: str, params: Dict[str, Any]) -> str:
+        return self.script_generator.mock_script(self._team_data[custom_id])
+
+    def submit(self, requests: Dict[str, Dict[str, Any]]) -> str:
+        """Submit a batch with the request parameters of each custom id and return its id."""
+        batch = self.batches.create(requests=[
+            {"custom_id": custom_id, "params": params} for custom_id, params in requests.items()
+        ])
+        logger.info(f"Submitted script batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    def wait(self, batch_id: str) -> bool:
+        """Poll a batch until it ends, returning False if waiting timed out."""
+        deadline = time.monotonic() + self.timeout
+        interval = self.poll_min
+        finished = -1
+        while True:
+            batch = self.batches.retrieve(batch_id)
+            counts = batch.request_counts
+            if batch.processing_status == "ended":
+                logger.info(f"Script batch {batch_id} ended: {counts.succeeded} succeeded, {counts.errored} errored, "
+                            f"{counts.expired} expired")
+                return True
+
+            done = counts.succeeded + counts.errored + counts.canceled + counts.expired
+            interval = next_poll_interval(interval, done > finished, self.poll_min, self.poll_max)
+            finished = done
+
+            if time.monotonic() + interval > deadline:
+                logger.warning(f"Script batch {batch_id} still has {counts.processing} requests processing, giving up waiting")
+                return False
+            logger.debug(f"Script batch {batch_id}: {done} done, {counts.processing} processing, next poll in {interval:.0f}s")
+            time.sleep(interval)
+
+    def generate_and_save_scripts(self, team_codes: List[str], date: datetime.date) -> Dict[str, str]:
+        """Generate and save every team's script, returning the script file path of each team."""
+        if not team_codes:
+            return {}
+
+        # Quiet days are rendered from templates, and teams whose request is
+        # unchanged since a previous run reuse its script
+        script_files = {}
+        requests = {}
+        teams = {}
+        for team_code in team_codes:
+            custom_id = self.custom_id(team_code, date)
+            team_data = self.script_generator.load_team_data(team_code, date)
+            self._team_data[custom_id] = team_data
+            params = self.script_generator.message_params(self.script_generator.build_prompt(team_data))
+            script = self.script_generator.template_script(team_data)
+            if script is None:
+                script = self.script_generator.cached_script(params)
+            if script is not None:
+                script_files[team_code] = self.script_generator.save_script(team_code, date, script)
+            else:
+                requests[custom_id] = params
+                teams[custom_id] = team_code
+        if script_files:
+            logger.info(f"Rendered or reused {len(script_files)} scripts, {len(requests)} left to generate")
+        if not requests:
+            return script_files
+
+        try:
+            batch_id = self.submit(requests)
+            if not self.wait(batch_id):
+                self.batches.cancel(batch_id)
+                raise TimeoutError(f"Script batch {batch_id} did not end within {self.timeout}s")
+
+            # Results are streamed, so each script is saved as soon as it is read
+            for response in self.batches.results(batch_id):
+                team_code = teams.get(response.custom_id)
+                if team_code is None:
+                    continue
+                if response.result.type == "succeeded":
+                    script = self.script_generator.finish_script(
+                        MLB_TEAMS.get(team_code), requests[response.custom_id], response.result.message,
+                        cache=not self.script_generator.use_mock
+                    )
+                    script_files[team_code] = self.script_generator.save_script(team_code, date, script)
+                else:
+                    logger.error(f"Batch request for {MLB_TEAMS.get(team_code)} {response.result.type}")
+        except Exception as e:
+            logger.error(f"Error generating scripts with a message batch: {e}")
+
+        # Teams without a batch result are generated directly
+        missing = [team_code for team_code in team_codes if team_code not in script_files]
+        if missing:
+            logger.warning(f"Generating {len(missing)} scripts directly after the batch: {', '.join(missing)}")
+        for team_code in missing:
+            try:
+                self.script_generator.generate_and_save_script(team_code, date)
+                script_files[team_code] = self.script_generator.script_path(team_code, date)
+            except Exception as e:
+                logger.error(f"Error generating script for {MLB_TEAMS.get(team_code)}: {e}")
+        return script_files
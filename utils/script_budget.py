@@ -0,0 +1,115 @@
+import re
+import math
+from typing import Dict, List, Any
+
+from config.config import (
+    PODCAST_LENGTH_MINUTES, SPEAKING_RATE_WPM, TTS_SPEAKING_RATE, SCRIPT_LENGTH_TOLERANCE, SCRIPT_TOKENS_PER_WORD
+)
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Room above the longest allowed script, so a script on target ends on its
+# own instead of at max_tokens
+MAX_TOKENS_HEADROOM = 1.25
+
+def count_words(script: str) -> int:
+    """Count the spoken words of a script, ignoring any markup."""
+    return len(re.findall(r"\S+", re.sub(r"<[^>]+>", " ", script)))
+
+class ScriptBudget:
+    """Word and token budget of a script read in a target number of minutes.
+
+    The target length is the podcast length times the voice's words per
+    minute at its speaking rate. max_tokens allows the longest accepted
+    script with some headroom; longer scripts are trimmed and scripts cut off
+    at max_tokens are continued.
+    """
+
+    def __init__(self, minutes: float = PODCAST_LENGTH_MINUTES, words_per_minute: float = SPEAKING_RATE_WPM,
+                 speaking_rate: float = TTS_SPEAKING_RATE, tolerance: float = SCRIPT_LENGTH_TOLERANCE,
+                 tokens_per_word: float = SCRIPT_TOKENS_PER_WORD):
+        self.minutes = minutes
+        self.words_per_minute = words_per_minute * speaking_rate
+        self.tolerance = tolerance
+        self.tokens_per_word = tokens_per_word
+
+    @property
+    def target_words(self) -> int:
+        return round(self.minutes * self.words_per_minute)
+
+    @property
+    def max_words(self) -> int:
+        return round(self.target_words * (1 + self.tolerance))
+
+    @property
+    def min_words(self) -> int:
+        return round(self.target_words * (1 - self.tolerance))
+
+    @property
+    def max_tokens(self) -> int:
+        # Rounded up to a multiple of 100 to keep the request stable
+        tokens = self.max_words * self.tokens_per_word * MAX_TOKENS_HEADROOM
+        return int(math.ceil(tokens / 100) * 100)
+
+    def estimate_minutes(self, script: str) -> float:
+        """Estimate how long a script takes to read."""
+        return count_words(script) / self.words_per_minute
+
+    @staticmethod
+    def continuation_params(params: Dict[str, Any], partial: str) -> Dict[str, Any]:
+        """Return request parameters that continue a script cut off at max_tokens.
+
+        The partial script is sent as the start of the assistant's reply, so the
+        model picks up where it stopped.
+        """
+        return {**params, "messages": params["messages"] + [{"role": "assistant", "content": partial.rstrip()}]}
+
+    @staticmethod
+    def join_continuation(partial: str, continuation: str) -> str:
+        """Append a continuation to the partial script it continues.
+
+        The partial script was sent without its trailing whitespace, so the
+        continuation may or may not open with the space or paragraph break
+        at the seam. One separator is kept, a space is added after a cut-off
+        sentence or clause, and nothing is added inside a cut-off word. The
+        result always starts with partial.
+        """
+        if not continuation:
+            return partial
+        if partial[-1:].isspace():
+            return partial + continuation.lstrip(" \t")
+        if continuation[:1].isspace() or not re.search(r"[.!?,;:]$", partial):
+            return partial + continuation
+        return partial + " " + continuation
+
+    def trim(self, script: str) -> str:
+        """Cut a script over the budget down to max_words.
+
+        Whole sentences are dropped from the end of the body, keeping the last
+        paragraph, the outro, intact.
+        """
+        paragraphs = [paragraph for paragraph in re.split(r"\n\s*\n", script.strip()) if paragraph.strip()]
+        if count_words(script) <= self.max_words or len(paragraphs) < 2:
+            return script
+
+        outro = paragraphs.pop()
+        body: List[List[str]] = [re.split(r"(?<=[.!?])\s+", paragraph) for paragraph in paragraphs]
+        words = count_words(script)
+        while words > self.max_words and body:
+            sentence = body[-1].pop()
+            words -= count_words(sentence)
+            if not body[-1]:
+                body.pop()
+        return "\n\n".join([" ".join(sentences) for sentences in body] + [outro])
+
+    def fit(self, script: str, label: str = "script") -> str:
+        """Trim a script over the budget and log its estimated duration."""
+        words = count_words(script)
+        if words > self.max_words:
+            script = self.trim(script)
+            logger.info(f"Trimmed {label} from {words} to {count_words(script)} words (budget {self.max_words})")
+        elif words < self.min_words:
+            logger.warning(f"{label} is short: {words} words for a target of {self.target_words}")
+        logger.info(f"Estimated duration of {label}: {self.estimate_minutes(script):.1f} minutes")
+        return script
@@ -0,0 +1,60 @@
+import os
+import json
+import hashlib
+import tempfile
+from typing import Dict, Any, Optional
+
+from config.config import SCRIPT_CACHE_DIR, PROMPT_TEMPLATE_VERSION
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class ScriptCache:
+    """Generated scripts addressed by a hash of everything that shaped them.
+
+    The key covers the full Messages API request (model, temperature, max
+    tokens, system prompt and the prompt built from the team's data and news)
+    plus PROMPT_TEMPLATE_VERSION. The prompt is the normalized form of the
+    inputs: fields that never reach the model do not change the key, while
+    any change to the data, news or template does. Scripts are stored as
+    data/script_cache/{key[:2]}/{key}.txt.
+    """
+
+    def __init__(self, cache_dir: str = SCRIPT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    @staticmethod
+    def key(params: Dict[str, Any]) -> str:
+        payload = json.dumps({"version": PROMPT_TEMPLATE_VERSION, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached script for a key, or None."""
+        try:
+            with open(self.path(key), "r") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Ignoring unreadable cached script {key}: {e}")
+            return None
+
+    def store(self, key: str, script: str) -> str:
+        """Cache a script and return its path."""
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write atomically through a unique temp file, teams are generated
+        # from several threads of the same process
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(script)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return path
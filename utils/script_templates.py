@@ -0,0 +1,267 @@
+import re
+import hashlib
+import datetime
+from string import Template
+from typing import Dict, List, Any, Optional, Tuple
+
+from config.config import TEMPLATE_MAX_NEWS_ITEMS, MLB_TEAM_IDS
+from utils.logger import get_logger
+from utils.models import TeamDay, Game, StandingsRow
+from utils.news_dedup import split_news_items
+from utils.news_archive import parse_news_items
+
+logger = get_logger(__name__)
+
+TWO_WORD_NICKNAMES = ("Red Sox", "White Sox", "Blue Jays")
+
+ONES = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten",
+        "eleven", "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+TENS = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+ORDINALS = {"1": "first", "2": "second", "3": "third", "4": "fourth", "5": "fifth"}
+
+# Phrasing variants of each block. One variant is picked per team, date and
+# block, so re-rendering an episode gives the same script while consecutive
+# days and different teams read differently. Templates are compiled once here.
+TEMPLATES: Dict[str, Tuple[Template, ...]] = {
+    "intro": (
+        Template("Good morning, $nickname fans, and welcome to the $team_name Daily Update for $day."),
+        Template("Hello and welcome to the $team_name Daily Update. It is $day, and here is where the $nickname stand."),
+        Template("Welcome back to the $team_name Daily Update, your quick look at the $nickname for $day."),
+    ),
+    "off_day": (
+        Template("The $nickname had the day off yesterday, so there is no game to recap."),
+        Template("There was no $nickname baseball yesterday. It was an off day for the club."),
+        Template("Yesterday was a day of rest for the $nickname, with no game on the schedule."),
+    ),
+    "win": (
+        Template("The $nickname beat the $opponent $score $place."),
+        Template("It was a win for the $nickname yesterday, $score over the $opponent $place."),
+        Template("The $nickname took care of the $opponent $place, winning $score."),
+    ),
+    "loss": (
+        Template("The $nickname fell to the $opponent $score $place."),
+        Template("It was a loss for the $nickname yesterday, $score against the $opponent $place."),
+        Template("The $opponent got the better of the $nickname $place, winning $score."),
+    ),
+    "tie": (
+        Template("The $nickname and the $opponent finished tied $score $place."),
+        Template("There was no winner between the $nickname and the $opponent $place, with the game ending $score."),
+    ),
+    "standings_leader": (
+        Template("At $record, the $nickname lead their division."),
+        Template("The $nickname are $record and sit in first place in their division."),
+    ),
+    "standings_behind": (
+        Template("At $record, the $nickname are in $rank in their division, $games_back back of the lead."),
+        Template("The $nickname are $record, which puts them in $rank in the division, $games_back out of first."),
+    ),
+    "streak": (
+        Template("They have now $streak."),
+        Template("That makes it $streak."),
+    ),
+    "next_game": (
+        Template("Next up, the $nickname $host the $opponent$pitchers."),
+        Template("Coming up, the $nickname $host the $opponent$pitchers."),
+    ),
+    "news": (
+        Template("In other $nickname news: $headlines."),
+        Template("A quick look at the headlines around the $nickname: $headlines."),
+    ),
+    "leader": (
+        Template("Around the league, $name of the $team had the standout day, with $line."),
+        Template("Elsewhere in baseball, the top performance belonged to $name of the $team, with $line."),
+    ),
+    "outro": (
+        Template("That is all for today's update. Thanks for listening, and check back tomorrow for more on the $nickname."),
+        Template("That wraps up today's $team_name Daily Update. Thanks for listening, and we will talk again tomorrow."),
+    ),
+}
+
+# Team-specific phrasing, used in place of the shared variants of a block
+TEAM_TEMPLATES: Dict[str, Dict[str, Tuple[Template, ...]]] = {
+    "CHC": {"outro": (Template("That is all for today's update. Thanks for listening, and fly the W."),)},
+    "NYM": {"outro": (Template("That is all for today's update. Thanks for listening, and let's go Mets."),)},
+    "TOR": {"outro": (Template("That is all for today's update. Thanks for listening, and go Jays go."),)},
+}
+
+def number_words(number: int) -> str:
+    """Spell out a whole number below ten thousand, as the TTS rules ask."""
+    if number < 0:
+        return f"minus {number_words(-number)}"
+    if number < 20:
+        return ONES[number]
+    if number < 100:
+        tens, ones = divmod(number, 10)
+        return TENS[tens] + (f"-{ONES[ones]}" if ones else "")
+    if number < 1000:
+        hundreds, rest = divmod(number, 100)
+        return f"{ONES[hundreds]} hundred" + (f" {number_words(rest)}" if rest else "")
+    if number < 10000:
+        thousands, rest = divmod(number, 1000)
+        return f"{ONES[thousands]} thousand" + (f" {number_words(rest)}" if rest else "")
+    return str(number)
+
+def games_back_words(games_back: float) -> str:
+    whole = int(games_back)
+    half = games_back - whole >= 0.5
+    if whole == 0 and half:
+        return "half a game"
+    words = number_words(whole) + (" and a half" if half else "")
+    return f"{words} game" + ("" if whole == 1 and not half else "s")
+
+def team_nickname(team_name: str) -> str:
+    """Return the nickname of a team, e.g. "Red Sox" for "Boston Red Sox"."""
+    for nickname in TWO_WORD_NICKNAMES:
+        if team_name.endswith(nickname):
+            return nickname
+    return team_name.split()[-1] if team_name else team_name
+
+class TemplateRenderer:
+    """Deterministic plain-text scripts built from precompiled templates.
+
+    Used instead of the LLM for off days with a little news, where a model
+    call adds little, and as the fallback when the LLM is unavailable. A script
+    has intro, game or off-day, standings, next game, news, league and outro
+    blocks, each rendered from a phrasing variant picked by team and date.
+    """
+
+    def __init__(self, max_news_items: int = TEMPLATE_MAX_NEWS_ITEMS):
+        self.max_news_items = max_news_items
+
+    def should_render(self, team_day: TeamDay, news: Any) -> bool:
+        """Check whether a day is quiet enough to skip the LLM.
+        
+        Only a true off day qualifies: no game of any status on the schedule,
+        since postponed, suspended and unfinished games still need explaining.
+        The news must have been fetched and hold at most max_news_items items;
+        empty news is what a failed fetch leaves, so it goes to the LLM too.
+        """
+        if team_day.games:
+            return False
+        return 0 < len(split_news_items(news)) <= self.max_news_items
+
+    @staticmethod
+    def _pick(block: str, team_code: str, date: str) -> Template:
+        variants = TEAM_TEMPLATES.get(team_code, {}).get(block) or TEMPLATES[block]
+        digest = hashlib.sha1(f"{team_code}|{date}|{block}".encode("utf-8")).digest()
+        return variants[digest[0] % len(variants)]
+
+    def render(self, team_day: TeamDay, news: Any = None) -> str:
+        """Render a team's script for a day."""
+        nickname = team_nickname(team_day.team_name)
+        fields = {"team_name": team_day.team_name, "nickname": nickname}
+        team_id = MLB_TEAM_IDS.get(team_day.team_code)
+        try:
+            date = datetime.datetime.strptime(team_day.date, "%Y-%m-%d")
+            day = f"{date:%A, %B} {date.day}"
+        except ValueError:
+            day = team_day.date
+
+        def block(block_name: str, /, **values: Any) -> str:
+            return self._pick(block_name, team_day.team_code, team_day.date).substitute(fields, **values)
+
+        paragraphs = [block("intro", day=day)]
+
+        finals = [game for game in team_day.games if game.is_final]
+        upcoming = [game for game in team_day.games if not game.is_final]
+        if finals:
+            paragraphs.extend(self._game_paragraph(block, team_id, team_day.team_name, game) for game in finals)
+        else:
+            paragraphs.append(block("off_day"))
+
+        if team_day.standings:
+            paragraphs.append(self._standings_paragraph(block, team_day.standings))
+
+        for game in upcoming:
+            paragraphs.append(self._next_game_sentence(block, team_id, team_day.team_name, game))
+
+        headlines = self._headlines(news)
+        if headlines:
+            paragraphs.append(block("news", headlines="; ".join(headlines)))
+
+        if team_day.league_leaders:
+            leader = team_day.league_leaders[0]
+            paragraphs.append(block("leader", name=leader.name, team=leader.team, line=self._player_line(leader)))
+
+        paragraphs.append(block("outro"))
+        return "\n\n".join(paragraphs)
+
+    def _game_paragraph(self, block, team_id: Optional[int], team_name: str, game: Game) -> str:
+        is_home = game.is_home_team(team_id, team_name)
+        team_score, opponent_score = (game.home_score, game.away_score) if is_home else (game.away_score, game.home_score)
+        own, opponent = (game.home_team, game.away_team) if is_home else (game.away_team, game.home_team)
+        score = f"{number_words(max(team_score, opponent_score))} to {number_words(min(team_score, opponent_score))}"
+        place = "at home" if is_home else "on the road"
+
+        if team_score == opponent_score:
+            result = "tie"
+        else:
+            result = "win" if team_score > opponent_score else "loss"
+        sentences = [block(result, opponent=opponent, score=score, place=place)]
+        # Boxscore lines carry statsapi's team name, which can differ from the configured one
+        team_lines = [perf for perf in game.notable_performances if perf.team in ("", own, team_name)]
+        for perf in team_lines[:2]:
+            line = self._player_line(perf)
+            if line:
+                sentences.append(f"{perf.name} finished with {line}.")
+        return " ".join(sentences)
+
+    def _standings_paragraph(self, block, standings: StandingsRow) -> str:
+        record = f"{number_words(standings.wins)} and {number_words(standings.losses)}"
+        if standings.games_back_value == 0:
+            sentences = [block("standings_leader", record=record)]
+        else:
+            rank = ORDINALS.get(str(standings.division_rank), f"number {standings.division_rank}")
+            sentences = [block("standings_behind", record=record, rank=f"{rank} place",
+                               games_back=games_back_words(standings.games_back_value))]
+
+        streak = self._streak_words(standings.streak)
+        if streak:
+            sentences.append(block("streak", streak=streak))
+        return " ".join(sentences)
+
+    def _next_game_sentence(self, block, team_id: Optional[int], team_name: str, game: Game) -> str:
+        is_home = game.is_home_team(team_id, team_name)
+        opponent = game.away_team if is_home else game.home_team
+        own, theirs = ((game.probable_home_pitcher, game.probable_away_pitcher) if is_home
+                       else (game.probable_away_pitcher, game.probable_home_pitcher))
+        pitchers = f", with {own} scheduled to face {theirs}" if own and theirs else ""
+        return block("next_game", host="host" if is_home else "visit", opponent=opponent, pitchers=pitchers)
+
+    @staticmethod
+    def _streak_words(streak: str) -> str:
+        if len(streak) < 2 or streak[0] not in "WL" or not streak[1:].isdigit():
+            return ""
+        count = int(streak[1:])
+        if count < 2:
+            return ""
+        kind = "won" if streak[0] == "W" else "lost"
+        return f"{kind} {number_words(count)} in a row"
+
+    @staticmethod
+    def _player_line(perf) -> str:
+        parts = []
+        if perf.hr:
+            parts.append(f"{number_words(perf.hr)} home run" + ("s" if perf.hr > 1 else ""))
+        if perf.hits:
+            parts.append(f"{number_words(perf.hits)} hit" + ("s" if perf.hits > 1 else ""))
+        if perf.rbi:
+            parts.append(f"{number_words(perf.rbi)} runs batted in" if perf.rbi > 1 else "one run batted in")
+        if perf.k:
+            parts.append(f"{number_words(perf.k)} strikeout" + ("s" if perf.k > 1 else ""))
+        if len(parts) > 1:
+            return ", ".join(parts[:-1]) + f" and {parts[-1]}"
+        return parts[0] if parts else ""
+
+    def _headlines(self, news: Any) -> List[str]:
+        headlines = []
+        for item in parse_news_items(news or []):
+            headline = item["headline"].strip()
+            # A heading alone says little, so add the first sentence under it
+            if item["body"] and not item["body"].startswith(headline):
+                first_sentence = re.split(r"(?<=[.!?])\s", item["body"], maxsplit=1)[0]
+                headline = f"{headline.rstrip(':')}: {first_sentence}"
+            headline = headline.rstrip(".!?:; ")
+            if headline:
+                headlines.append(headline)
+        return headlines[:max(self.max_news_items, 1)]
@@ -0,0 +1,175 @@
+import os
+import json
+import time
+import datetime
+from typing import Dict, List, Any, Optional
+
+from config.config import STANDINGS_FILE, STANDINGS_RECONCILE_HOURS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class StandingsTable:
+    """Division standings maintained locally from Final game results.
+
+    Seeded from a full statsapi standings pull and then updated game by game:
+    each Final game adds a win and a loss, extends or resets the streaks, and
+    games back and division ranks are recomputed for the affected divisions.
+    A full pull replaces the table every STANDINGS_RECONCILE_HOURS to correct
+    any drift (suspended games, scoring changes, missed updates).
+    """
+
+    def __init__(self, teams: Dict[int, Dict[str, Any]], since: datetime.date,
+                 applied_games: Optional[List[Any]] = None, reconciled_at: Optional[float] = None):
+        self.teams = teams
+        # Games on or after this date are not yet included in the seed pull
+        # unless they are listed in applied_games
+        self.since = since
+        self.applied_games = set(applied_games or [])
+        self.reconciled_at = reconciled_at or time.time()
+
+    @classmethod
+    def from_statsapi(cls, standings: Dict[str, Any], since: datetime.date) -> "StandingsTable":
+        """Build the table from a statsapi /standings response."""
+        teams = {}
+        for record in standings.get("records", []):
+            division_id = record.get("division", {}).get("id")
+            for team_record in record.get("teamRecords", []):
+                team_id = team_record.get("team", {}).get("id")
+                if team_id is None:
+                    continue
+                teams[team_id] = {
+                    "division_id": division_id,
+                    "wins": team_record.get("wins", 0),
+                    "losses": team_record.get("losses", 0),
+                    "streak": team_record.get("streak", {}).get("streakCode", ""),
+                    "division_rank": team_record.get("divisionRank", ""),
+                    "games_back": team_record.get("gamesBack", "-"),
+                }
+        return cls(teams, since)
+
+    @classmethod
+    def load(cls, path: str = STANDINGS_FILE) -> Optional["StandingsTable"]:
+        """Load the persisted table, or return None if it is missing or unreadable."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            return cls(
+                {int(team_id): team for team_id, team in data["teams"].items()},
+                datetime.date.fromisoformat(data["since"]),
+                data.get("applied_games", []),
+                data.get("reconciled_at"),
+            )
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, OSError) as e:
+            logger.warning(f"Ignoring unreadable standings table {path}: {e}")
+            return None
+
+    def save(self, path: str = STANDINGS_FILE) -> None:
+        """Persist the table."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "since": self.since.isoformat(),
+                "reconciled_at": self.reconciled_at,
+                "applied_games": sorted(self.applied_games),
+                "teams": self.teams,
+            }, f, indent=2)
+
+    def needs_reconcile(self) -> bool:
+        """Check whether the table is due for a full standings pull."""
+        return time.time() - self.reconciled_at > STANDINGS_RECONCILE_HOURS * 3600
+
+    def mark_applied(self, schedule: Dict[str, Any]) -> None:
+        """Record the Final games of a schedule as already included in the table."""
+        for game in self._final_games(schedule):
+            self.applied_games.add(game["gamePk"])
+
+    def apply_schedule(self, schedule: Dict[str, Any]) -> int:
+        """Apply every new Final game of a schedule and return how many were applied."""
+        applied = 0
+        divisions = set()
+        for game in self._final_games(schedule):
+            if game["gamePk"] in self.applied_games:
+                continue
+            divisions.update(self._apply_game(game))
+            self.applied_games.add(game["gamePk"])
+            applied += 1
+
+        for division_id in divisions:
+            self._rank_division(division_id)
+        return applied
+
+    def _final_games(self, schedule: Dict[str, Any]):
+        for date_data in schedule.get("dates", []):
+            if date_data.get("date", "") < self.since.isoformat():
+                continue
+            for game in date_data.get("games", []):
+                status = game.get("status", {})
+                if status.get("abstractGameState") == "Final" and status.get("detailedState") not in ("Postponed", "Cancelled"):
+                    yield game
+
+    def _apply_game(self, game: Dict[str, Any]) -> List[Any]:
+        """Add one Final game to both teams' records and return the affected divisions."""
+        home = game.get("teams", {}).get("home", {})
+        away = game.get("teams", {}).get("away", {})
+        if home.get("isWinner") is None and home.get("score", 0) == away.get("score", 0):
+            return []  # Ties do not count in the standings
+        home_won = home["isWinner"] if home.get("isWinner") is not None else home.get("score", 0) > away.get("score", 0)
+
+        divisions = []
+        for side, won in ((home, home_won), (away, not home_won)):
+            team = self.teams.get(side.get("team", {}).get("id"))
+            if team is None:
+                continue
+            if won:
+                team["wins"] += 1
+            else:
+                team["losses"] += 1
+            team["streak"] = self._extend_streak(team["streak"], "W" if won else "L")
+            divisions.append(team["division_id"])
+        return divisions
+
+    @staticmethod
+    def _extend_streak(streak: str, result: str) -> str:
+        if streak[:1] == result:
+            try:
+                return f"{result}{int(streak[1:]) + 1}"
+            except ValueError:
+                pass
+        return f"{result}1"
+
+    def _rank_division(self, division_id: Any) -> None:
+        """Recompute division ranks and games back from the win-loss records."""
+        teams = [team for team in self.teams.values() if team["division_id"] == division_id]
+        teams.sort(key=lambda team: (-self._win_pct(team), -team["wins"]))
+        leader = teams[0]
+        for rank, team in enumerate(teams, start=1):
+            games_back = ((leader["wins"] - team["wins"]) + (team["losses"] - leader["losses"])) / 2
+            team["division_rank"] = str(rank)
+            team["games_back"] = "-" if games_back <= 0 else f"{games_back:.1f}"
+
+    @staticmethod
+    def _win_pct(team: Dict[str, Any]) -> float:
+        games = team["wins"] + team["losses"]
+        return team["wins"] / games if games else 0.0
+
+    def to_statsapi(self) -> Dict[str, Any]:
+        """Render the table in the statsapi /standings layout read by LeagueSnapshot."""
+        records: Dict[Any, List[Dict[str, Any]]] = {}
+        for team_id, team in self.teams.items():
+            records.setdefault(team["division_id"], []).append({
+                "team": {"id": team_id},
+                "wins": team["wins"],
+                "losses": team["losses"],
+                "divisionRank": team["division_rank"],
+                "gamesBack": team["games_back"],
+                "streak": {"streakCode": team["streak"]},
+            })
+        return {
+            "records": [
+                {"division": {"id": division_id}, "teamRecords": team_records}
+                for division_id, team_records in records.items()
+            ]
+        }
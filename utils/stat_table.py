@@ -0,0 +1,137 @@
+from typing import Dict, List, Any, Tuple, Optional
+import numpy as np
+
+from utils.models import PlayerLine
+
+def innings_to_outs(innings_pitched: Any) -> int:
+    """Convert statsapi innings pitched ("6.2" = 6 and 2/3 innings) to outs."""
+    try:
+        whole, _, partial = str(innings_pitched).partition(".")
+        return int(whole or 0) * 3 + int(partial or 0)
+    except ValueError:
+        return 0
+
+class DailyStatTable:
+    """League-wide batting and pitching lines for one date, stored as columns.
+
+    Built once from every Final boxscore of the slate so standouts, pitching
+    gems and league leaders can be selected for all teams with vectorized
+    filters instead of per-team loops over nested boxscores.
+    """
+
+    BATTING_COLUMNS = ("ab", "h", "hr", "rbi", "bb")
+    PITCHING_COLUMNS = ("outs", "p_k", "p_er", "p_h")
+
+    def __init__(self, rows: List[Dict[str, Any]], team_names: Dict[int, str],
+                 game_hits: Optional[Dict[int, Dict[str, int]]] = None):
+        self.team_names = team_names
+        # Team hits of every game in the table, keyed by gamePk
+        self.game_hits = game_hits or {}
+        self.names = np.array([row["name"] for row in rows], dtype=object)
+        self.player_id = np.array([row["player_id"] for row in rows], dtype=np.int64)
+        self.team_id = np.array([row["team_id"] for row in rows], dtype=np.int64)
+        self.game_id = np.array([row["game_id"] for row in rows], dtype=np.int64)
+        for column in self.BATTING_COLUMNS + self.PITCHING_COLUMNS:
+            setattr(self, column, np.array([row[column] for row in rows], dtype=np.int32))
+        # Selections are computed once and shared by every team of the date
+        self._standouts_by_game: Optional[Dict[int, Tuple[PlayerLine, ...]]] = None
+        self._league_leaders: Dict[int, Tuple[PlayerLine, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self.player_id)
+
+    def has_game(self, game_id: Any) -> bool:
+        """Check whether the table was built with a game's boxscore."""
+        return game_id in self.game_hits
+
+    @classmethod
+    def from_boxscores(cls, boxscores: Dict[Any, Dict[str, Any]]) -> "DailyStatTable":
+        """Assemble the table from boxscores (full or summary) keyed by gamePk."""
+        rows = []
+        team_names = {}
+        game_hits = {}
+        for game_id, boxscore in boxscores.items():
+            game_hits[game_id] = {}
+            for side in ("home", "away"):
+                team = boxscore.get("teams", {}).get(side, {})
+                team_id = team.get("team", {}).get("id", 0)
+                team_names[team_id] = team.get("team", {}).get("name", "")
+                game_hits[game_id][f"{side}_hits"] = team.get("teamStats", {}).get("batting", {}).get("hits", 0)
+
+                for player_data in team.get("players", {}).values():
+                    batting = player_data.get("stats", {}).get("batting", {})
+                    pitching = player_data.get("stats", {}).get("pitching", {})
+                    if not batting and not pitching:
+                        continue
+                    rows.append({
+                        "name": player_data.get("person", {}).get("fullName", ""),
+                        "player_id": player_data.get("person", {}).get("id", 0),
+                        "team_id": team_id,
+                        "game_id": game_id,
+                        "ab": batting.get("atBats", 0),
+                        "h": batting.get("hits", 0),
+                        "hr": batting.get("homeRuns", 0),
+                        "rbi": batting.get("rbi", 0),
+                        "bb": batting.get("baseOnBalls", 0),
+                        "outs": innings_to_outs(pitching.get("inningsPitched", 0)),
+                        "p_k": pitching.get("strikeOuts", 0),
+                        "p_er": pitching.get("earnedRuns", 0),
+                        "p_h": pitching.get("hits", 0),
+                    })
+
+        return cls(rows, team_names, game_hits)
+
+    def batting_standouts(self) -> np.ndarray:
+        """Mask of notable batting lines: a home run, more than two RBI or three hits."""
+        return (self.hr > 0) | (self.rbi > 2) | (self.h >= 3)
+
+    def pitching_gems(self) -> np.ndarray:
+        """Mask of notable pitching lines: six or more innings with at most one
+        earned run, or ten or more strikeouts."""
+        return ((self.outs >= 18) & (self.p_er <= 1)) | (self.p_k >= 10)
+
+    def standouts_by_game(self) -> Dict[int, Tuple[PlayerLine, ...]]:
+        """Return the batting standouts and pitching gems of every game at once."""
+        if self._standouts_by_game is not None:
+            return self._standouts_by_game
+
+        indices = np.flatnonzero(self.batting_standouts() | self.pitching_gems())
+        # Keep each game's lines grouped and ordered by impact
+        order = np.lexsort((-self.p_k[indices], -self.rbi[indices], -self.hr[indices], self.game_id[indices]))
+        indices = indices[order]
+
+        standouts: Dict[int, List[PlayerLine]] = {}
+        for index in indices:
+            standouts.setdefault(int(self.game_id[index]), []).append(self._player_line(index))
+        self._standouts_by_game = {game_id: tuple(lines) for game_id, lines in standouts.items()}
+        return self._standouts_by_game
+
+    def league_leaders(self, count: int = 3) -> Tuple[PlayerLine, ...]:
+        """Return the day's top home run, RBI and strikeout performances across the league."""
+        if count in self._league_leaders:
+            return self._league_leaders[count]
+
+        leaders = []
+        seen = set()
+        for column in (self.hr, self.rbi, self.p_k):
+            top = np.argsort(-column, kind="stable")[:count]
+            for index in top[column[top] > 0]:
+                if index not in seen:
+                    seen.add(index)
+                    leaders.append(self._player_line(index))
+
+        self._league_leaders[count] = tuple(leaders)
+        return self._league_leaders[count]
+
+    def _player_line(self, index: int) -> PlayerLine:
+        outs = int(self.outs[index])
+        return PlayerLine(
+            name=self.names[index],
+            team=self.team_names.get(int(self.team_id[index]), ""),
+            hr=int(self.hr[index]),
+            rbi=int(self.rbi[index]),
+            hits=int(self.h[index]),
+            ip=f"{outs // 3}.{outs % 3}" if outs else "",
+            k=int(self.p_k[index]),
+            er=int(self.p_er[index]),
+        )
@@ -0,0 +1,111 @@
+import os
+import json
+import time
+from typing import Dict, List, Any, Optional
+
+from config.config import MLB_TEAMS, MLB_TEAM_IDS, TEAM_REGISTRY_FILE, TEAM_REGISTRY_MAX_AGE_DAYS
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+class TeamRegistry:
+    """Mapping between team codes, statsapi team ids, names and divisions.
+
+    Built once from the statsapi /teams endpoint and persisted, so games and
+    standings can be matched by numeric id instead of by team name.
+    """
+
+    def __init__(self, teams: List[Dict[str, Any]], built_at: Optional[float] = None):
+        self.teams = teams
+        self.built_at = built_at or time.time()
+        self._by_code = {team["code"]: team for team in teams}
+        self._by_id = {team["id"]: team for team in teams}
+
+    @classmethod
+    def from_teams_payload(cls, payload: Dict[str, Any]) -> "TeamRegistry":
+        """Build the registry from a statsapi /teams response."""
+        code_by_id = {team_id: code for code, team_id in MLB_TEAM_IDS.items()}
+        teams = []
+        for team in payload.get("teams", []):
+            code = code_by_id.get(team.get("id"))
+            if code is None:
+                continue
+            teams.append({
+                "code": code,
+                "id": team["id"],
+                "name": team.get("name", MLB_TEAMS.get(code, "")),
+                "abbreviation": team.get("abbreviation", code),
+                "division_id": team.get("division", {}).get("id"),
+                "division_name": team.get("division", {}).get("name", ""),
+            })
+
+        missing = set(MLB_TEAMS) - {team["code"] for team in teams}
+        if missing:
+            logger.warning(f"Teams missing from statsapi /teams response: {', '.join(sorted(missing))}")
+            teams.extend(cls._fallback_entry(code) for code in sorted(missing))
+
+        return cls(teams)
+
+    @classmethod
+    def fallback(cls) -> "TeamRegistry":
+        """Build the registry from configuration only, without divisions."""
+        return cls([cls._fallback_entry(code) for code in MLB_TEAMS])
+
+    @staticmethod
+    def _fallback_entry(code: str) -> Dict[str, Any]:
+        return {
+            "code": code,
+            "id": MLB_TEAM_IDS[code],
+            "name": MLB_TEAMS[code],
+            "abbreviation": code,
+            "division_id": None,
+            "division_name": "",
+        }
+
+    @classmethod
+    def load(cls, path: str = TEAM_REGISTRY_FILE) -> Optional["TeamRegistry"]:
+        """Load a persisted registry, or return None if it is missing or outdated."""
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable team registry {path}: {e}")
+            return None
+
+        if time.time() - data.get("built_at", 0) > TEAM_REGISTRY_MAX_AGE_DAYS * 86400:
+            logger.info("Team registry is outdated and will be rebuilt")
+            return None
+
+        return cls(data.get("teams", []), data.get("built_at"))
+
+    def save(self, path: str = TEAM_REGISTRY_FILE) -> None:
+        """Persist the registry."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"built_at": self.built_at, "teams": self.teams}, f, indent=2)
+
+    def id_for(self, team_code: str) -> Optional[int]:
+        """Return the statsapi team id for a team code."""
+        team = self._by_code.get(team_code)
+        return team["id"] if team else MLB_TEAM_IDS.get(team_code)
+
+    def code_for(self, team_id: int) -> Optional[str]:
+        """Return the team code for a statsapi team id."""
+        team = self._by_id.get(team_id)
+        return team["code"] if team else None
+
+    def name_for(self, team_code: str) -> str:
+        """Return the current statsapi name of a team."""
+        team = self._by_code.get(team_code)
+        return team["name"] if team else MLB_TEAMS.get(team_code, "")
+
+    def division_for(self, team_code: str) -> Optional[int]:
+        """Return the statsapi division id of a team."""
+        team = self._by_code.get(team_code)
+        return team["division_id"] if team else None
+
+    def codes_in_division(self, division_id: int) -> List[str]:
+        """Return the team codes of a division."""
+        return [team["code"] for team in self.teams if team["division_id"] == division_id]
@@ -0,0 +1,231 @@
+import datetime
+import threading
+import concurrent.futures
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+from config.config import (
+    MLB_SCHEDULE_HYDRATE, WATCHER_IDLE_INTERVAL, WATCHER_LIVE_INTERVAL, WATCHER_FAST_INTERVAL,
+    WATCHER_GAME_DURATION_MINUTES, WATCHER_END_WINDOW_MINUTES
+)
+from utils.logger import get_logger
+from utils.mlb_api import LeagueSnapshot
+from utils.processor import PodcastProcessor, TeamPodcastResult
+
+logger = get_logger(__name__)
+
+def parse_game_time(game: Dict[str, Any]) -> Optional[datetime.datetime]:
+    """Parse a schedule game's gameDate (UTC, e.g. "2024-07-01T23:05:00Z")."""
+    game_date = game.get("gameDate")
+    if not game_date:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(game_date.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+def is_postponed(game: Dict[str, Any]) -> bool:
+    """Postponed and cancelled games are reported as Final without being played."""
+    return game.get("status", {}).get("detailedState", "") in ("Postponed", "Cancelled")
+
+class GameWatcher:
+    """Poll the schedule during the day and process a team as soon as its games are Final.
+
+    The schedule is polled slowly while no game is in progress and quickly
+    when a live game is close to its expected end. Once every game of a team
+    on a date has reached the Final state, that team's pipeline is queued
+    immediately instead of waiting for the daily job.
+    """
+
+    def __init__(self, processor: Optional[PodcastProcessor] = None, distribute: bool = True, max_workers: int = 3):
+        self.processor = processor or PodcastProcessor()
+        self.mlb_data = self.processor.mlb_data
+        self.distribute = distribute
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+        # Last seen abstractGameState per gamePk
+        self._game_states: Dict[Any, str] = {}
+        # Dates still being watched; a date is dropped once all its games are Final
+        self._watched_dates: Set[datetime.date] = set()
+        # (team_code, date) pairs already queued, and the results of finished ones
+        self._queued: Set[Tuple[str, datetime.date]] = set()
+        self._results: Dict[Tuple[str, datetime.date], TeamPodcastResult] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def processed_teams(self, date: datetime.date) -> List[str]:
+        """Return the team codes already processed successfully for a date."""
+        with self._lock:
+            return [team_code for (team_code, result_date), result in self._results.items()
+                    if result_date == date and result.success]
+
+    def poll(self, date: datetime.date, initial: bool = False) -> Dict[str, Any]:
+        """Fetch a fresh schedule for a date and queue teams whose games just went Final.
+
+        On the initial poll, games that are already Final are only recorded, so a
+        restarted watcher does not regenerate episodes the daily job has covered.
+        """
+        # Poll the same schedule variant the snapshot uses so they share a cache entry
+        hydrate = MLB_SCHEDULE_HYDRATE if self.mlb_data.fetch_mode == "hydrated" else None
+        schedule = self.mlb_data.get_schedule(date, hydrate=hydrate, max_age=0)
+        registry = self.mlb_data.get_team_registry()
+        games = [game for date_data in schedule.get("dates", []) for game in date_data.get("games", [])]
+
+        # Group the games of the date by team so doubleheaders wait for the last game
+        games_by_team: Dict[str, List[Dict[str, Any]]] = {}
+        newly_final: Set[str] = set()
+        for game in games:
+            game_id = game.get("gamePk")
+            state = game.get("status", {}).get("abstractGameState", "")
+            previous = self._game_states.get(game_id)
+            self._game_states[game_id] = state
+
+            team_codes = []
+            for side in ("home", "away"):
+                team_code = registry.code_for(game.get("teams", {}).get(side, {}).get("team", {}).get("id"))
+                if team_code:
+                    team_codes.append(team_code)
+                    games_by_team.setdefault(team_code, []).append(game)
+
+            if state == "Final" and previous != "Final" and not initial:
+                if is_postponed(game):
+                    logger.info(f"Game {game_id} was {game['status']['detailedState'].lower()}")
+                else:
+                    logger.info(f"Game {game_id} went Final: {' vs '.join(team_codes)}")
+                # A postponed game can be the last one a team was waiting for,
+                # e.g. the second game of a doubleheader
+                newly_final.update(team_codes)
+
+        ready = []
+        for team_code in sorted(newly_final):
+            team_games = games_by_team[team_code]
+            if not all(game.get("status", {}).get("abstractGameState") == "Final" for game in team_games):
+                logger.info(f"Waiting for the remaining games of {team_code} on {date.strftime('%Y-%m-%d')}")
+            elif all(is_postponed(game) for game in team_games):
+                # Nothing was played, so the daily job covers the team
+                logger.info(f"Every game of {team_code} on {date.strftime('%Y-%m-%d')} was postponed")
+            else:
+                ready.append(team_code)
+
+        if ready:
+            # Revalidate the standings once for every team that just finished
+            snapshot = self.mlb_data.get_league_snapshot(date, max_age=0)
+            if not snapshot.hydrated:
+                # Boxscores of games that went Final on earlier polls are still cached
+                try:
+                    snapshot.stat_table = self.mlb_data.build_stat_table(snapshot)
+                except Exception as e:
+                    logger.error(f"Error building stat table, teams will fetch boxscores individually: {str(e)}")
+            for team_code in ready:
+                self._enqueue(team_code, date, snapshot)
+
+        return schedule
+
+    def _enqueue(self, team_code: str, date: datetime.date, snapshot: Optional[LeagueSnapshot] = None) -> None:
+        """Queue a team's pipeline for a date, at most once."""
+        key = (team_code, date)
+        with self._lock:
+            if key in self._queued:
+                return
+            self._queued.add(key)
+
+        logger.info(f"Queueing post-game episode for {team_code} on {date.strftime('%Y-%m-%d')}")
+        future = self.executor.submit(self.processor.process_team, team_code, date, self.distribute, snapshot)
+        future.add_done_callback(lambda f: self._record_result(key, f))
+
+    def _record_result(self, key: Tuple[str, datetime.date], future: concurrent.futures.Future) -> None:
+        team_code, date = key
+        try:
+            result = future.result()
+        except Exception as e:
+            logger.error(f"Error processing {team_code} for {date.strftime('%Y-%m-%d')}: {str(e)}")
+            with self._lock:
+                self._queued.discard(key)
+            return
+
+        with self._lock:
+            self._results[key] = result
+            if not result.success:
+                # Leave the team to the daily job
+                self._queued.discard(key)
+        if result.success:
+            logger.info(f"Post-game episode for {result.team_name} is ready")
+        else:
+            logger.error(f"Failed to process {result.team_name}: {result.error}")
+
+    @staticmethod
+    def next_interval(schedule: Dict[str, Any], now: Optional[datetime.datetime] = None) -> float:
+        """Choose the number of seconds until the next poll from the state of the games."""
+        now = now or datetime.datetime.now(datetime.timezone.utc)
+        game_duration = datetime.timedelta(minutes=WATCHER_GAME_DURATION_MINUTES)
+        end_window = datetime.timedelta(minutes=WATCHER_END_WINDOW_MINUTES)
+
+        interval = WATCHER_IDLE_INTERVAL
+        for date_data in schedule.get("dates", []):
+            for game in date_data.get("games", []):
+                state = game.get("status", {}).get("abstractGameState", "")
+                start_time = parse_game_time(game)
+                if state == "Live":
+                    if start_time is None or now >= start_time + game_duration - end_window:
+                        return WATCHER_FAST_INTERVAL
+                    interval = min(interval, WATCHER_LIVE_INTERVAL)
+                elif state == "Preview" and start_time is not None:
+                    # Wake up around first pitch instead of idling past it
+                    until_start = (start_time - now).total_seconds()
+                    interval = min(interval, max(until_start, WATCHER_LIVE_INTERVAL))
+
+        return interval
+
+    @staticmethod
+    def all_final(schedule: Dict[str, Any]) -> bool:
+        """Check whether every game of a schedule has reached the Final state."""
+        return all(
+            game.get("status", {}).get("abstractGameState") == "Final"
+            for date_data in schedule.get("dates", [])
+            for game in date_data.get("games", [])
+        )
+
+    def run(self) -> None:
+        """Watch today's games (and yesterday's late games) until stopped."""
+        logger.info("Starting live game watcher")
+        initial = True
+        current_day = None
+
+        while not self._stop.is_set():
+            today = datetime.date.today()
+            if today != current_day:
+                # Release the boxscores cached for the previous day's stat tables
+                if current_day is not None:
+                    self.mlb_data.clear_boxscore_cache()
+                current_day = today
+            self._watched_dates.add(today)
+
+            interval = WATCHER_IDLE_INTERVAL
+            for date in sorted(self._watched_dates):
+                try:
+                    schedule = self.poll(date, initial=initial)
+                except Exception as e:
+                    logger.error(f"Error polling schedule for {date.strftime('%Y-%m-%d')}: {str(e)}")
+                    interval = min(interval, WATCHER_LIVE_INTERVAL)
+                    continue
+
+                if date < today and self.all_final(schedule):
+                    logger.info(f"All games on {date.strftime('%Y-%m-%d')} are Final, no longer watching")
+                    self._watched_dates.discard(date)
+                interval = min(interval, self.next_interval(schedule))
+
+            initial = False
+            logger.debug(f"Next schedule poll in {interval:.0f} seconds")
+            self._stop.wait(interval)
+
+        self.executor.shutdown(wait=True)
+        logger.info("Live game watcher stopped")
+
+    def start_in_background(self) -> threading.Thread:
+        """Run the watcher in a daemon thread."""
+        thread = threading.Thread(target=self.run, name="game-watcher", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self) -> None:
+        """Stop the watcher after the current poll."""
+        self._stop.set()